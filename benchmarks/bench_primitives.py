@@ -0,0 +1,134 @@
+# benchmarks/bench_primitives.py
+#
+# Benchmarks the consent, trust and vault primitives that sit on every request's
+# auth path, and flags regressions against a saved baseline.
+#
+# Run from the repo root:
+#   python -m benchmarks.bench_primitives --save-baseline   # record a baseline
+#   python -m benchmarks.bench_primitives                   # compare against it
+
+import argparse
+import base64
+import os
+import sys
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.harness import measure, save_results, load_results, find_regressions
+from hushh_mcp import config
+from hushh_mcp.constants import ConsentScope
+from hushh_mcp.consent.token import issue_token, validate_token, revoke_token
+from hushh_mcp.trust.link import create_trust_link, verify_trust_link
+from hushh_mcp.vault.encrypt import encrypt_data, decrypt_data, encrypt_many, decrypt_many
+from hushh_mcp.vault.stream import encrypt_bytes, decrypt_bytes
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_SIZES = "100,10K,1M,50M"
+DEFAULT_THRESHOLD = float(os.getenv("HUSHH_BENCH_THRESHOLD", 0.2))
+
+USER_ID = "user_bench"
+AGENT_ID = "agent_bench"
+SCOPE = ConsentScope.VAULT_READ_EMAIL
+
+# ==================== Cases ====================
+
+def parse_size(text: str) -> int:
+    units = {"K": 1024, "M": 1024 * 1024}
+    text = text.strip().upper().rstrip("B")
+    if text[-1:] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def consent_cases() -> List[Tuple[str, Callable[[], object]]]:
+    valid = issue_token(USER_ID, AGENT_ID, SCOPE).token
+    expired = issue_token(USER_ID, AGENT_ID, SCOPE, expires_in_ms=-1000).token
+    revoked = issue_token("user_bench_revoked", AGENT_ID, SCOPE).token
+    revoke_token(revoked)
+    malformed = "HCT:not-a-real-token"
+
+    return [
+        ("issue_token", lambda: issue_token(USER_ID, AGENT_ID, SCOPE)),
+        ("validate_token[valid]", lambda: validate_token(valid, SCOPE)),
+        ("validate_token[expired]", lambda: validate_token(expired, SCOPE)),
+        ("validate_token[revoked]", lambda: validate_token(revoked, SCOPE)),
+        ("validate_token[malformed]", lambda: validate_token(malformed, SCOPE)),
+    ]
+
+def trust_cases() -> List[Tuple[str, Callable[[], object]]]:
+    link = create_trust_link("agent_identity", AGENT_ID, SCOPE, USER_ID)
+    return [
+        ("create_trust_link", lambda: create_trust_link("agent_identity", AGENT_ID, SCOPE, USER_ID)),
+        ("verify_trust_link", lambda: verify_trust_link(link)),
+    ]
+
+def random_text(size: int) -> str:
+    # Repeated characters compress to almost nothing and would flatter any compressing path
+    return base64.b64encode(os.urandom(size)).decode()[:size]
+
+def vault_cases(sizes: List[int]) -> List[Tuple[str, Callable[[], object]]]:
+    key = config.VAULT_ENCRYPTION_KEY
+    cases = []
+    for size in sizes:
+        plaintext = random_text(size)
+        payload = encrypt_data(plaintext, key, compress=False)
+        cases.append((f"encrypt_data[{size}B]", lambda p=plaintext: encrypt_data(p, key, compress=False)))
+        cases.append((f"decrypt_data[{size}B]", lambda p=payload: decrypt_data(p, key)))
+
+        data = plaintext.encode()
+        blob = encrypt_bytes(data, key)
+        cases.append((f"encrypt_bytes[{size}B]", lambda d=data: encrypt_bytes(d, key)))
+        cases.append((f"decrypt_bytes[{size}B]", lambda b=blob: decrypt_bytes(b, key)))
+
+    batch = [random_text(1024) for _ in range(1000)]
+    payloads = encrypt_many(batch, key)
+    cases.append(("encrypt_many[1000x1KB]", lambda: encrypt_many(batch, key)))
+    cases.append(("decrypt_many[1000x1KB]", lambda: decrypt_many(payloads, key)))
+    return cases
+
+def run(sizes: List[int], min_time_s: float) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, fn in consent_cases() + trust_cases() + vault_cases(sizes):
+        results[name] = measure(fn, min_time_s=min_time_s)
+        print(f"{name:<32} {results[name]['min_us']:>14.2f} µs")
+    return results
+
+# ==================== CLI ====================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="HushhMCP primitive benchmarks")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before flagging a regression (0.2 = 20%%)")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Vault payload sizes, e.g. 100,10K,1M,50M")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds spent timing each case")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+    results = run(sizes, args.min_time)
+
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        print(f"\n✅ Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print(f"\n⚠️ No baseline at {args.baseline}; run with --save-baseline first.")
+        return 0
+
+    regressions = find_regressions(baseline, results, args.threshold)
+    if not regressions:
+        print(f"\n✅ No regressions above {args.threshold:.0%}")
+        return 0
+
+    print(f"\n❌ {len(regressions)} regression(s) above {args.threshold:.0%}:")
+    for regression in regressions:
+        print(
+            f"  {regression['name']:<32} {regression['baseline_us']:>12.2f} → "
+            f"{regression['current_us']:>12.2f} µs ({regression['ratio']:.2f}x)"
+        )
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# benchmarks/bench_types.py
+#
+# Compares pydantic model construction against the internal __slots__ records used
+# on the consent, trust and vault hot paths, and against converting a cached record
+# to a fresh model at the boundary (what a verified-token cache hit does).
+#
+# Run from the repo root:  python -m benchmarks.bench_types
+
+import timeit
+import tracemalloc
+
+from hushh_mcp.constants import ConsentScope
+from hushh_mcp.types import (
+    HushhConsentToken, ConsentTokenData,
+    TrustLink, TrustLinkData,
+    EncryptedPayload, EncryptedPayloadData
+)
+
+NUMBER = 20_000
+
+TOKEN_FIELDS = dict(
+    token="HCT:abc.k1-def", user_id="user_a", agent_id="agent_b",
+    scope="vault.read.email", issued_at=1, expires_at=2, signature="k1-def"
+)
+LINK_FIELDS = dict(
+    from_agent="agent_a", to_agent="agent_b", scope="vault.read.email",
+    created_at=1, expires_at=2, signed_by_user="user_a", signature="k1-def"
+)
+PAYLOAD_FIELDS = dict(
+    ciphertext="Y2lwaGVy", iv="aXY=", tag="dGFn", encoding="base64", algorithm="aes-256-gcm"
+)
+
+TOKEN_RECORD = {**TOKEN_FIELDS, "scope": ConsentScope.VAULT_READ_EMAIL}
+LINK_RECORD = {**LINK_FIELDS, "scope": ConsentScope.VAULT_READ_EMAIL}
+
+_cached_token = ConsentTokenData(**TOKEN_RECORD)
+_cached_link = TrustLinkData(**LINK_RECORD)
+_cached_payload = EncryptedPayloadData(**PAYLOAD_FIELDS)
+
+CASES = {
+    "HushhConsentToken": (
+        lambda: HushhConsentToken(**TOKEN_FIELDS),
+        lambda: ConsentTokenData(**TOKEN_RECORD),
+        _cached_token.to_model,
+    ),
+    "TrustLink": (
+        lambda: TrustLink(**LINK_FIELDS),
+        lambda: TrustLinkData(**LINK_RECORD),
+        _cached_link.to_model,
+    ),
+    "EncryptedPayload": (
+        lambda: EncryptedPayload(**PAYLOAD_FIELDS),
+        lambda: EncryptedPayloadData(**PAYLOAD_FIELDS),
+        _cached_payload.to_model,
+    ),
+}
+
+
+def _per_call_us(fn) -> float:
+    return min(timeit.repeat(fn, number=NUMBER, repeat=5)) / NUMBER * 1e6
+
+
+def _bytes_per_object(fn) -> float:
+    tracemalloc.start()
+    kept = [fn() for _ in range(1000)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size / 1000
+
+
+def main():
+    print(f"{'type':<20} {'variant':<26} {'µs/call':>9} {'bytes/obj':>10}")
+    for name, (model, record, reused) in CASES.items():
+        for variant, fn in (
+            ("pydantic model", model),
+            ("__slots__ record", record),
+            ("cached record to_model()", reused),
+        ):
+            print(f"{name:<20} {variant:<26} {_per_call_us(fn):>9.2f} {_bytes_per_object(fn):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
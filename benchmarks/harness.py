@@ -0,0 +1,83 @@
+# benchmarks/harness.py
+
+import json
+import os
+import platform
+import statistics
+import time
+from typing import Callable, Dict, List, Optional
+
+# ==================== Timing ====================
+
+def measure(fn: Callable[[], object], min_time_s: float = 0.2, repeat: int = 5) -> Dict[str, float]:
+    """
+    Times `fn` and returns per-call microseconds.
+
+    The loop count is calibrated so each of the `repeat` rounds runs for roughly
+    `min_time_s / repeat`; slow calls (e.g. 50 MB encryption) run once per round.
+    """
+    fn()  # Warm up caches and lazy imports
+
+    start = time.perf_counter()
+    fn()
+    single = max(time.perf_counter() - start, 1e-9)
+    number = max(1, int((min_time_s / repeat) / single))
+
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) / number * 1e6)
+
+    return {
+        "min_us": min(rounds),
+        "median_us": statistics.median(rounds),
+        "calls_per_round": number,
+    }
+
+# ==================== Baselines ====================
+
+def save_results(path: str, results: Dict[str, Dict[str, float]]) -> None:
+    document = {
+        "created_at": int(time.time()),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+def load_results(path: str) -> Optional[Dict[str, Dict[str, float]]]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)["results"]
+
+def find_regressions(
+    baseline: Dict[str, Dict[str, float]],
+    current: Dict[str, Dict[str, float]],
+    threshold: float,
+    metric: str = "min_us"
+) -> List[Dict[str, float]]:
+    """
+    Returns the cases whose `metric` grew by more than `threshold` (0.2 = 20%).
+    Cases missing from either side are ignored.
+    """
+    regressions = []
+    for name, result in current.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get(metric):
+            continue
+        ratio = result[metric] / previous[metric]
+        if ratio > 1 + threshold:
+            regressions.append({
+                "name": name,
+                "baseline_us": previous[metric],
+                "current_us": result[metric],
+                "ratio": ratio,
+            })
+    return regressions
@@ -5,18 +5,21 @@ import base64
 from datetime import timedelta, datetime
 from typing import List, Dict
 import concurrent.futures
+from functools import lru_cache
 
 # Required for handling token refresh
 from google.auth.transport.requests import Request 
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 
+from hushh_mcp.operons.verify_email import verify_user_emails
+
 from datetime import datetime, timedelta
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 import base64
 
 # Load environment variables from .env file
@@ -44,17 +47,30 @@ def get_gmail_service():
         with open('token.json', 'w') as token:
             token.write(creds.to_json())
 
-    return build('gmail', 'v1', credentials=creds)
+    return build_gmail_service(creds)
 
-def call_llama_groq(prompt):
-    """Invokes the Groq API with the specified prompt."""
-    llm = ChatOpenAI(
+@lru_cache(maxsize=1)
+def get_gmail_discovery_document() -> dict:
+    """The Gmail API discovery document, parsed once per process instead of on every build()."""
+    return json.loads(get_static_doc('gmail', 'v1'))
+
+def build_gmail_service(creds):
+    """Returns a Gmail service object for the given credentials."""
+    return build_from_document(get_gmail_discovery_document(), credentials=creds)
+
+@lru_cache(maxsize=1)
+def get_llm():
+    """The Groq chat client, created once and shared by every request."""
+    return ChatOpenAI(
         openai_api_key=os.environ["GROQ_API_KEY"],
         openai_api_base="https://api.groq.com/openai/v1",
         model="qwen/qwen3-32b",
         temperature=0.3,
     )
-    response = llm.invoke(prompt)
+
+def call_llama_groq(prompt):
+    """Invokes the Groq API with the specified prompt."""
+    response = get_llm().invoke(prompt)
     return response.content
 
 def extract_json(response_text):
@@ -123,6 +139,11 @@ def get_unread_emails(service):
         batch.add(service.users().messages().get(userId='me', id=msg['id'], format='full'))
 
     batch.execute()
+
+    # One pass over every sender; display names are parsed here, not in each agent
+    for email, check in zip(all_emails_data, verify_user_emails(e['sender'] for e in all_emails_data)):
+        email['sender_email'] = check.address
+        email['sender_valid'] = check.is_valid
     return all_emails_data
 
 def summarize_emails(emails: List[Dict]) -> List[Dict]:
@@ -185,6 +206,8 @@ def get_thread_history(service, thread_id: str) -> List[Dict]:
                 "from": next((h['value'] for h in headers if h['name'].lower() == 'from'), 'Unknown Sender'),
                 "snippet": msg.get('snippet', '')
             })
+        for entry, check in zip(history, verify_user_emails(entry["from"] for entry in history)):
+            entry["from_email"] = check.address
         return history
     except Exception as e:
         print(f"Error fetching thread history for {thread_id}: {e}")
@@ -204,7 +227,7 @@ def fetch_user_sent_emails(access_token: str, days: int = 7) -> List[Dict[str, s
                                contains the 'subject' and 'body' of a sent email.
     """
     creds = Credentials(token=access_token)
-    service = build('gmail', 'v1', credentials=creds)
+    service = build_gmail_service(creds)
     
     # Calculate the date 'days' ago
     date_query = (datetime.now() - timedelta(days=days)).strftime('%Y/%m/%d')
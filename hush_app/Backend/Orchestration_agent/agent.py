@@ -2,12 +2,15 @@ import os
 import sys
 import json
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, Annotated, Sequence, Any
 from enum import Enum
 from dataclasses import dataclass
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 from typing import TypedDict
@@ -20,25 +23,64 @@ backend_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(backend_root)
 
 # --- RAG Imports ---
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+# FAISS, the text splitter, the LLM/embedding clients, pypdf, docx, the Gmail
+# client and the sub-agents (the scheduler compiles its graph on import) are
+# imported where they are used, so importing this module stays cheap.
 from langchain_core.documents import Document
 from langchain_core.vectorstores import VectorStoreRetriever
 
 # --- Local & Library Imports ---
-from agents.info_responder_agent import info_responder_agent
-from agents.schedular_agent import calendar_agent
-from Email_Summarizer import fetch_user_sent_emails
 from hushh_mcp.consent.token import validate_token
 from hushh_mcp.constants import ConsentScope
-
-# --- NEW: Imports for PDF and DOCX processing ---
-import pypdf
-import docx
+from hushh_mcp.operons.verify_email import check_email
+from hushh_mcp.types import HushhConsentToken
 
 load_dotenv()
 
+# --- Shared Clients ---
+# Built on first use and shared by every OrchestrationAgent in the process
+@lru_cache(maxsize=1)
+def get_llm():
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        openai_api_key=os.environ["GROQ_API_KEY"],
+        openai_api_base="https://api.groq.com/openai/v1",
+        model="qwen/qwen3-32b",
+        temperature=0.3,
+    )
+
+@lru_cache(maxsize=1)
+def get_embeddings():
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+    # ✅ Single embeddings model for all retrieval tasks
+    return GoogleGenerativeAIEmbeddings(
+        model="models/embedding-001",
+        google_api_key=os.environ.get("GOOGLE_API_KEY")
+    )
+
+def _build_retriever(documents: List[Document], embeddings, k: int) -> VectorStoreRetriever:
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from langchain_community.vectorstores import FAISS
+
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+    splits = text_splitter.split_documents(documents)
+    vector_store = FAISS.from_documents(splits, embeddings)
+    return vector_store.as_retriever(search_kwargs={"k": k})
+
+# --- Knowledge Base Cache ---
+# Per-user FAISS indexes, rebuilt only when the files in the user's folder change
+KNOWLEDGE_BASE_CACHE_SIZE = 64
+_kb_cache: "OrderedDict[str, Tuple[Tuple, Optional[VectorStoreRetriever]]]" = OrderedDict()
+_kb_lock = threading.Lock()
+
+def _knowledge_base_signature(path: str) -> Tuple:
+    entries = []
+    for entry in os.scandir(path):
+        if entry.is_file():
+            stat = entry.stat()
+            entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
 # --- Enums and Dataclasses ---
 class AgentType(Enum):
     SCHEDULER = "scheduler"
@@ -91,17 +133,8 @@ class OrchestrationAgent:
         self.user_email = user_email
         self.user_name = user_name
         self.access_token = access_token
-        self.llm = ChatOpenAI(
-            openai_api_key=os.environ["GROQ_API_KEY"],
-            openai_api_base="https://api.groq.com/openai/v1",
-            model="qwen/qwen3-32b",
-            temperature=0.3,
-        )
-        # ✅ Single embeddings model for all retrieval tasks
-        self.embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/embedding-001",
-            google_api_key=os.environ.get("GOOGLE_API_KEY")
-        )
+        self.llm = get_llm()
+        self.embeddings = get_embeddings()
         self.intent_mapping = {
             "Scheduling or rescheduling a meeting or event": AgentType.SCHEDULER,
             "Requesting information or clarification": AgentType.INFO_RESPONDER,
@@ -110,7 +143,7 @@ class OrchestrationAgent:
             "Announcing a new product or feature": AgentType.NO_RESPONSE,
             "Shipping, delivery, or order tracking update": AgentType.NO_RESPONSE,
         }
-        self.workflow = self._build_workflow()
+        self.workflow = get_workflow()
 
     # --- MODIFIED: This function now supports PDF and DOCX files ---
     def _build_knowledge_retriever(self, user_email: str) -> Optional[VectorStoreRetriever]:
@@ -125,6 +158,22 @@ class OrchestrationAgent:
         if not os.path.exists(user_knowledge_base_path):
             return None
 
+        signature = _knowledge_base_signature(user_knowledge_base_path)
+        with _kb_lock:
+            cached = _kb_cache.get(user_email)
+            if cached and cached[0] == signature:
+                _kb_cache.move_to_end(user_email)
+                return cached[1]
+
+        retriever = self._index_knowledge_base(user_knowledge_base_path, user_email)
+        with _kb_lock:
+            _kb_cache[user_email] = (signature, retriever)
+            _kb_cache.move_to_end(user_email)
+            while len(_kb_cache) > KNOWLEDGE_BASE_CACHE_SIZE:
+                _kb_cache.popitem(last=False)
+        return retriever
+
+    def _index_knowledge_base(self, user_knowledge_base_path: str, user_email: str) -> Optional[VectorStoreRetriever]:
         docs = []
         for filename in os.listdir(user_knowledge_base_path):
             file_path = os.path.join(user_knowledge_base_path, filename)
@@ -135,6 +184,7 @@ class OrchestrationAgent:
             try:
                 # Process PDF files
                 if filename.lower().endswith('.pdf'):
+                    import pypdf
                     with open(file_path, 'rb') as f:
                         reader = pypdf.PdfReader(f)
                         for page in reader.pages:
@@ -142,6 +192,7 @@ class OrchestrationAgent:
                 
                 # Process DOCX files
                 elif filename.lower().endswith('.docx'):
+                    import docx
                     doc = docx.Document(file_path)
                     for para in doc.paragraphs:
                         content += para.text + "\n"
@@ -161,25 +212,25 @@ class OrchestrationAgent:
         if not docs:
             return None
 
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-        splits = text_splitter.split_documents(docs)
-        vector_store = FAISS.from_documents(splits, self.embeddings)
-        return vector_store.as_retriever(search_kwargs={"k": 3})
+        return _build_retriever(docs, self.embeddings, k=3)
 
-    def _build_workflow(self) -> StateGraph:
+    @classmethod
+    def _build_workflow(cls) -> StateGraph:
+        # Compiled once per process (see get_workflow); each node runs on the
+        # agent passed in at invoke time through config["configurable"]["agent"]
         workflow = StateGraph(EmailState)
-        workflow.add_node("fetch_and_index_tone_emails", self._fetch_and_index_tone_emails_node)
-        workflow.add_node("analyzer", self._analyze_email_node)
-        workflow.add_node("scheduler_agent", self._scheduler_agent_node)
-        workflow.add_node("info_agent", self._info_agent_node)
-        workflow.add_node("general_agent", self._general_agent_node)
-        workflow.add_node("no_response", self._no_response_node)
-        workflow.add_node("composer", self._compose_final_email_node)
+        workflow.add_node("fetch_and_index_tone_emails", _agent_node(cls._fetch_and_index_tone_emails_node))
+        workflow.add_node("analyzer", _agent_node(cls._analyze_email_node))
+        workflow.add_node("scheduler_agent", _agent_node(cls._scheduler_agent_node))
+        workflow.add_node("info_agent", _agent_node(cls._info_agent_node))
+        workflow.add_node("general_agent", _agent_node(cls._general_agent_node))
+        workflow.add_node("no_response", _agent_node(cls._no_response_node))
+        workflow.add_node("composer", _agent_node(cls._compose_final_email_node))
 
         workflow.add_edge(START, "fetch_and_index_tone_emails")
         workflow.add_edge("fetch_and_index_tone_emails", "analyzer")
         workflow.add_conditional_edges(
-            "analyzer", self._route_to_agent,
+            "analyzer", cls._route_to_agent,
             {
                 "scheduler": "scheduler_agent", "info_responder": "info_agent",
                 "general_responder": "general_agent", "no_response": "no_response"
@@ -194,15 +245,13 @@ class OrchestrationAgent:
         return workflow.compile()
 
     def _fetch_and_index_tone_emails_node(self, state: EmailState) -> EmailState:
+        from Email_Summarizer import fetch_user_sent_emails
         try:
             sent_emails = fetch_user_sent_emails(self.access_token, days=7)
             if not sent_emails:
                 return {**state, "tone_retriever": None}
             documents = [Document(page_content=email['body'], metadata={'subject': email['subject']}) for email in sent_emails]
-            text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-            splits = text_splitter.split_documents(documents)
-            vector_store = FAISS.from_documents(splits, self.embeddings)
-            retriever = vector_store.as_retriever(search_kwargs={"k": 3})
+            retriever = _build_retriever(documents, self.embeddings, k=3)
             return {**state, "tone_retriever": retriever}
         except Exception as e:
             print(f"Error creating tone retriever: {e}")
@@ -254,13 +303,15 @@ class OrchestrationAgent:
         analysis_msg = AIMessage(content=f"Analyzed email. Route to: {response_plan.agent_type.value}")
         return {**state, "messages": state["messages"] + [analysis_msg], "response_plan": response_plan}
 
-    def _route_to_agent(self, state: EmailState) -> str:
+    @staticmethod
+    def _route_to_agent(state: EmailState) -> str:
         return state["response_plan"].agent_type.value if state["response_plan"] else "general_responder"
 
     def _scheduler_agent_node(self, state: EmailState) -> EmailState:
         email_context = state["email_context"]
         user_suggestion = state.get("user_suggestion")
         try:
+            from agents.schedular_agent import calendar_agent
             sender_email = self._extract_email_from_sender(email_context.sender)
             message_content = f"Email from {email_context.sender}:\n{email_context.body}\n{f'User suggestion: {user_suggestion}' if user_suggestion else ''}"
             initial_state = {'messages': [HumanMessage(content=message_content)], 'senders_email_address': sender_email, 'users_email_address': state["user_email"]}
@@ -297,6 +348,7 @@ class OrchestrationAgent:
             print(f"Knowledge base consent not granted for {user_email} or retriever not available. Skipping file search.")
 
         try:
+            from agents.info_responder_agent import info_responder_agent
             raw_outcome = info_responder_agent(
                 query=query,
                 doc_content=document_content,
@@ -338,9 +390,7 @@ class OrchestrationAgent:
         email_context = state["email_context"]
         user_suggestion = state.get("user_suggestion")
 
-        recipient_name = email_context.sender.split('<')[0].strip()
-        if '@' in recipient_name:
-            recipient_name = "there"
+        recipient_name = self._recipient_name(email_context.sender)
 
         history_context = "\n".join(state.get("conversation_history", []))
 
@@ -372,9 +422,7 @@ class OrchestrationAgent:
         email_context = state["email_context"]
         tone_retriever = state.get("tone_retriever")
 
-        recipient_name = email_context.sender.split('<')[0].strip()
-        if '@' in recipient_name:
-            recipient_name = "there"
+        recipient_name = self._recipient_name(email_context.sender)
 
         tone_examples = ""
         if tone_retriever:
@@ -420,18 +468,35 @@ class OrchestrationAgent:
     def _strip_think_block(self, text: str) -> str:
         return re.sub(r"^<think>.*?</think>", "", text, flags=re.DOTALL).strip()
 
-    def generate_response(self, email_context: EmailContext, consent_token: str, user_suggestion: Optional[str] = None, document_content: Optional[bytes] = None, document_filename: Optional[str] = None, conversation_history: Optional[List[str]] = None, knowledge_base_consent_token: Optional[str] = None) -> Dict:
-        is_valid, reason, parsed_token = validate_token(consent_token, expected_scope=ConsentScope.VAULT_READ_EMAIL)
-        if not is_valid:
-            raise PermissionError(f"Consent validation failed: {reason}")
+    def generate_response(self, email_context: EmailContext, consent_token: str, user_suggestion: Optional[str] = None, document_content: Optional[bytes] = None, document_filename: Optional[str] = None, conversation_history: Optional[List[str]] = None, knowledge_base_consent_token: Optional[str] = None, parsed_consent_token: Optional[HushhConsentToken] = None) -> Dict:
+        # Callers that already validated the consent token (e.g. the API's consent dependency) pass it in
+        parsed_token = parsed_consent_token
+        has_kb_consent = False
+
+        # A combined token grants both scopes, so one verification covers email and KB access
+        if parsed_token is None and knowledge_base_consent_token:
+            is_kb_valid, _, kb_parsed_token = validate_token(
+                knowledge_base_consent_token,
+                expected_scope=(ConsentScope.VAULT_READ_EMAIL, ConsentScope.KNOWLEDGE_BASE_READ)
+            )
+            if is_kb_valid and kb_parsed_token.user_id == self.user_email:
+                parsed_token = kb_parsed_token
+                has_kb_consent = True
+
+        if parsed_token is None:
+            is_valid, reason, parsed_token = validate_token(consent_token, expected_scope=ConsentScope.VAULT_READ_EMAIL)
+            if not is_valid:
+                raise PermissionError(f"Consent validation failed: {reason}")
         if parsed_token.user_id != self.user_email:
             raise PermissionError("User ID in token does not match")
 
-        has_kb_consent = False
-        if knowledge_base_consent_token:
-            is_kb_valid, _, kb_parsed_token = validate_token(knowledge_base_consent_token, expected_scope=ConsentScope.KNOWLEDGE_BASE_READ)
-            if is_kb_valid and kb_parsed_token.user_id == self.user_email:
+        if not has_kb_consent:
+            if parsed_token.has_scopes(ConsentScope.KNOWLEDGE_BASE_READ):
                 has_kb_consent = True
+            elif knowledge_base_consent_token:
+                is_kb_valid, _, kb_parsed_token = validate_token(knowledge_base_consent_token, expected_scope=ConsentScope.KNOWLEDGE_BASE_READ)
+                if is_kb_valid and kb_parsed_token.user_id == self.user_email:
+                    has_kb_consent = True
 
         knowledge_retriever = self._build_knowledge_retriever(self.user_email)
 
@@ -449,7 +514,7 @@ class OrchestrationAgent:
             "attachment_to_send": None,
         }
         try:
-            final_state = self.workflow.invoke(initial_state)
+            final_state = self.workflow.invoke(initial_state, config={"configurable": {"agent": self}})
             response_plan = final_state.get("response_plan")
             final_response = final_state.get("final_response", "No response generated")
             attachment = final_state.get("attachment_to_send")
@@ -468,8 +533,11 @@ class OrchestrationAgent:
             return {"response_type": "error", "message": f"Error: {str(e)}", "reasoning": "System error", "confidence": 0.0, "attachment": None}
 
     def _extract_email_from_sender(self, sender: str) -> str:
-        email_match = re.search(r'<([^>]+)>', sender)
-        return email_match.group(1) if email_match else sender.strip()
+        return check_email(sender).address or sender.strip()
+
+    def _recipient_name(self, sender: str) -> str:
+        name = check_email(sender).display_name
+        return name if name and '@' not in name else "there"
 
     def _extract_json(self, response_text: str) -> Optional[Dict]:
         match = re.search(r"\{.*\}", response_text, re.DOTALL)
@@ -481,11 +549,26 @@ class OrchestrationAgent:
         return None
 
 
-def process_email_with_orchestration(email_data: Dict, user_email: str, user_name: str, consent_token: str, access_token: str, user_suggestion: Optional[str] = None, document_content: Optional[bytes] = None, document_filename: Optional[str] = None, conversation_history: Optional[List[str]] = None, knowledge_base_consent_token: Optional[str] = None) -> Dict:
+def _agent_node(method):
+    def node(state: EmailState, config: RunnableConfig) -> EmailState:
+        return method(config["configurable"]["agent"], state)
+    node.__name__ = method.__name__
+    return node
+
+@lru_cache(maxsize=1)
+def get_workflow():
+    return OrchestrationAgent._build_workflow()
+
+def preload_knowledge_base(user_email: str) -> bool:
+    """Indexes a user's knowledge base ahead of their first request; True if they have one."""
+    agent = OrchestrationAgent(user_name="", user_email=user_email, access_token="")
+    return agent._build_knowledge_retriever(user_email) is not None
+
+def process_email_with_orchestration(email_data: Dict, user_email: str, user_name: str, consent_token: str, access_token: str, user_suggestion: Optional[str] = None, document_content: Optional[bytes] = None, document_filename: Optional[str] = None, conversation_history: Optional[List[str]] = None, knowledge_base_consent_token: Optional[str] = None, parsed_consent_token: Optional[HushhConsentToken] = None) -> Dict:
     email_context = EmailContext(
         subject=email_data.get('subject', ''),
         sender=email_data.get('sender', ''),
-        sender_email=email_data.get('sender', ''),
+        sender_email=email_data.get('sender_email') or check_email(email_data.get('sender', '')).address or '',
         body=email_data.get('body', ''),
         summary=email_data.get('summary', ''),
         intent=email_data.get('intent', ''),
@@ -494,5 +577,6 @@ def process_email_with_orchestration(email_data: Dict, user_email: str, user_nam
     orchestrator = OrchestrationAgent(user_name, user_email, access_token)
     return orchestrator.generate_response(
         email_context, consent_token, user_suggestion, document_content,
-        document_filename, conversation_history, knowledge_base_consent_token
+        document_filename, conversation_history, knowledge_base_consent_token,
+        parsed_consent_token
     )
\ No newline at end of file
@@ -15,9 +15,11 @@ from langgraph.prebuilt import ToolNode
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
 
 from agents import info_responder_agent
 from agents.schedular_agent import calendar_agent
+from hushh_mcp.operons.verify_email import check_email
 
 load_dotenv()
 
@@ -161,7 +163,7 @@ def info_node(state: GraphState) -> GraphState:
         query += f"\n\nUser guidance: {state['user_suggestion']}"
 
     result = info_responder_agent(query)
-    state["response"] = f"""Dear {state['email_context'].sender.split('<')[0].strip()},
+    state["response"] = f"""Dear {recipient_name(state['email_context'].sender)},
 
 Thank you for your email regarding "{state['email_context'].subject}".
 
@@ -195,8 +197,11 @@ def no_response_node(state: GraphState) -> GraphState:
 # HELPERS
 # ──────────────────────────────────────────────────────────────
 def extract_email(sender: str) -> str:
-    match = re.search(r'<([^>]+)>', sender)
-    return match.group(1) if match else sender.strip()
+    return check_email(sender).address or sender.strip()
+
+def recipient_name(sender: str) -> str:
+    name = check_email(sender).display_name
+    return name if name and '@' not in name else "there"
 
 # ──────────────────────────────────────────────────────────────
 # GRAPH CONSTRUCTION
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException, Depends, Form, File, UploadFile
+from fastapi import FastAPI, HTTPException, Depends, Form, File, UploadFile, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from google.oauth2 import id_token
@@ -9,13 +9,17 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 from sqlalchemy import Column, Integer, String, Text, DateTime, LargeBinary, create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 from typing import Optional, List, Dict
 import json
 import base64
+import importlib
 import os
 import sys
 import logging
+import threading
+import time
 import traceback
 from dotenv import load_dotenv
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -29,11 +33,14 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".
 
 # Import your existing modules
 import Email_Summarizer
+from Orchestration_agent import agent as orchestration_agent
 from Orchestration_agent.agent import process_email_with_orchestration
 
 # Import HushhMCP components
-from hushh_mcp.consent.token import issue_token
+from hushh_mcp.consent.token import issue_token, validate_token
 from hushh_mcp.constants import ConsentScope
+from hushh_mcp.types import HushhConsentToken
+from hushh_mcp.vault.compress import compress_text, decompress_text
 
 # === CONFIG ===
 CLIENT_ID = "387653948430-kmg1urmijluvtrbkin3736ffcvbduv9b.apps.googleusercontent.com"
@@ -58,6 +65,17 @@ Base = declarative_base()
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(bind=engine)
 
+class CompressedText(TypeDecorator):
+    """Text column stored zlib-compressed when that pays off; existing plain values read back unchanged."""
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
@@ -73,9 +91,9 @@ class EmailResponse(Base):
     user_email = Column(String, nullable=False)
     sender_email = Column(String, nullable=False)
     email_subject = Column(String, nullable=False)
-    email_summary = Column(Text, nullable=False)
+    email_summary = Column(CompressedText, nullable=False)
     email_intent = Column(String, nullable=False)
-    generated_response = Column(Text, nullable=False)
+    generated_response = Column(CompressedText, nullable=False)
     agent_type = Column(String, nullable=False)
     status = Column(String, default="pending")
     created_at = Column(DateTime, default=datetime.now)
@@ -130,6 +148,8 @@ class EmailProcessRequest(BaseModel):
 
 class KbTokenRequest(BaseModel):
     user_email: str
+    # NEW: When present, the KB token also carries this token's email-read consent
+    consent_token: Optional[str] = None
 
 # === HELPER FUNCTIONS ===
 def get_user_access_token() -> Optional[str]:
@@ -191,6 +211,124 @@ def get_user_kb_path(user_email: str) -> str:
     os.makedirs(user_path, exist_ok=True)
     return user_path
 
+# === CONSENT DEPENDENCIES ===
+
+CONSENT_TOKEN_HEADER = "X-Consent-Token"
+
+def require_consent(scope: ConsentScope):
+    """
+    Builds a dependency that validates the caller's consent token before the route runs,
+    so invalid or expired tokens fail before any Gmail, LLM or embedding work starts.
+
+    The token is read from the X-Consent-Token header, or from the JSON body's
+    `consent_token` field; a request carrying two different tokens is rejected.
+    The parsed token is stored on `request.state.consent_token`, and routes must
+    use it (not the body field) for anything they persist or pass on.
+    """
+    async def dependency(http_request: Request) -> HushhConsentToken:
+        token_str = http_request.headers.get(CONSENT_TOKEN_HEADER)
+        user_email = None
+        try:
+            body = await http_request.json()
+        except Exception:
+            body = None
+        if isinstance(body, dict):
+            body_token = body.get("consent_token")
+            if token_str and body_token and body_token != token_str:
+                raise HTTPException(status_code=400, detail="Consent token in header and body do not match.")
+            token_str = token_str or body_token
+            user_email = body.get("user_email")
+
+        if not token_str:
+            raise HTTPException(status_code=401, detail="Consent token is required.")
+
+        is_valid, reason, parsed_token = validate_token(token_str, expected_scope=scope)
+        if not is_valid:
+            raise HTTPException(status_code=403, detail=f"Consent validation failed: {reason}")
+        if user_email and parsed_token.user_id != user_email:
+            raise HTTPException(status_code=403, detail="User ID in token does not match")
+
+        http_request.state.consent_token = parsed_token
+        return parsed_token
+
+    return dependency
+
+# === WARM-UP ===
+
+# Knowledge-base indexes to build at startup, for this many most recently active users (0 = none)
+WARMUP_KB_USERS = int(os.getenv("WARMUP_KB_USERS", "0"))
+
+# Imported lazily by the orchestration agent; loaded here so no request pays for them
+WARMUP_MODULES = [
+    "agents.schedular_agent",
+    "agents.info_responder_agent",
+    "langchain_community.vectorstores",
+    "langchain.text_splitter",
+    "pypdf",
+    "docx",
+]
+
+warmup_status = {"ready": False, "started_at": None, "duration_s": None, "errors": {}}
+
+def _recently_active_users(limit: int) -> List[str]:
+    db = SessionLocal()
+    try:
+        rows = db.query(EmailResponse.user_email).order_by(EmailResponse.created_at.desc()).limit(limit * 20).all()
+    finally:
+        db.close()
+    # Distinct, most recent first
+    return list(dict.fromkeys(row.user_email for row in rows))[:limit]
+
+def _import_deferred_modules():
+    for module in WARMUP_MODULES:
+        importlib.import_module(module)
+
+def _preload_knowledge_bases():
+    for user_email in _recently_active_users(WARMUP_KB_USERS):
+        orchestration_agent.preload_knowledge_base(user_email)
+
+def warm_up():
+    """
+    Pays the first request's setup costs before any traffic arrives: deferred
+    imports, Gmail discovery-document parsing, LLM and embedding clients,
+    orchestration graph compilation and, optionally, knowledge-base indexes.
+    A failed step is logged and reported by /ready but does not block readiness;
+    the request that needs it will retry it.
+    """
+    steps = [
+        ("imports", _import_deferred_modules),
+        ("gmail_discovery", Email_Summarizer.get_gmail_discovery_document),
+        ("llm", lambda: (orchestration_agent.get_llm(), Email_Summarizer.get_llm())),
+        ("embeddings", orchestration_agent.get_embeddings),
+        ("workflow", orchestration_agent.get_workflow),
+    ]
+    if WARMUP_KB_USERS > 0:
+        steps.append(("knowledge_bases", _preload_knowledge_bases))
+
+    warmup_status["started_at"] = datetime.now().isoformat()
+    start = time.perf_counter()
+    for name, step in steps:
+        try:
+            step()
+        except Exception as e:
+            logging.warning(f"Warm-up step '{name}' failed: {e}")
+            warmup_status["errors"][name] = str(e)
+    warmup_status["duration_s"] = round(time.perf_counter() - start, 3)
+    warmup_status["ready"] = True
+    logging.info(f"Warm-up finished in {warmup_status['duration_s']}s")
+
+@app.on_event("startup")
+def start_warm_up():
+    # In the background, so the server binds immediately and /ready can report progress
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+@app.get("/ready")
+def ready():
+    """Readiness probe: 503 until warm-up has finished, so the load balancer skips cold workers."""
+    if not warmup_status["ready"]:
+        raise HTTPException(status_code=503, detail="Warming up")
+    return {"status": "ready", **warmup_status}
+
 # === AUTHENTICATION ROUTES ===
 
 @app.post("/auth/signup")
@@ -291,7 +429,15 @@ async def summarize_emails_api():
         raise HTTPException(status_code=500, detail=f"Error summarizing emails: {str(e)}")
 
 @app.post("/api/process-email")
-async def process_email(request: EmailProcessRequest, db: Session = Depends(get_db)):
+async def process_email(
+    request: EmailProcessRequest,
+    consent: HushhConsentToken = Depends(require_consent(ConsentScope.VAULT_READ_EMAIL)),
+    db: Session = Depends(get_db)
+):
+    user_email = request.user_email
+    if not user_email:
+        raise HTTPException(status_code=400, detail="User email is required.")
+
     try:
         service = Email_Summarizer.get_gmail_service()
         emails = Email_Summarizer.get_unread_emails(service)
@@ -300,10 +446,6 @@ async def process_email(request: EmailProcessRequest, db: Session = Depends(get_
         target_email = find_email_by_id(request.email_id, summarized_emails)
         if not target_email:
             raise HTTPException(status_code=404, detail="Email not found")
-        
-        user_email = request.user_email
-        if not user_email:
-             raise HTTPException(status_code=400, detail="User email is required.")
 
         user = db.query(User).filter(User.gmail == user_email).first()
         user_name = user.name if user else "Support Team"
@@ -321,11 +463,12 @@ async def process_email(request: EmailProcessRequest, db: Session = Depends(get_
             email_data=target_email, 
             user_email=user_email, 
             user_name=user_name, 
-            consent_token=request.consent_token,
+            consent_token=consent.token,
             access_token=access_token,
             user_suggestion=request.user_suggestion,
             conversation_history=conversation_history,
-            knowledge_base_consent_token=request.knowledge_base_consent_token
+            knowledge_base_consent_token=request.knowledge_base_consent_token,
+            parsed_consent_token=consent
         )
         
         attachment = result.get('attachment')
@@ -342,7 +485,7 @@ async def process_email(request: EmailProcessRequest, db: Session = Depends(get_
             email_id=request.email_id,
             gmail_message_id=target_email.get('id'),
             gmail_thread_id=target_email.get('threadId'),
-            consent_token=request.consent_token,
+            consent_token=consent.token,
             attachment_filename=attachment['filename'] if attachment else None,
             attachment_content=attachment['content'] if attachment else None
         )
@@ -362,6 +505,8 @@ async def process_email(request: EmailProcessRequest, db: Session = Depends(get_
             "generated_response": json_safe_result,
             "status": "pending"
         }
+    except HTTPException:
+        raise
     except PermissionError as e:
         raise HTTPException(status_code=403, detail=str(e))
     except Exception as e:
@@ -372,15 +517,25 @@ async def process_email(request: EmailProcessRequest, db: Session = Depends(get_
 def generate_kb_token(req: KbTokenRequest):
     if not req.user_email:
         raise HTTPException(status_code=400, detail="User email is required")
+    scope = [ConsentScope.KNOWLEDGE_BASE_READ]
+    expiry_ms = 300 * 1000
+
+    # Fold the user's email consent into the KB token so each request verifies one token
+    if req.consent_token:
+        is_valid, reason, parsed_token = validate_token(req.consent_token, expected_scope=ConsentScope.VAULT_READ_EMAIL)
+        if not is_valid:
+            raise HTTPException(status_code=403, detail=f"Consent validation failed: {reason}")
+        if parsed_token.user_id != req.user_email:
+            raise HTTPException(status_code=403, detail="Token user ID does not match the provided user")
+        scope.append(ConsentScope.VAULT_READ_EMAIL)
+        expiry_ms = min(expiry_ms, parsed_token.expires_at - int(datetime.now().timestamp() * 1000))
+
     try:
-        scope = ConsentScope.KNOWLEDGE_BASE_READ
-        expiry_seconds = 300
-        
         consent_token_obj = issue_token(
             user_id=req.user_email,
             agent_id="default_agent",
             scope=scope,
-            expires_in_ms=expiry_seconds * 1000
+            expires_in_ms=expiry_ms
         )
         
         token_string = consent_token_obj.token
@@ -405,6 +560,16 @@ async def handle_response_action(
         if not original_response:
             raise HTTPException(status_code=404, detail="Original response not found")
 
+        # Regenerating re-runs the agents on the user's mail: check the stored consent
+        # before building the Gmail client or calling any agent
+        consent = None
+        if action == "regenerate":
+            is_valid, reason, consent = validate_token(original_response.consent_token or "", expected_scope=ConsentScope.VAULT_READ_EMAIL)
+            if not is_valid:
+                raise HTTPException(status_code=403, detail=f"Consent validation failed: {reason}")
+            if consent.user_id != original_response.user_email:
+                raise HTTPException(status_code=403, detail="User ID in token does not match")
+
         service = Email_Summarizer.get_gmail_service()
 
         if action == "approve":
@@ -465,7 +630,8 @@ async def handle_response_action(
                 document_content=document_content,
                 document_filename=document_filename,
                 conversation_history=conversation_history,
-                knowledge_base_consent_token=knowledge_base_consent_token
+                knowledge_base_consent_token=knowledge_base_consent_token,
+                parsed_consent_token=consent
             )
             
             attachment = result.get('attachment')
@@ -490,6 +656,8 @@ async def handle_response_action(
         else:
             raise HTTPException(status_code=400, detail="Invalid action specified")
             
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error in response action: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -56,7 +56,8 @@ function Home() {
     
     try {
       const response = await axios.post("http://localhost:8000/api/generate-kb-token", {
-        user_email: user.email 
+        user_email: user.email,
+        consent_token: user.consentToken
       });
 
       const { kb_consent_token } = response.data;
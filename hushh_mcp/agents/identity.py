@@ -1,7 +1,9 @@
 # hushh_mcp/agents/identity.py
 
-from hushh_mcp.operons.verify_email import verify_user_email
-from hushh_mcp.trust.link import create_trust_link
+from typing import Iterable, List
+
+from hushh_mcp.operons.verify_email import verify_user_email, verify_user_emails, EmailCheck
+from hushh_mcp.trust.link import create_trust_link, create_trust_links
 from hushh_mcp.types import UserID, AgentID, ConsentScope, TrustLink
 
 
@@ -22,6 +24,13 @@ class HushhIdentityAgent:
             print(f"❌ Invalid email format: {email}")
         return is_valid
 
+    def verify_user_identities(self, emails: Iterable[str]) -> List[EmailCheck]:
+        # Accepts raw header values ("Name <addr>"); results come back normalized, in input order
+        checks = verify_user_emails(emails)
+        valid = sum(1 for check in checks if check.is_valid)
+        print(f"🔍 Verified {valid}/{len(checks)} email addresses")
+        return checks
+
     def issue_trust_link(
         self,
         from_agent: AgentID,
@@ -29,10 +38,7 @@ class HushhIdentityAgent:
         user_id: UserID,
         scope: ConsentScope
     ) -> TrustLink:
-        print(f"🔐 Issuing TrustLink from '{from_agent}' to '{to_agent}' on scope '{scope}' for user '{user_id}'")
-
-        if not scope or not scope.startswith("vault.") and not scope.startswith("agent."):
-            raise ValueError(f"⚠️ Invalid or unsafe scope: '{scope}'")
+        self._check_scope(scope)
 
         trust_link = create_trust_link(
             from_agent=from_agent,
@@ -41,5 +47,29 @@ class HushhIdentityAgent:
             signed_by_user=user_id
         )
 
-        print(f"✅ TrustLink created: {trust_link.signature[:8]}... (expires at {trust_link.expires_at})")
+        print(f"🔐 TrustLink '{from_agent}' → '{to_agent}' on '{scope}' for '{user_id}' (expires at {trust_link.expires_at})")
         return trust_link
+
+    def issue_trust_links(
+        self,
+        from_agent: AgentID,
+        to_agents: Iterable[AgentID],
+        user_id: UserID,
+        scope: ConsentScope
+    ) -> List[TrustLink]:
+        self._check_scope(scope)
+
+        trust_links = create_trust_links(
+            from_agent=from_agent,
+            to_agents=to_agents,
+            scope=scope,
+            signed_by_user=user_id
+        )
+
+        print(f"🔐 Issued {len(trust_links)} TrustLinks from '{from_agent}' on '{scope}' for '{user_id}'")
+        return trust_links
+
+    @staticmethod
+    def _check_scope(scope: ConsentScope) -> None:
+        if not scope or not scope.startswith("vault.") and not scope.startswith("agent."):
+            raise ValueError(f"⚠️ Invalid or unsafe scope: '{scope}'")
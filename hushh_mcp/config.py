@@ -1,44 +1,132 @@
 # hushh_mcp/config.py
+#
+# Settings are read from the environment (and .env) on first access, not at
+# import time, and each one is validated when it is first read. Importing this
+# module is free; a missing SECRET_KEY only fails the code path that signs.
+# `from hushh_mcp.config import *` is the exception: it reads every setting.
 
 import os
+import threading
+from typing import Any, Callable, Dict
+
 from dotenv import load_dotenv
 
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
 
-# Load .env file into environment
-load_dotenv()
+_lock = threading.RLock()
+_env_loaded = False
+
+def _load_env() -> None:
+    global _env_loaded
+    if not _env_loaded:
+        # Load .env file into environment
+        load_dotenv()
+        _env_loaded = True
 
 # ==================== Security Keys ====================
 
-SECRET_KEY = os.getenv("SECRET_KEY")
-if not SECRET_KEY or len(SECRET_KEY) < 32:
-    raise ValueError("❌ SECRET_KEY must be set in .env and at least 32 characters long")
+def _secret_key() -> str:
+    value = os.getenv("SECRET_KEY")
+    if not value or len(value) < 32:
+        raise ValueError("❌ SECRET_KEY must be set in .env and at least 32 characters long")
+    return value
+
+def _vault_encryption_key() -> str:
+    value = os.getenv("VAULT_ENCRYPTION_KEY")
+    if not value or len(value) != 64:
+        raise ValueError("❌ VAULT_ENCRYPTION_KEY must be a 64-character hex string (256-bit AES key)")
+    return value
+
+_SETTINGS: Dict[str, Callable[[], Any]] = {
+    "SECRET_KEY": _secret_key,
+
+    # ID embedded in every signature made with SECRET_KEY
+    "SECRET_KEY_ID": lambda: os.getenv("SECRET_KEY_ID", "k1"),
+
+    # Retired signing keys that still verify, as "key_id:secret,key_id:secret"
+    "SECRET_KEY_RING": lambda: os.getenv("SECRET_KEY_RING", ""),
+
+    "VAULT_ENCRYPTION_KEY": _vault_encryption_key,
+
+    # ID under which VAULT_ENCRYPTION_KEY wraps per-user data keys
+    "VAULT_MASTER_KEY_ID": lambda: os.getenv("VAULT_MASTER_KEY_ID", "m1"),
+
+    # Retired vault master keys that still unwrap data keys, as "key_id:hex,key_id:hex"
+    "VAULT_MASTER_KEY_RING": lambda: os.getenv("VAULT_MASTER_KEY_RING", ""),
+
+    # ==================== Expiration Settings ====================
+
+    # Default expiry durations (in milliseconds)
+    # 7 days
+    "DEFAULT_CONSENT_TOKEN_EXPIRY_MS": lambda: int(os.getenv("DEFAULT_CONSENT_TOKEN_EXPIRY_MS", 1000 * 60 * 60 * 24 * 7)),
+    # 30 days
+    "DEFAULT_TRUST_LINK_EXPIRY_MS": lambda: int(os.getenv("DEFAULT_TRUST_LINK_EXPIRY_MS", 1000 * 60 * 60 * 24 * 30)),
 
-VAULT_ENCRYPTION_KEY = os.getenv("VAULT_ENCRYPTION_KEY")
-if not VAULT_ENCRYPTION_KEY or len(VAULT_ENCRYPTION_KEY) != 64:
-    raise ValueError("❌ VAULT_ENCRYPTION_KEY must be a 64-character hex string (256-bit AES key)")
+    # ==================== Consent Token Settings ====================
 
-# ==================== Expiration Settings ====================
+    # Wire format for newly issued consent tokens (1 = text record, 2 = compact binary)
+    "CONSENT_TOKEN_VERSION": lambda: int(os.getenv("CONSENT_TOKEN_VERSION", 1)),
 
-# Default expiry durations (in milliseconds)
-# 7 days
-DEFAULT_CONSENT_TOKEN_EXPIRY_MS = int(os.getenv("DEFAULT_CONSENT_TOKEN_EXPIRY_MS", 1000 * 60 * 60 * 24 * 7))  # 30 days
-DEFAULT_TRUST_LINK_EXPIRY_MS = int(os.getenv("DEFAULT_TRUST_LINK_EXPIRY_MS", 1000 * 60 * 60 * 24 * 30))      
+    # ==================== Revocation Settings ====================
 
-# ==================== Environment Info ====================
+    # SQLite file used to persist revoked tokens across restarts (in-memory if unset)
+    "REVOCATION_DB_PATH": lambda: os.getenv("REVOCATION_DB_PATH"),
 
-ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
-AGENT_ID = os.getenv("AGENT_ID", "agent_hushh_default")
-HUSHH_HACKATHON = os.getenv("HUSHH_HACKATHON", "disabled").lower() == "enabled"
+    # How often workers sharing REVOCATION_DB_PATH pick up each other's revocations
+    "REVOCATION_SYNC_INTERVAL_MS": lambda: int(os.getenv("REVOCATION_SYNC_INTERVAL_MS", 1000)),
+
+    # Max entries in the verified-token cache (0 keeps the cache disabled)
+    "CONSENT_TOKEN_CACHE_SIZE": lambda: int(os.getenv("CONSENT_TOKEN_CACHE_SIZE", 0)),
+
+    # ==================== Vault Settings ====================
+
+    # AEAD for new vault writes: "aes-256-gcm", "chacha20-poly1305", or "auto" to
+    # benchmark both once at startup and use the faster. Reads follow each payload.
+    "VAULT_ENCRYPTION_ALGORITHM": lambda: os.getenv("VAULT_ENCRYPTION_ALGORITHM", "auto").lower(),
+
+    # Compress-then-encrypt for vault writes: "off", or "auto" (per record, by size and
+    # entropy). Off by default: compressed ciphertext length leaks content when a
+    # record mixes attacker-controlled text with secrets (CRIME-style)
+    "VAULT_COMPRESSION": lambda: os.getenv("VAULT_COMPRESSION", "off").lower(),
+
+    # HMAC key (64-character hex) for blind indexes on vault fields; derived from
+    # VAULT_ENCRYPTION_KEY when unset
+    "VAULT_BLIND_INDEX_KEY": lambda: os.getenv("VAULT_BLIND_INDEX_KEY"),
+
+    # ==================== Environment Info ====================
+
+    "ENVIRONMENT": lambda: os.getenv("ENVIRONMENT", "development"),
+    "AGENT_ID": lambda: os.getenv("AGENT_ID", "agent_hushh_default"),
+    "HUSHH_HACKATHON": lambda: os.getenv("HUSHH_HACKATHON", "disabled").lower() == "enabled",
+}
+
+# ==================== Lazy Access ====================
+
+def __getattr__(name: str) -> Any:
+    loader = _SETTINGS.get(name)
+    if loader is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _lock:
+        if name not in globals():
+            _load_env()
+            # Cached as a plain module global, so later reads skip this hook
+            globals()[name] = loader()
+    return globals()[name]
+
+def reload() -> None:
+    """
+    Forgets every loaded setting; the next access re-reads the environment.
+    """
+    global _env_loaded
+    with _lock:
+        for name in _SETTINGS:
+            globals().pop(name, None)
+        _env_loaded = False
 
 # ==================== Defaults Export ====================
 
-__all__ = [
-    "SECRET_KEY",
-    "VAULT_ENCRYPTION_KEY",
-    "DEFAULT_CONSENT_TOKEN_EXPIRY_MS",
-    "DEFAULT_TRUST_LINK_EXPIRY_MS",
-    "ENVIRONMENT",
-    "AGENT_ID",
-    "HUSHH_HACKATHON"
-]
+def __dir__():
+    return sorted(set(globals()) | set(_SETTINGS))
+
+# Star-imports read (and validate) every setting, unlike a plain import
+__all__ = list(_SETTINGS)
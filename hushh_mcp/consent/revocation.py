@@ -0,0 +1,260 @@
+# hushh_mcp/consent/revocation.py
+
+import heapq
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+USER_EPOCH = "user"
+AGENT_EPOCH = "agent"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class RevocationRegistry:
+    """
+    Remembers revoked consent tokens until they would have expired anyway.
+
+    Lookups are a single dict probe, so the common "not revoked" path costs one
+    hash lookup and allocates nothing. Entries are dropped once their token's
+    `expires_at` has passed, which keeps long-running workers bounded. Pass a
+    `path` to persist revocations in SQLite across restarts.
+
+    Several processes can share one SQLite file (opened in WAL mode). Every
+    revocation bumps a generation counter; `sync()` compares it with the last
+    generation this process saw and loads only the newer rows. `start_sync()`
+    runs that check on a background thread, so revocations reach every worker
+    within one sync interval without the lookup path ever touching SQLite.
+
+    It also keeps a revocation epoch per user and per agent. Tokens embed the
+    epochs current when they were issued; bumping an epoch invalidates every
+    older token for that subject in one step, without listing them.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._entries: Dict[str, int] = {}
+        self._expiry_heap: List[Tuple[int, str]] = []
+        self._epochs: Dict[str, Dict[str, int]] = {USER_EPOCH: {}, AGENT_EPOCH: {}}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._generation = 0
+        self._sync_thread: Optional[threading.Thread] = None
+        self._sync_stop = threading.Event()
+
+        if path:
+            self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS revoked_tokens ("
+                "token TEXT PRIMARY KEY, expires_at INTEGER NOT NULL, "
+                "generation INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires_at "
+                "ON revoked_tokens (expires_at)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_revoked_tokens_generation "
+                "ON revoked_tokens (generation)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS revocation_meta ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), generation INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS revocation_epochs ("
+                "kind TEXT NOT NULL, subject TEXT NOT NULL, epoch INTEGER NOT NULL, "
+                "generation INTEGER NOT NULL, PRIMARY KEY (kind, subject))"
+            )
+            self._conn.execute("INSERT OR IGNORE INTO revocation_meta (id, generation) VALUES (0, 0)")
+            self._conn.commit()
+            self._load()
+
+    # ========== Lookups ==========
+
+    def __contains__(self, token_str: str) -> bool:
+        return token_str in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def user_epoch(self, user_id: str) -> int:
+        return self._epochs[USER_EPOCH].get(user_id, 0)
+
+    def agent_epoch(self, agent_id: str) -> int:
+        return self._epochs[AGENT_EPOCH].get(agent_id, 0)
+
+    # ========== Mutations ==========
+
+    def revoke(self, token_str: str, expires_at: int) -> None:
+        now = _now_ms()
+        if expires_at <= now:
+            return  # Already unusable, nothing to remember
+
+        with self._lock:
+            self._remember(token_str, expires_at)
+            if self._conn is not None:
+                with self._conn:
+                    generation = self._next_generation_locked()
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO revoked_tokens (token, expires_at, generation) VALUES (?, ?, ?)",
+                        (token_str, expires_at, generation)
+                    )
+                self._advance_generation_locked(generation)
+            self._prune_locked(now)
+
+    def bump_user_epoch(self, user_id: str) -> int:
+        return self._bump_epoch(USER_EPOCH, user_id)
+
+    def bump_agent_epoch(self, agent_id: str) -> int:
+        return self._bump_epoch(AGENT_EPOCH, agent_id)
+
+    def prune(self, now: Optional[int] = None) -> int:
+        with self._lock:
+            return self._prune_locked(_now_ms() if now is None else now)
+
+    # ========== Cross-Process Sync ==========
+
+    def sync(self) -> bool:
+        """
+        Loads revocations written by other processes and drops expired ones.
+        Returns True if anything changed.
+        """
+        if self._conn is None:
+            return False
+
+        with self._lock:
+            # Workers that only read still need to forget expired entries
+            now = _now_ms()
+            pruned = self._prune_locked(now)
+
+            (generation,) = self._conn.execute(
+                "SELECT generation FROM revocation_meta WHERE id = 0"
+            ).fetchone()
+            if generation == self._generation:
+                return pruned > 0
+
+            rows = self._conn.execute(
+                "SELECT token, expires_at FROM revoked_tokens WHERE generation > ?",
+                (self._generation,)
+            ).fetchall()
+            for token_str, expires_at in rows:
+                if expires_at > now:
+                    self._remember(token_str, expires_at)
+
+            epoch_rows = self._conn.execute(
+                "SELECT kind, subject, epoch FROM revocation_epochs WHERE generation > ?",
+                (self._generation,)
+            ).fetchall()
+            for kind, subject, epoch in epoch_rows:
+                epochs = self._epochs[kind]
+                if epoch > epochs.get(subject, 0):
+                    epochs[subject] = epoch
+            self._generation = generation
+            return True
+
+    def start_sync(self, interval_s: float = 1.0) -> None:
+        if self._conn is None or self._sync_thread is not None:
+            return
+
+        self._sync_stop.clear()
+
+        def run():
+            while not self._sync_stop.wait(interval_s):
+                try:
+                    self.sync()
+                except sqlite3.Error:
+                    pass  # Transient lock contention; retry on the next tick
+
+        self._sync_thread = threading.Thread(target=run, name="hushh-revocation-sync", daemon=True)
+        self._sync_thread.start()
+
+    def stop_sync(self) -> None:
+        if self._sync_thread is None:
+            return
+        self._sync_stop.set()
+        self._sync_thread.join()
+        self._sync_thread = None
+
+    def close(self) -> None:
+        self.stop_sync()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ========== Internals ==========
+
+    def _bump_epoch(self, kind: str, subject: str) -> int:
+        with self._lock:
+            epochs = self._epochs[kind]
+            if self._conn is None:
+                epoch = epochs.get(subject, 0) + 1
+            else:
+                with self._conn:
+                    generation = self._next_generation_locked()
+                    self._conn.execute(
+                        "INSERT INTO revocation_epochs (kind, subject, epoch, generation) VALUES (?, ?, 1, ?) "
+                        "ON CONFLICT (kind, subject) DO UPDATE SET epoch = epoch + 1, generation = excluded.generation",
+                        (kind, subject, generation)
+                    )
+                    (epoch,) = self._conn.execute(
+                        "SELECT epoch FROM revocation_epochs WHERE kind = ? AND subject = ?",
+                        (kind, subject)
+                    ).fetchone()
+                self._advance_generation_locked(generation)
+            epochs[subject] = epoch
+            return epoch
+
+    def _next_generation_locked(self) -> int:
+        # Must run inside the caller's transaction so the bump and the row commit together
+        self._conn.execute("UPDATE revocation_meta SET generation = generation + 1 WHERE id = 0")
+        (generation,) = self._conn.execute("SELECT generation FROM revocation_meta WHERE id = 0").fetchone()
+        return generation
+
+    def _advance_generation_locked(self, generation: int) -> None:
+        if generation == self._generation + 1:
+            # No other worker wrote in between, so nothing is left for sync() to fetch
+            self._generation = generation
+
+    def _remember(self, token_str: str, expires_at: int) -> None:
+        if self._entries.get(token_str) == expires_at:
+            return
+        self._entries[token_str] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, token_str))
+
+    def _prune_locked(self, now: int) -> int:
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, token_str = heapq.heappop(self._expiry_heap)
+            if self._entries.get(token_str) == expires_at:
+                del self._entries[token_str]
+                removed += 1
+
+        if removed and self._conn is not None:
+            with self._conn:
+                self._conn.execute("DELETE FROM revoked_tokens WHERE expires_at <= ?", (now,))
+        return removed
+
+    def _load(self) -> None:
+        now = _now_ms()
+        with self._conn:
+            self._conn.execute("DELETE FROM revoked_tokens WHERE expires_at <= ?", (now,))
+
+        (self._generation,) = self._conn.execute(
+            "SELECT generation FROM revocation_meta WHERE id = 0"
+        ).fetchone()
+        rows = self._conn.execute("SELECT token, expires_at FROM revoked_tokens").fetchall()
+        self._entries = {token_str: expires_at for token_str, expires_at in rows}
+        self._expiry_heap = [(expires_at, token_str) for token_str, expires_at in rows]
+        heapq.heapify(self._expiry_heap)
+
+        for kind, subject, epoch in self._conn.execute("SELECT kind, subject, epoch FROM revocation_epochs"):
+            self._epochs[kind][subject] = epoch
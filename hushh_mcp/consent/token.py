@@ -1,32 +1,117 @@
 # hushh_mcp/consent/token.py
 
-import hmac
-import hashlib
 import base64
+import hmac
+import re
+import struct
+import threading
 import time
-from typing import Optional, Tuple
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple, Union
 
-from hushh_mcp.config import SECRET_KEY, DEFAULT_CONSENT_TOKEN_EXPIRY_MS
-from hushh_mcp.constants import CONSENT_TOKEN_PREFIX
-from hushh_mcp.types import HushhConsentToken, ConsentScope, UserID, AgentID
+from hushh_mcp import config
+from hushh_mcp.constants import CONSENT_TOKEN_PREFIX, SCOPE_CODES, SCOPES_BY_CODE, scope_mask, scopes_from_mask
+from hushh_mcp.consent.revocation import RevocationRegistry
+from hushh_mcp.signer import KEY_ID_SEPARATOR, get_default_signer
+from hushh_mcp.types import HushhConsentToken, ConsentTokenData, ConsentScope, UserID, AgentID
 
 # ========== Internal Revocation Registry ==========
-_revoked_tokens = set()
+_revoked_tokens = RevocationRegistry(config.REVOCATION_DB_PATH)
+if config.REVOCATION_DB_PATH:
+    # Other workers share the same file; poll its generation counter off the hot path
+    _revoked_tokens.start_sync(config.REVOCATION_SYNC_INTERVAL_MS / 1000)
+
+# ========== Verified Token Cache ==========
+
+class _VerifiedTokenCache:
+    """
+    LRU cache of tokens that already passed signature verification.
+
+    Entries are held until the token's `expires_at`. Revocation is still checked
+    before every lookup, and `revoke_token` evicts the entry immediately.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, ConsentTokenData]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token_str: str, now: int) -> Optional[ConsentTokenData]:
+        with self._lock:
+            token = self._entries.get(token_str)
+            if token is None:
+                return None
+            if now > token.expires_at:
+                del self._entries[token_str]
+                return None
+            self._entries.move_to_end(token_str)
+            return token
+
+    def put(self, token: ConsentTokenData) -> None:
+        with self._lock:
+            self._entries[token.token] = token
+            self._entries.move_to_end(token.token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, token_str: str) -> None:
+        with self._lock:
+            self._entries.pop(token_str, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+_token_cache: Optional[_VerifiedTokenCache] = None
+
+def enable_token_cache(max_size: int = 1024) -> None:
+    global _token_cache
+    if max_size <= 0:
+        raise ValueError("Token cache size must be positive")
+    _token_cache = _VerifiedTokenCache(max_size)
+
+def disable_token_cache() -> None:
+    global _token_cache
+    _token_cache = None
+
+if config.CONSENT_TOKEN_CACHE_SIZE > 0:
+    enable_token_cache(config.CONSENT_TOKEN_CACHE_SIZE)
+
+# A single scope, or a collection of scopes that must all be granted
+ScopeSpec = Union[ConsentScope, Iterable[ConsentScope]]
 
 # ========== Token Generator ==========
 
 def issue_token(
     user_id: UserID,
     agent_id: AgentID,
-    scope: ConsentScope,
-    expires_in_ms: int = DEFAULT_CONSENT_TOKEN_EXPIRY_MS
+    scope: ScopeSpec,
+    expires_in_ms: Optional[int] = None,
+    version: Optional[int] = None
 ) -> HushhConsentToken:
+    mask = _scope_mask(scope)
+    if not mask:
+        raise ValueError("A consent token must grant at least one scope")
+    scopes = scopes_from_mask(mask)
+    scope = scopes[0]
+    if expires_in_ms is None:
+        expires_in_ms = config.DEFAULT_CONSENT_TOKEN_EXPIRY_MS
+    if version is None:
+        version = config.CONSENT_TOKEN_VERSION
     issued_at = int(time.time() * 1000)
     expires_at = issued_at + expires_in_ms
-    raw = f"{user_id}|{agent_id}|{scope.value}|{issued_at}|{expires_at}"
-    signature = _sign(raw)
+    user_epoch = _revoked_tokens.user_epoch(user_id)
+    agent_epoch = _revoked_tokens.agent_epoch(agent_id)
 
-    token_string = f"{CONSENT_TOKEN_PREFIX}:{base64.urlsafe_b64encode(raw.encode()).decode()}.{signature}"
+    if version == 2:
+        token_string, signature = _encode_v2(user_id, agent_id, mask, issued_at, expires_at, user_epoch, agent_epoch)
+    elif version == 1:
+        raw = f"{user_id}|{agent_id}|{_encode_scope_field(mask)}|{issued_at}|{expires_at}"
+        if user_epoch or agent_epoch:
+            raw += f"|{user_epoch}|{agent_epoch}"
+        signature = _sign(raw)
+        token_string = f"{CONSENT_TOKEN_PREFIX}:{base64.urlsafe_b64encode(raw.encode()).decode()}.{signature}"
+    else:
+        raise ValueError(f"Unsupported consent token version: {version}")
 
     return HushhConsentToken(
         token=token_string,
@@ -35,67 +120,302 @@ def issue_token(
         scope=scope,
         issued_at=issued_at,
         expires_at=expires_at,
-        signature=signature
+        signature=signature,
+        scopes=scopes
     )
 
 # ========== Token Verifier ==========
 
 def validate_token(
     token_str: str,
-    expected_scope: Optional[ConsentScope] = None
+    expected_scope: Optional[ScopeSpec] = None
 ) -> Tuple[bool, Optional[str], Optional[HushhConsentToken]]:
-    if token_str in _revoked_tokens:
-        return False, "Token has been revoked", None
+    # `expected_scope` may list several scopes; the token must grant all of them
+    required = _scope_mask(expected_scope) if expected_scope else 0
+
+    cache = _token_cache
+    if cache is not None:
+        cached = cache.get(token_str, int(time.time() * 1000))
+        if cached is not None:
+            if _is_revoked(cached) or _is_superseded(cached):
+                return False, "Token has been revoked", None
+            if cached.scope_mask & required != required:
+                return False, "Scope mismatch", None
+            return True, None, cached.to_model()
 
     try:
         prefix, signed_part = token_str.split(":")
-        encoded, signature = signed_part.split(".")
 
         if prefix != CONSENT_TOKEN_PREFIX:
             return False, "Invalid token prefix", None
 
-        decoded = base64.urlsafe_b64decode(encoded.encode()).decode()
-        user_id, agent_id, scope_str, issued_at_str, expires_at_str = decoded.split("|")
+        token, authentic = _decode_token(token_str, signed_part)
 
-        raw = f"{user_id}|{agent_id}|{scope_str}|{issued_at_str}|{expires_at_str}"
-        expected_sig = _sign(raw)
-
-        if not hmac.compare_digest(signature, expected_sig):
+        if not authentic:
             return False, "Invalid signature", None
 
-        if expected_scope and scope_str != expected_scope.value:
+        if _is_revoked(token) or _is_superseded(token):
+            return False, "Token has been revoked", None
+
+        if token.scope_mask & required != required:
             return False, "Scope mismatch", None
 
-        if int(time.time() * 1000) > int(expires_at_str):
+        if int(time.time() * 1000) > token.expires_at:
             return False, "Token expired", None
 
-        token = HushhConsentToken(
-            token=token_str,
-            user_id=user_id,
-            agent_id=agent_id,
-            scope=scope_str,  # can optionally convert to ConsentScope(scope_str)
-            issued_at=int(issued_at_str),
-            expires_at=int(expires_at_str),
-            signature=signature
-        )
-        return True, None, token
+        # The cache holds the lightweight record; each hand-off gets its own pydantic model
+        if cache is not None:
+            cache.put(token)
+        return True, None, token.to_model()
 
     except Exception as e:
         return False, f"Malformed token: {str(e)}", None
 
+# ========== Batch Verifier ==========
+
+# Cheap structural check run before any decoding: prefix, then either a v1 urlsafe
+# base64 body with an optional signing key ID and hex signature, or a v2 binary body
+_TOKEN_SHAPE = re.compile(
+    rf"^{CONSENT_TOKEN_PREFIX}:(?:"
+    r"[A-Za-z0-9_\-]+={0,2}\.(?:[A-Za-z0-9_]+-)?[0-9a-f]{64}"
+    r"|[A-Za-z0-9_\-]{54,}"
+    r")$"
+)
+MAX_TOKEN_LENGTH = 4096
+
+def validate_tokens(
+    tokens: Iterable[str],
+    expected_scope: Optional[ScopeSpec] = None
+) -> List[Tuple[bool, Optional[str], Optional[HushhConsentToken]]]:
+    # Results come back in input order; duplicates in a batch are verified once
+    results = []
+    seen = {}
+
+    for token_str in tokens:
+        if not isinstance(token_str, str) or len(token_str) > MAX_TOKEN_LENGTH:
+            results.append((False, "Malformed token", None))
+            continue
+
+        if token_str not in seen:
+            if _TOKEN_SHAPE.match(token_str) is None:
+                seen[token_str] = (False, "Malformed token", None)
+            else:
+                seen[token_str] = validate_token(token_str, expected_scope)
+        results.append(seen[token_str])
+
+    return results
+
 # ========== Token Revoker ==========
 
 def revoke_token(token_str: str) -> None:
-    _revoked_tokens.add(token_str)
+    # The registry only needs to remember a token until it expires. A string we
+    # cannot decode can never validate, so there is nothing to record for it.
+    try:
+        token = _decode_token(token_str, token_str.split(":", 1)[1])[0]
+    except Exception:
+        return
+    _revoked_tokens.revoke(_revocation_key(token), token.expires_at)
+
+    cache = _token_cache
+    if cache is not None:
+        cache.discard(token_str)
 
 def is_token_revoked(token_str: str) -> bool:
-    return token_str in _revoked_tokens
+    try:
+        return _is_revoked(_decode_token(token_str, token_str.split(":", 1)[1])[0])
+    except Exception:
+        return False
+
+def revoke_user_tokens(user_id: UserID) -> int:
+    # Invalidates every token issued to this user so far; returns the new epoch
+    return _revoked_tokens.bump_user_epoch(user_id)
+
+def revoke_agent_tokens(agent_id: AgentID) -> int:
+    # Invalidates every token issued to this agent so far; returns the new epoch
+    return _revoked_tokens.bump_agent_epoch(agent_id)
+
+# ========== Internal Helpers ==========
+
+def _scope_mask(scope: ScopeSpec) -> int:
+    if isinstance(scope, str):  # ConsentScope members are str too
+        return 1 << SCOPE_CODES[ConsentScope(scope)]
+    return scope_mask(scope)
+
+# v1 records keep the plain scope value for single-scope tokens so older readers
+# still understand them; multi-scope tokens carry "#<hex bitmask>" instead
+def _encode_scope_field(mask: int) -> str:
+    if mask & (mask - 1) == 0:
+        return SCOPES_BY_CODE[mask.bit_length() - 1].value
+    return f"#{mask:x}"
+
+def _decode_scope_field(field: str) -> int:
+    if field.startswith("#"):
+        mask = int(field[1:], 16)
+        if not mask or mask >> len(SCOPES_BY_CODE):
+            raise ValueError("invalid scope mask")
+        return mask
+    return 1 << SCOPE_CODES[ConsentScope(field)]
+
+# Revocations are keyed by the token's MAC rather than its string. One signed token
+# can be spelled several ways (e.g. a v1 signature with or without its key ID),
+# but since the MAC cannot be forged it names exactly one signed record.
+def _revocation_key(token: ConsentTokenData) -> str:
+    return "mac:" + token.signature.rpartition(KEY_ID_SEPARATOR)[2]
+
+def _is_revoked(token: ConsentTokenData) -> bool:
+    return _revocation_key(token) in _revoked_tokens
+
+def _is_superseded(token: ConsentTokenData) -> bool:
+    # True once the user's or agent's revocation epoch has moved past the token's
+    return (
+        token.user_epoch < _revoked_tokens.user_epoch(token.user_id)
+        or token.agent_epoch < _revoked_tokens.agent_epoch(token.agent_id)
+    )
+
+def _decode_token(token_str: str, signed_part: str) -> Tuple[ConsentTokenData, bool]:
+    # v1 tokens are "<base64 text record>.<signature>"; v2 bodies never contain a "."
+    if "." not in signed_part:
+        return _decode_v2(token_str, signed_part)
+
+    encoded, signature = signed_part.split(".")
+    raw_bytes = base64.urlsafe_b64decode(encoded.encode())
+    _require_canonical(encoded, raw_bytes, padded=True)
+    raw = raw_bytes.decode()
+    fields = raw.split("|")
+    # Records carry "|<user epoch>|<agent epoch>" only once either epoch is non-zero
+    if len(fields) == 5:
+        user_epoch = agent_epoch = 0
+    elif len(fields) == 7:
+        user_epoch, agent_epoch = int(fields[5]), int(fields[6])
+    else:
+        raise ValueError(f"expected 5 or 7 token fields, got {len(fields)}")
+
+    user_id, agent_id, scope_str, issued_at_str, expires_at_str = fields[:5]
+    authentic = _verify(raw, signature)
+    mask = _decode_scope_field(scope_str)
+    token = ConsentTokenData(
+        token_str, user_id, agent_id, SCOPES_BY_CODE[(mask & -mask).bit_length() - 1],
+        int(issued_at_str), int(expires_at_str), signature,
+        scope_mask=mask, user_epoch=user_epoch, agent_epoch=agent_epoch
+    )
+    return token, authentic
+
+# ========== Binary Format (v2) ==========
+#
+# Layout, big-endian, then urlsafe base64 without padding after "HCT:":
+#   version (1) | flags (1) | scope code (1) | issued_at ms (8) | expires_at ms (8)
+#   | [scope bitmask (8), only with _FLAG_MULTI_SCOPE]
+#   | [user epoch (4) + agent epoch (4), only with _FLAG_EPOCHS]
+#   | key ID length (1) + key ID | user ID length (2) + user ID
+#   | agent ID length (2) + agent ID | truncated HMAC-SHA256 (16)
+
+_V2_HEADER = struct.Struct(">BBBQQ")
+_V2_SCOPE_MASK = struct.Struct(">Q")
+_V2_EPOCHS = struct.Struct(">II")
+_FLAG_MULTI_SCOPE = 0x01
+_FLAG_EPOCHS = 0x02
+_V2_MAC_LENGTH = 16
+_LENGTH_U8 = struct.Struct(">B")
+_LENGTH_U16 = struct.Struct(">H")
+
+def _encode_v2(
+    user_id: str,
+    agent_id: str,
+    mask: int,
+    issued_at: int,
+    expires_at: int,
+    user_epoch: int = 0,
+    agent_epoch: int = 0
+) -> Tuple[str, str]:
+    signer = get_default_signer()
+    key_id = signer.active_key_id.encode()
+    user_bytes = user_id.encode()
+    agent_bytes = agent_id.encode()
+
+    primary_code = (mask & -mask).bit_length() - 1
+    flags = 0
+    extensions = b""
+    if mask != 1 << primary_code:
+        flags |= _FLAG_MULTI_SCOPE
+        extensions += _V2_SCOPE_MASK.pack(mask)
+    if user_epoch or agent_epoch:
+        flags |= _FLAG_EPOCHS
+        extensions += _V2_EPOCHS.pack(user_epoch, agent_epoch)
+    header = _V2_HEADER.pack(2, flags, primary_code, issued_at, expires_at) + extensions
+
+    body = b"".join((
+        header,
+        _LENGTH_U8.pack(len(key_id)), key_id,
+        _LENGTH_U16.pack(len(user_bytes)), user_bytes,
+        _LENGTH_U16.pack(len(agent_bytes)), agent_bytes,
+    ))
+    mac = signer.digest(body)[:_V2_MAC_LENGTH]
+
+    encoded = base64.urlsafe_b64encode(body + mac).rstrip(b"=").decode()
+    return f"{CONSENT_TOKEN_PREFIX}:{encoded}", f"{signer.active_key_id}-{mac.hex()}"
+
+def _decode_v2(token_str: str, encoded: str) -> Tuple[ConsentTokenData, bool]:
+    blob = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+    _require_canonical(encoded, blob, padded=False)
+    version, flags, scope_code, issued_at, expires_at = _V2_HEADER.unpack_from(blob, 0)
+    if version != 2:
+        raise ValueError(f"unsupported token version {version}")
+    if scope_code >= len(SCOPES_BY_CODE):
+        raise ValueError(f"unknown scope code {scope_code}")
+
+    offset = _V2_HEADER.size
+    mask = 1 << scope_code
+    if flags & _FLAG_MULTI_SCOPE:
+        (mask,) = _V2_SCOPE_MASK.unpack_from(blob, offset)
+        offset += _V2_SCOPE_MASK.size
+        if not mask or mask >> len(SCOPES_BY_CODE):
+            raise ValueError("invalid scope mask")
+    user_epoch = agent_epoch = 0
+    if flags & _FLAG_EPOCHS:
+        user_epoch, agent_epoch = _V2_EPOCHS.unpack_from(blob, offset)
+        offset += _V2_EPOCHS.size
+    key_id, offset = _read_field(blob, offset, _LENGTH_U8)
+    user_id, offset = _read_field(blob, offset, _LENGTH_U16)
+    agent_id, offset = _read_field(blob, offset, _LENGTH_U16)
+
+    mac = blob[offset:]
+    if len(mac) != _V2_MAC_LENGTH:
+        raise ValueError("truncated token signature")
+
+    key_id = key_id.decode()
+    signer = get_default_signer()
+    authentic = (
+        key_id in signer.key_ids
+        and hmac.compare_digest(mac, signer.digest(blob[:offset], key_id)[:_V2_MAC_LENGTH])
+    )
+    token = ConsentTokenData(
+        token_str, user_id.decode(), agent_id.decode(), SCOPES_BY_CODE[scope_code],
+        issued_at, expires_at, f"{key_id}-{mac.hex()}",
+        scope_mask=mask, user_epoch=user_epoch, agent_epoch=agent_epoch
+    )
+    return token, authentic
+
+def _require_canonical(encoded: str, data: bytes, padded: bool) -> None:
+    # The decoder ignores the spare low bits of the last base64 character, so
+    # without this one signed token would have several accepted spellings
+    canonical = base64.urlsafe_b64encode(data)
+    if not padded:
+        canonical = canonical.rstrip(b"=")
+    if canonical.decode() != encoded:
+        raise ValueError("non-canonical token encoding")
+
+def _read_field(blob: bytes, offset: int, length_prefix: struct.Struct) -> Tuple[bytes, int]:
+    (length,) = length_prefix.unpack_from(blob, offset)
+    start = offset + length_prefix.size
+    end = start + length
+    if end > len(blob):
+        raise ValueError("token field overruns payload")
+    return blob[start:end], end
 
 # ========== Internal Signer ==========
 
 def _sign(input_string: str) -> str:
-    return hmac.new(
-        SECRET_KEY.encode(),
-        input_string.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    return get_default_signer().sign(input_string)
+
+def _verify(input_string: str, signature: str) -> bool:
+    return get_default_signer().verify(input_string, signature)
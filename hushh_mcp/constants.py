@@ -26,6 +26,23 @@ class ConsentScope(str, Enum):
     def list(cls):
         return [scope.value for scope in cls]
 
+# Stable numeric codes used by compact token encodings.
+# Only ever append new scopes to ConsentScope, or existing codes will shift.
+SCOPES_BY_CODE = tuple(ConsentScope)
+SCOPE_CODES = {scope: code for code, scope in enumerate(SCOPES_BY_CODE)}
+
+def scope_mask(scopes) -> int:
+    """
+    Packs a collection of scopes into a bitmask (bit N = scope with code N).
+    """
+    mask = 0
+    for scope in scopes:
+        mask |= 1 << SCOPE_CODES[ConsentScope(scope)]
+    return mask
+
+def scopes_from_mask(mask: int) -> list:
+    return [scope for code, scope in enumerate(SCOPES_BY_CODE) if mask >> code & 1]
+
 # ==================== Token & Link Prefixes ====================
 
 CONSENT_TOKEN_PREFIX = "HCT"  # Hushh Consent Token
@@ -43,6 +60,10 @@ DEFAULT_TRUST_LINK_EXPIRY_MS = 1000 * 60 * 60 * 24 * 30        # 30 days
 
 __all__ = [
     "ConsentScope",
+    "SCOPE_CODES",
+    "SCOPES_BY_CODE",
+    "scope_mask",
+    "scopes_from_mask",
     "CONSENT_TOKEN_PREFIX",
     "TRUST_LINK_PREFIX",
     "AGENT_ID_PREFIX",
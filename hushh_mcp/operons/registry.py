@@ -0,0 +1,273 @@
+# hushh_mcp/operons/registry.py
+
+import bisect
+import contextvars
+import functools
+import importlib
+import pkgutil
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from hushh_mcp.constants import ConsentScope
+from hushh_mcp.types import HushhConsentToken, UserID
+
+# ==================== Constants ====================
+
+OPERONS_PACKAGE = "hushh_mcp.operons"
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+# ==================== Operons ====================
+
+class Operon:
+    """
+    A registered operon: the function, the consent scope it needs, and its
+    call statistics.
+    """
+
+    __slots__ = ("name", "scope", "fn", "calls", "errors", "total_ms", "max_ms", "buckets", "_lock")
+
+    def __init__(self, name: str, scope: ConsentScope, fn: Callable[..., Any]):
+        self.name = name
+        self.scope = ConsentScope(scope)
+        self.fn = fn
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float, failed: bool) -> None:
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)
+        with self._lock:
+            self.calls += 1
+            self.errors += failed
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            self.buckets[bucket] += 1
+
+    def call(self, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = self.fn(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            self.record((time.perf_counter() - start) * 1000, failed)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = self.errors = 0
+            self.total_ms = self.max_ms = 0.0
+            self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+            return {
+                "scope": self.scope.value,
+                "calls": self.calls,
+                "errors": self.errors,
+                "total_ms": round(self.total_ms, 3),
+                "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+                "max_ms": round(self.max_ms, 3),
+                "histogram": dict(zip(labels, self.buckets))
+            }
+
+# ==================== Consent Context ====================
+
+class ConsentContext:
+    """
+    One consent token for a unit of work, e.g. one API request or one agent step.
+
+    The token is verified on the first operon call that needs it and the parsed
+    token is reused for every later call in the same context, so a chain of
+    operons costs one signature and revocation check rather than one each.
+    """
+
+    __slots__ = ("token_str", "user_id", "_token", "_failure")
+
+    def __init__(self, token_str: str, user_id: Optional[UserID] = None):
+        self.token_str = token_str
+        self.user_id = user_id
+        self._token: Optional[HushhConsentToken] = None
+        self._failure: Optional[str] = None
+
+    def require(self, scope: ConsentScope) -> HushhConsentToken:
+        if self._token is None and self._failure is None:
+            # Deferred so operon modules stay importable without the consent stack
+            from hushh_mcp.consent.token import validate_token
+
+            valid, reason, token = validate_token(self.token_str)
+            if not valid:
+                self._failure = f"Consent validation failed: {reason}"
+            elif self.user_id is not None and token.user_id != self.user_id:
+                self._failure = "Token user ID does not match the provided user"
+            else:
+                self._token = token
+
+        if self._failure is not None:
+            raise PermissionError(self._failure)
+        if not self._token.has_scopes(scope):
+            raise PermissionError(f"Consent validation failed: Scope mismatch for '{scope.value}'")
+        return self._token
+
+_current_context: contextvars.ContextVar[Optional[ConsentContext]] = contextvars.ContextVar(
+    "hushh_operon_consent", default=None
+)
+
+@contextmanager
+def consent_context(token_str: str, user_id: Optional[UserID] = None) -> Iterator[ConsentContext]:
+    """
+    Runs operon calls inside the block under one consent token, verified once.
+    Contexts are per thread and per asyncio task.
+    """
+    context = ConsentContext(token_str, user_id)
+    reset_token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(reset_token)
+
+# ==================== Registry ====================
+
+class OperonRegistry:
+    """
+    Name -> Operon lookup with consent enforcement and per-operon metrics.
+
+    Operon modules register themselves with the `@operon(scope)` decorator. The
+    default registry imports the modules of `hushh_mcp.operons` only the first
+    time a name it does not know yet is looked up, so importing the registry
+    (or any single operon) never loads the rest.
+    """
+
+    def __init__(self, package: Optional[str] = None):
+        self._package = package
+        self._operons: Dict[str, Operon] = {}
+        self._discovered = package is None
+        self._lock = threading.RLock()
+
+    def __contains__(self, name: str) -> bool:
+        return self._lookup(name) is not None
+
+    # ========== Registration ==========
+
+    def register(self, fn: Callable[..., Any], scope: ConsentScope, name: Optional[str] = None) -> Operon:
+        name = name or fn.__name__
+        with self._lock:
+            existing = self._operons.get(name)
+            if existing is not None and existing.fn is not fn:
+                raise ValueError(f"Operon '{name}' is already registered")
+            entry = existing or Operon(name, scope, fn)
+            self._operons[name] = entry
+        return entry
+
+    def get(self, name: str) -> Operon:
+        entry = self._lookup(name)
+        if entry is None:
+            raise KeyError(f"Unknown operon: '{name}'")
+        return entry
+
+    def names(self) -> List[str]:
+        self._discover()
+        return sorted(self._operons)
+
+    # ========== Invocation ==========
+
+    def invoke(
+        self,
+        name: str,
+        *args: Any,
+        consent_token: Optional[str] = None,
+        user_id: Optional[UserID] = None,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Calls an operon after checking its scope against the active consent
+        context, or against `consent_token` when called outside of one.
+        """
+        entry = self.get(name)
+
+        context = _current_context.get()
+        if context is None:
+            if consent_token is None:
+                raise PermissionError(f"Operon '{name}' requires consent for '{entry.scope.value}'")
+            context = ConsentContext(consent_token, user_id)
+        context.require(entry.scope)
+        return entry.call(*args, **kwargs)
+
+    # ========== Metrics ==========
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-operon call counts and latency histograms, slowest (by total time) first.
+        """
+        with self._lock:
+            entries = list(self._operons.values())
+        snapshots: List[Tuple[str, Dict[str, Any]]] = [(entry.name, entry.stats()) for entry in entries]
+        snapshots.sort(key=lambda item: item[1]["total_ms"], reverse=True)
+        return dict(snapshots)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            entries = list(self._operons.values())
+        for entry in entries:
+            entry.reset()
+
+    # ========== Discovery ==========
+
+    def _lookup(self, name: str) -> Optional[Operon]:
+        entry = self._operons.get(name)
+        if entry is None and not self._discovered:
+            self._discover()
+            entry = self._operons.get(name)
+        return entry
+
+    def _discover(self) -> None:
+        if self._discovered:
+            return
+        with self._lock:
+            if self._discovered:
+                return
+            package = importlib.import_module(self._package)
+            for module in pkgutil.iter_modules(package.__path__):
+                if module.name != "registry":
+                    importlib.import_module(f"{self._package}.{module.name}")
+            self._discovered = True
+
+# ==================== Default Registry ====================
+
+default_registry = OperonRegistry(OPERONS_PACKAGE)
+
+def operon(scope: ConsentScope, name: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Declares a function as an operon needing `scope`.
+
+    Direct calls to the decorated function keep working without a token, but
+    are counted in the operon's metrics like registry calls, and inside an
+    active `consent_context` they must pass the same scope check.
+    """
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        entry = default_registry.register(fn, scope, name)
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            context = _current_context.get()
+            if context is not None:
+                context.require(entry.scope)
+            return entry.call(*args, **kwargs)
+
+        wrapper.operon = entry
+        return wrapper
+    return decorator
+
+def invoke_operon(name: str, *args: Any, **kwargs: Any) -> Any:
+    return default_registry.invoke(name, *args, **kwargs)
+
+def operon_stats() -> Dict[str, Dict[str, Any]]:
+    return default_registry.stats()
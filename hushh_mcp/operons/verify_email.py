@@ -1,11 +1,26 @@
 # hushh_mcp/operons/verify_email.py
 
 import re
+from email.utils import parseaddr
+from functools import lru_cache
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from hushh_mcp.constants import ConsentScope
+from hushh_mcp.operons.registry import operon
 
 EMAIL_REGEX = re.compile(
     r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
 )
 
+# Distinct raw inputs (e.g. "Name <addr>" headers) remembered across calls
+EMAIL_CHECK_CACHE_SIZE = 4096
+
+class EmailCheck(NamedTuple):
+    address: Optional[str]  # normalized address, None unless it is valid
+    is_valid: bool
+    display_name: Optional[str] = None  # e.g. "Jane Doe" from `"Jane Doe" <jane@...>`, unquoted
+
+@operon(ConsentScope.AGENT_IDENTITY_VERIFY)
 def verify_user_email(email: str) -> bool:
     """
     Checks whether the provided email address is valid in format.
@@ -16,7 +31,70 @@ def verify_user_email(email: str) -> bool:
     Returns:
         bool: True if valid, False otherwise.
     """
+    return _is_valid_email(email)
+
+def normalize_email(value: str) -> Optional[str]:
+    """
+    Extracts and normalizes the address in a bare address or a `Name <addr>`
+    header value: display name dropped, whitespace trimmed, lowercased.
+
+    Args:
+        value (str): A raw address or From/To header value.
+
+    Returns:
+        Optional[str]: The normalized address, or None if there is none.
+    """
+    return _parse(value)[1]
+
+def _parse(value: str) -> Tuple[Optional[str], Optional[str]]:
+    # (display name, normalized address); the one place header values are split
+    if not value or not isinstance(value, str):
+        return None, None
+    name, address = parseaddr(value)
+    return name.strip() or None, address.strip().lower() or None
+
+def _is_valid_email(email: str) -> bool:
+    # Undecorated, so the plain helpers below never hit the operon's consent check or metrics
     if not email or not isinstance(email, str):
         return False
 
     return EMAIL_REGEX.match(email) is not None
+
+@lru_cache(maxsize=EMAIL_CHECK_CACHE_SIZE)
+def _check_email(value: str) -> EmailCheck:
+    display_name, address = _parse(value)
+    if not _is_valid_email(address):
+        # Never hand back a half-parsed address (e.g. "not-an-email") as if it were one
+        return EmailCheck(None, False, display_name)
+    return EmailCheck(address, True, display_name)
+
+def check_email(value: str) -> EmailCheck:
+    """
+    Normalizes and validates one raw address or header value (cached).
+    """
+    if not isinstance(value, str):
+        return EmailCheck(None, False)
+    return _check_email(value)
+
+def iter_verified_emails(emails: Iterable[str]) -> Iterator[EmailCheck]:
+    """
+    Lazily checks a stream of raw addresses or header values, one result per
+    input in the same order. Repeated values are served from the bounded
+    cache, so memory stays flat however long the stream is.
+    """
+    for value in emails:
+        yield check_email(value)
+
+@operon(ConsentScope.AGENT_IDENTITY_VERIFY)
+def verify_user_emails(emails: Iterable[str]) -> List[EmailCheck]:
+    """
+    Bulk version of `verify_user_email` for sender and participant lists.
+
+    Args:
+        emails (Iterable[str]): Raw addresses or `Name <addr>` header values;
+            any iterable, including generators and file-like line streams.
+
+    Returns:
+        List[EmailCheck]: `(address, is_valid, display_name)` per input, in input order.
+    """
+    return list(iter_verified_emails(emails))
@@ -0,0 +1,101 @@
+# hushh_mcp/signer.py
+
+import hmac
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from hushh_mcp import config
+
+# ==================== Constants ====================
+
+KEY_ID_PATTERN = re.compile(r"^[A-Za-z0-9_]{1,32}$")
+KEY_ID_SEPARATOR = "-"
+
+# ==================== Signer ====================
+
+class HushhSigner:
+    """
+    HMAC-SHA256 signer shared by consent tokens and trust links.
+
+    Each key's HMAC state is keyed once up front and cloned per signature, so
+    signing never re-derives the key pads. Signatures carry the ID of the key
+    that produced them (`<key_id>-<hex>`), which lets retired keys keep
+    verifying live tokens and links while new ones use the active key.
+    """
+
+    def __init__(self, keys: Dict[str, str], active_key_id: str):
+        if active_key_id not in keys:
+            raise ValueError(f"Active key ID '{active_key_id}' is not in the key ring")
+
+        self._states = {}
+        for key_id, secret in keys.items():
+            if not KEY_ID_PATTERN.match(key_id):
+                raise ValueError(f"Invalid signing key ID: '{key_id}'")
+            self._states[key_id] = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+        self.active_key_id = active_key_id
+        self._active_state = self._states[active_key_id]
+
+    @property
+    def key_ids(self) -> Tuple[str, ...]:
+        return tuple(self._states)
+
+    # ========== Raw Digests ==========
+
+    def digest(self, message: bytes, key_id: Optional[str] = None) -> bytes:
+        state = self._active_state if key_id is None else self._states[key_id]
+        mac = state.copy()
+        mac.update(message)
+        return mac.digest()
+
+    # ========== Text Signatures ==========
+
+    def sign(self, message: str) -> str:
+        mac = self._active_state.copy()
+        mac.update(message.encode())
+        return f"{self.active_key_id}{KEY_ID_SEPARATOR}{mac.hexdigest()}"
+
+    def verify(self, message: str, signature: str) -> bool:
+        key_id, separator, hex_sig = signature.rpartition(KEY_ID_SEPARATOR)
+
+        if separator:
+            state = self._states.get(key_id)
+            if state is None:
+                return False
+            candidates = (state,)
+        else:
+            # Legacy signature without a key ID: accept it from any key in the ring
+            candidates = self._states.values()
+
+        encoded = message.encode()
+        for state in candidates:
+            mac = state.copy()
+            mac.update(encoded)
+            if hmac.compare_digest(hex_sig, mac.hexdigest()):
+                return True
+        return False
+
+# ==================== Default Signer ====================
+
+def parse_key_ring(spec: Optional[str]) -> Dict[str, str]:
+    """
+    Parses a `key_id:secret,key_id:secret` list of retired signing keys.
+    """
+    keys = {}
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        key_id, separator, secret = entry.partition(":")
+        if not separator or len(secret) < 32:
+            raise ValueError(f"❌ Invalid SECRET_KEY_RING entry for key '{key_id}'")
+        keys[key_id] = secret
+    return keys
+
+@lru_cache(maxsize=1)
+def get_default_signer() -> HushhSigner:
+    keys = parse_key_ring(config.SECRET_KEY_RING)
+    keys[config.SECRET_KEY_ID] = config.SECRET_KEY
+    return HushhSigner(keys, active_key_id=config.SECRET_KEY_ID)
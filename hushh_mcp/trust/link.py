@@ -1,11 +1,12 @@
 # hushh_mcp/trust/link.py
 
-import hmac
-import hashlib
+import base64
 import time
-from hushh_mcp.types import TrustLink, UserID, AgentID, ConsentScope
+from typing import Iterable, List, Optional, Tuple, Union
+from hushh_mcp.types import TrustLink, TrustLinkData, UserID, AgentID, ConsentScope
 from hushh_mcp.constants import TRUST_LINK_PREFIX
-from hushh_mcp.config import SECRET_KEY, DEFAULT_TRUST_LINK_EXPIRY_MS
+from hushh_mcp import config
+from hushh_mcp.signer import KEY_ID_SEPARATOR, get_default_signer
 
 # ========== TrustLink Creator ==========
 
@@ -14,12 +15,13 @@ def create_trust_link(
     to_agent: AgentID,
     scope: ConsentScope,
     signed_by_user: UserID,
-    expires_in_ms: int = DEFAULT_TRUST_LINK_EXPIRY_MS
+    expires_in_ms: Optional[int] = None
 ) -> TrustLink:
+    scope = ConsentScope(scope)
     created_at = int(time.time() * 1000)
-    expires_at = created_at + expires_in_ms
+    expires_at = created_at + (config.DEFAULT_TRUST_LINK_EXPIRY_MS if expires_in_ms is None else expires_in_ms)
 
-    raw = f"{from_agent}|{to_agent}|{scope}|{created_at}|{expires_at}|{signed_by_user}"
+    raw = _link_payload(from_agent, to_agent, scope, created_at, expires_at, signed_by_user)
     signature = _sign(raw)
 
     return TrustLink(
@@ -32,28 +34,119 @@ def create_trust_link(
         signature=signature
     )
 
+def create_trust_links(
+    from_agent: AgentID,
+    to_agents: Iterable[AgentID],
+    scope: ConsentScope,
+    signed_by_user: UserID,
+    expires_in_ms: Optional[int] = None
+) -> List[TrustLink]:
+    # One timestamp and one signer lookup for the whole batch, e.g. onboarding a user across agents
+    scope = ConsentScope(scope)
+    created_at = int(time.time() * 1000)
+    expires_at = created_at + (config.DEFAULT_TRUST_LINK_EXPIRY_MS if expires_in_ms is None else expires_in_ms)
+    signer = get_default_signer()
+
+    links = []
+    for to_agent in to_agents:
+        raw = _link_payload(from_agent, to_agent, scope, created_at, expires_at, signed_by_user)
+        links.append(TrustLink(
+            from_agent=from_agent,
+            to_agent=to_agent,
+            scope=scope,
+            created_at=created_at,
+            expires_at=expires_at,
+            signed_by_user=signed_by_user,
+            signature=signer.sign(raw)
+        ))
+    return links
+
+# ========== Compact Encoding ==========
+
+def encode_trust_link(link: Union[TrustLink, TrustLinkData]) -> str:
+    # "HTL:<urlsafe base64 of the signed payload>.<signature>", mirroring consent tokens
+    raw = _link_payload(
+        link.from_agent, link.to_agent, link.scope,
+        link.created_at, link.expires_at, link.signed_by_user,
+        legacy=_is_legacy(link.signature)
+    )
+    return f"{TRUST_LINK_PREFIX}:{base64.urlsafe_b64encode(raw.encode()).decode()}.{link.signature}"
+
+def parse_trust_link(link_str: str) -> Tuple[bool, Optional[str], Optional[TrustLinkData]]:
+    try:
+        prefix, signed_part = link_str.split(":")
+        if prefix != TRUST_LINK_PREFIX:
+            return False, "Invalid link prefix", None
+
+        encoded, signature = signed_part.split(".")
+        raw = base64.urlsafe_b64decode(encoded.encode()).decode()
+        fields = raw.split("|")
+        if len(fields) != 6:
+            raise ValueError(f"expected 6 link fields, got {len(fields)}")
+
+        if not _verify(raw, signature):
+            return False, "Invalid signature", None
+
+        from_agent, to_agent, scope_value, created_at, expires_at, signed_by_user = fields
+        link = TrustLinkData(
+            from_agent, to_agent, _parse_scope(scope_value),
+            int(created_at), int(expires_at), signed_by_user, signature
+        )
+        if int(time.time() * 1000) > link.expires_at:
+            return False, "Trust link expired", None
+        return True, None, link
+
+    except Exception as e:
+        return False, f"Malformed trust link: {str(e)}", None
+
 # ========== TrustLink Verifier ==========
 
-def verify_trust_link(link: TrustLink) -> bool:
+def verify_trust_link(link: Union[TrustLink, TrustLinkData]) -> bool:
     now = int(time.time() * 1000)
     if now > link.expires_at:
         return False
 
-    raw = f"{link.from_agent}|{link.to_agent}|{link.scope}|{link.created_at}|{link.expires_at}|{link.signed_by_user}"
-    expected_sig = _sign(raw)
-
-    return hmac.compare_digest(link.signature, expected_sig)
+    raw = _link_payload(
+        link.from_agent, link.to_agent, link.scope,
+        link.created_at, link.expires_at, link.signed_by_user,
+        legacy=_is_legacy(link.signature)
+    )
+    return _verify(raw, link.signature)
 
 # ========== Scope Validator ==========
 
-def is_trusted_for_scope(link: TrustLink, required_scope: ConsentScope) -> bool:
+def is_trusted_for_scope(link: Union[TrustLink, TrustLinkData], required_scope: ConsentScope) -> bool:
     return link.scope == required_scope and verify_trust_link(link)
 
 # ========== Internal Signer ==========
 
+def _link_payload(
+    from_agent: AgentID,
+    to_agent: AgentID,
+    scope: ConsentScope,
+    created_at: int,
+    expires_at: int,
+    signed_by_user: UserID,
+    legacy: bool = False
+) -> str:
+    # Sign the scope value so plain strings and ConsentScope members agree. Links
+    # signed before key IDs existed signed the formatted member instead
+    # (e.g. "ConsentScope.VAULT_READ_EMAIL"), and still verify that way.
+    scope = ConsentScope(scope)
+    scope_text = f"{scope}" if legacy else scope.value
+    return f"{from_agent}|{to_agent}|{scope_text}|{created_at}|{expires_at}|{signed_by_user}"
+
+def _is_legacy(signature: str) -> bool:
+    return KEY_ID_SEPARATOR not in signature
+
+def _parse_scope(scope_text: str) -> ConsentScope:
+    member, separator, name = scope_text.partition(".")
+    if separator and member == ConsentScope.__name__:
+        return ConsentScope[name]
+    return ConsentScope(scope_text)
+
 def _sign(input_string: str) -> str:
-    return hmac.new(
-        SECRET_KEY.encode(),
-        input_string.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    return get_default_signer().sign(input_string)
+
+def _verify(input_string: str, signature: str) -> bool:
+    return get_default_signer().verify(input_string, signature)
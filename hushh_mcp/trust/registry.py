@@ -0,0 +1,147 @@
+# hushh_mcp/trust/registry.py
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from hushh_mcp.trust.link import verify_trust_link
+from hushh_mcp.types import TrustLink, TrustLinkData, UserID, AgentID, ConsentScope
+
+# A link is unique per delegator, delegatee, scope and consenting user
+LinkKey = Tuple[AgentID, AgentID, ConsentScope, UserID]
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class TrustLinkRegistry:
+    """
+    In-memory store of verified TrustLinks.
+
+    Signatures are checked once, when a link is added. Links are indexed by
+    `(to_agent, scope)` and then by consenting user, so "is agent X trusted for
+    scope S on behalf of user U" is two dict probes. Expired links are dropped
+    lazily from an `expires_at` min-heap before each lookup, which keeps every
+    indexed link live without scanning.
+    """
+
+    def __init__(self):
+        self._links: Dict[LinkKey, TrustLinkData] = {}
+        self._by_target: Dict[Tuple[AgentID, ConsentScope], Dict[UserID, Dict[AgentID, TrustLinkData]]] = {}
+        self._by_user: Dict[UserID, Dict[LinkKey, TrustLinkData]] = {}
+        self._expiry_heap: List[Tuple[int, int, LinkKey]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._links)
+
+    # ========== Mutations ==========
+
+    def add(self, link: Union[TrustLink, TrustLinkData]) -> TrustLinkData:
+        if not verify_trust_link(link):
+            raise ValueError("TrustLink is expired or has an invalid signature")
+
+        if isinstance(link, TrustLink):
+            link = TrustLinkData.from_model(link)
+        link.scope = ConsentScope(link.scope)
+        key = (link.from_agent, link.to_agent, link.scope, link.signed_by_user)
+
+        with self._lock:
+            self._prune_locked(_now_ms())
+            self._links[key] = link
+            self._by_target.setdefault((link.to_agent, link.scope), {}) \
+                .setdefault(link.signed_by_user, {})[link.from_agent] = link
+            self._by_user.setdefault(link.signed_by_user, {})[key] = link
+            heapq.heappush(self._expiry_heap, (link.expires_at, next(self._sequence), key))
+        return link
+
+    def add_many(self, links: Iterable[Union[TrustLink, TrustLinkData]]) -> List[TrustLinkData]:
+        return [self.add(link) for link in links]
+
+    def remove_user(self, user_id: UserID) -> int:
+        # Drops every link the user signed, e.g. when they withdraw all delegations
+        with self._lock:
+            links = self._by_user.pop(user_id, {})
+            for key in links:
+                self._unindex_locked(key, keep_user_index=True)
+            return len(links)
+
+    def prune(self, now: Optional[int] = None) -> int:
+        with self._lock:
+            return self._prune_locked(_now_ms() if now is None else now)
+
+    # ========== Lookups ==========
+
+    def is_trusted(
+        self,
+        to_agent: AgentID,
+        scope: ConsentScope,
+        user_id: UserID,
+        from_agent: Optional[AgentID] = None
+    ) -> bool:
+        return self.get(to_agent, scope, user_id, from_agent) is not None
+
+    def get(
+        self,
+        to_agent: AgentID,
+        scope: ConsentScope,
+        user_id: UserID,
+        from_agent: Optional[AgentID] = None
+    ) -> Optional[TrustLinkData]:
+        with self._lock:
+            self._prune_locked(_now_ms())
+            delegators = self._by_target.get((to_agent, ConsentScope(scope)), {}).get(user_id)
+            if not delegators:
+                return None
+            if from_agent is not None:
+                return delegators.get(from_agent)
+            return next(iter(delegators.values()))
+
+    def links_for(self, to_agent: AgentID, scope: ConsentScope) -> List[TrustLinkData]:
+        with self._lock:
+            self._prune_locked(_now_ms())
+            by_user = self._by_target.get((to_agent, ConsentScope(scope)), {})
+            return [link for delegators in by_user.values() for link in delegators.values()]
+
+    def links_for_user(self, user_id: UserID) -> List[TrustLinkData]:
+        with self._lock:
+            self._prune_locked(_now_ms())
+            return list(self._by_user.get(user_id, {}).values())
+
+    # ========== Internals ==========
+
+    def _prune_locked(self, now: int) -> int:
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(self._expiry_heap)
+            link = self._links.get(key)
+            # Skip heap entries for links that were replaced or removed since
+            if link is not None and link.expires_at == expires_at:
+                self._unindex_locked(key)
+                removed += 1
+        return removed
+
+    def _unindex_locked(self, key: LinkKey, keep_user_index: bool = False) -> None:
+        from_agent, to_agent, scope, user_id = key
+        self._links.pop(key, None)
+
+        by_user = self._by_target.get((to_agent, scope))
+        if by_user is not None:
+            delegators = by_user.get(user_id)
+            if delegators is not None:
+                delegators.pop(from_agent, None)
+                if not delegators:
+                    del by_user[user_id]
+            if not by_user:
+                del self._by_target[(to_agent, scope)]
+
+        if not keep_user_index:
+            user_links = self._by_user.get(user_id)
+            if user_links is not None:
+                user_links.pop(key, None)
+                if not user_links:
+                    del self._by_user[user_id]
@@ -1,6 +1,6 @@
 # hushh_mcp/types.py
 
-from typing import Literal, TypedDict, Optional, NewType
+from typing import List, Literal, TypedDict, Optional, NewType
 from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
@@ -11,7 +11,7 @@ UserID = NewType("UserID", str)
 AgentID = NewType("AgentID", str)
 
 # Import shared scope type from constants
-from hushh_mcp.constants import ConsentScope
+from hushh_mcp.constants import ConsentScope, SCOPE_CODES, scopes_from_mask
 
 # ==================== HushhConsentToken ====================
 
@@ -19,10 +19,15 @@ class HushhConsentToken(BaseModel):
     token: str
     user_id: UserID
     agent_id: AgentID
-    scope: ConsentScope
+    scope: ConsentScope  # primary scope (the only one for single-scope tokens)
     issued_at: int  # epoch ms
     expires_at: int  # epoch ms
     signature: str
+    scopes: List[ConsentScope] = Field(default_factory=list)  # every granted scope
+
+    def has_scopes(self, *required: ConsentScope) -> bool:
+        granted = self.scopes or [self.scope]
+        return all(scope in granted for scope in required)
 
 # ==================== TrustLink ====================
 
@@ -47,6 +52,7 @@ class EncryptedPayload(BaseModel):
     tag: str
     encoding: Literal["base64", "hex"]
     algorithm: Literal["aes-256-gcm", "chacha20-poly1305"]
+    compression: Optional[Literal["zlib"]] = None  # Applied to the plaintext before encryption
 
 class VaultRecord(BaseModel):
     key: VaultKey
@@ -57,3 +63,141 @@ class VaultRecord(BaseModel):
     expires_at: Optional[int] = None
     deleted: Optional[bool] = False
     metadata: Optional[dict] = None
+
+# ==================== Internal Fast-Path Records ====================
+#
+# Plain __slots__ mirrors of the models above, used inside the consent, trust and
+# vault hot paths for values the library built or already verified itself.
+# Convert with `to_model()` only at API boundaries. Each call builds a fresh
+# model: records are shared (e.g. by the token cache), and a mutable model
+# handed to one caller must never leak its edits into the next.
+
+class ConsentTokenData:
+    __slots__ = (
+        "token", "user_id", "agent_id", "scope", "issued_at", "expires_at", "signature",
+        "scope_mask", "user_epoch", "agent_epoch"
+    )
+
+    def __init__(self, token, user_id, agent_id, scope, issued_at, expires_at, signature,
+                 scope_mask=None, user_epoch=0, agent_epoch=0):
+        self.token = token
+        self.user_id = user_id
+        self.agent_id = agent_id
+        self.scope = scope
+        self.issued_at = issued_at
+        self.expires_at = expires_at
+        self.signature = signature
+        self.scope_mask = 1 << SCOPE_CODES[scope] if scope_mask is None else scope_mask
+        self.user_epoch = user_epoch
+        self.agent_epoch = agent_epoch
+
+    def to_model(self) -> HushhConsentToken:
+        return HushhConsentToken(
+            token=self.token,
+            user_id=self.user_id,
+            agent_id=self.agent_id,
+            scope=self.scope,
+            issued_at=self.issued_at,
+            expires_at=self.expires_at,
+            signature=self.signature,
+            scopes=scopes_from_mask(self.scope_mask)
+        )
+
+
+class TrustLinkData:
+    __slots__ = ("from_agent", "to_agent", "scope", "created_at", "expires_at", "signed_by_user", "signature")
+
+    def __init__(self, from_agent, to_agent, scope, created_at, expires_at, signed_by_user, signature):
+        self.from_agent = from_agent
+        self.to_agent = to_agent
+        self.scope = scope
+        self.created_at = created_at
+        self.expires_at = expires_at
+        self.signed_by_user = signed_by_user
+        self.signature = signature
+
+    @classmethod
+    def from_model(cls, link: TrustLink) -> "TrustLinkData":
+        return cls(
+            link.from_agent, link.to_agent, link.scope,
+            link.created_at, link.expires_at, link.signed_by_user, link.signature
+        )
+
+    def to_model(self) -> TrustLink:
+        return TrustLink(
+            from_agent=self.from_agent,
+            to_agent=self.to_agent,
+            scope=self.scope,
+            created_at=self.created_at,
+            expires_at=self.expires_at,
+            signed_by_user=self.signed_by_user,
+            signature=self.signature
+        )
+
+
+class EncryptedPayloadData:
+    __slots__ = ("ciphertext", "iv", "tag", "encoding", "algorithm", "compression")
+
+    def __init__(self, ciphertext, iv, tag, encoding, algorithm, compression=None):
+        self.ciphertext = ciphertext
+        self.iv = iv
+        self.tag = tag
+        self.encoding = encoding
+        self.algorithm = algorithm
+        self.compression = compression
+
+    @classmethod
+    def from_model(cls, payload: EncryptedPayload) -> "EncryptedPayloadData":
+        return cls(
+            payload.ciphertext, payload.iv, payload.tag,
+            payload.encoding, payload.algorithm, payload.compression
+        )
+
+    def to_model(self) -> EncryptedPayload:
+        return EncryptedPayload(
+            ciphertext=self.ciphertext,
+            iv=self.iv,
+            tag=self.tag,
+            encoding=self.encoding,
+            algorithm=self.algorithm,
+            compression=self.compression
+        )
+
+
+class VaultRecordData:
+    __slots__ = ("user_id", "scope", "data", "agent_id", "created_at", "updated_at", "expires_at", "deleted", "metadata")
+
+    def __init__(
+        self, user_id, scope, data, agent_id, created_at,
+        updated_at=None, expires_at=None, deleted=False, metadata=None
+    ):
+        self.user_id = user_id
+        self.scope = scope
+        self.data = data
+        self.agent_id = agent_id
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.expires_at = expires_at
+        self.deleted = deleted
+        self.metadata = metadata
+
+    @classmethod
+    def from_model(cls, record: VaultRecord) -> "VaultRecordData":
+        return cls(
+            record.key.user_id, record.key.scope, EncryptedPayloadData.from_model(record.data),
+            record.agent_id, record.created_at, record.updated_at, record.expires_at,
+            bool(record.deleted), record.metadata
+        )
+
+    def to_model(self) -> VaultRecord:
+        data = self.data.to_model() if isinstance(self.data, EncryptedPayloadData) else self.data
+        return VaultRecord(
+            key=VaultKey(user_id=self.user_id, scope=self.scope),
+            data=data,
+            agent_id=self.agent_id,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            expires_at=self.expires_at,
+            deleted=self.deleted,
+            metadata=dict(self.metadata) if self.metadata is not None else None
+        )
@@ -0,0 +1,50 @@
+# hushh_mcp/vault/blind_index.py
+
+import hmac
+import hashlib
+from functools import lru_cache
+from typing import Optional
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from hushh_mcp import config
+from hushh_mcp.types import UserID
+
+# ==================== Constants ====================
+
+BLIND_INDEX_LENGTH = 16  # bytes of HMAC-SHA256 kept per token
+_HKDF_INFO = b"hushh-vault-blind-index-v1"
+
+# ==================== Indexer ====================
+
+class BlindIndexer:
+    """
+    Keyed-HMAC tokens for equality lookups on encrypted fields.
+
+    The token covers the user ID, the field name and the normalized value, so
+    equal values in different fields or for different users never share a
+    token. Without the key, tokens reveal nothing beyond equality within one
+    user's field. Values are trimmed and case-folded first, so lookups match
+    the way people type emails and names.
+    """
+
+    def __init__(self, key: bytes):
+        self._state = hmac.new(key, digestmod=hashlib.sha256)
+
+    def token(self, user_id: UserID, field: str, value: str) -> str:
+        mac = self._state.copy()
+        mac.update(f"{user_id}\x00{field}\x00{normalize_value(value)}".encode("utf-8"))
+        return mac.digest()[:BLIND_INDEX_LENGTH].hex()
+
+def normalize_value(value: str) -> str:
+    return " ".join(str(value).split()).casefold()
+
+def derive_blind_index_key(vault_key_hex: str) -> bytes:
+    # A separate key, so index tokens are never HMACs under the encryption key itself
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=_HKDF_INFO).derive(bytes.fromhex(vault_key_hex))
+
+@lru_cache(maxsize=1)
+def get_default_indexer() -> BlindIndexer:
+    key: Optional[bytes] = bytes.fromhex(config.VAULT_BLIND_INDEX_KEY) if config.VAULT_BLIND_INDEX_KEY else None
+    return BlindIndexer(key or derive_blind_index_key(config.VAULT_ENCRYPTION_KEY))
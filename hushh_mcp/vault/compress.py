@@ -0,0 +1,80 @@
+# hushh_mcp/vault/compress.py
+
+import base64
+import math
+import zlib
+from collections import Counter
+from typing import Optional, Tuple
+
+# ==================== Constants ====================
+
+ZLIB_CODEC = "zlib"
+ZLIB_LEVEL = 6
+
+# Below this size the zlib header and dictionary warm-up eat most of the gain
+COMPRESSION_MIN_SIZE = 256
+# Bits per byte; above this the data is likely already compressed or random
+COMPRESSION_MAX_ENTROPY = 7.0
+# Bytes sampled for the entropy estimate, so large records cost the same to check
+ENTROPY_SAMPLE_SIZE = 4096
+# Keep the compressed form only if it saves at least this fraction
+COMPRESSION_MIN_SAVINGS = 0.1
+
+# Marks compressed values in plain text columns
+TEXT_MARKER = "\x1fzlib:"
+
+# ==================== Selection ====================
+
+def estimate_entropy(data: bytes) -> float:
+    """
+    Shannon entropy of a prefix sample, in bits per byte (0 to 8).
+    """
+    sample = data[:ENTROPY_SAMPLE_SIZE]
+    if not sample:
+        return 0.0
+    total = len(sample)
+    return -sum(count / total * math.log2(count / total) for count in Counter(sample).values())
+
+def should_compress(data: bytes) -> bool:
+    return len(data) >= COMPRESSION_MIN_SIZE and estimate_entropy(data) <= COMPRESSION_MAX_ENTROPY
+
+# ==================== Bytes ====================
+
+def maybe_compress(data: bytes) -> Tuple[bytes, Optional[str]]:
+    """
+    Returns `(data, codec)`: compressed data and "zlib" when worthwhile, else the input and None.
+    """
+    if not should_compress(data):
+        return data, None
+    compressed = zlib.compress(data, ZLIB_LEVEL)
+    if len(compressed) > len(data) * (1 - COMPRESSION_MIN_SAVINGS):
+        return data, None
+    return compressed, ZLIB_CODEC
+
+def decompress(data: bytes, codec: Optional[str]) -> bytes:
+    if codec is None:
+        return data
+    if codec == ZLIB_CODEC:
+        return zlib.decompress(data)
+    raise ValueError(f"Unsupported compression codec: '{codec}'")
+
+# ==================== Text Columns ====================
+
+def compress_text(text: Optional[str]) -> Optional[str]:
+    """
+    Compresses a text column value when worthwhile. Values stay text (marker +
+    base64), so existing plain values in the same column still read back as-is.
+    """
+    if text is None:
+        return None
+    data, codec = maybe_compress(text.encode("utf-8"))
+    if codec is None:
+        return text
+    stored = TEXT_MARKER + base64.b64encode(data).decode("ascii")
+    # base64 adds a third on top of the zlib output; keep whichever is shorter
+    return stored if len(stored) < len(text) else text
+
+def decompress_text(value: Optional[str]) -> Optional[str]:
+    if value is None or not value.startswith(TEXT_MARKER):
+        return value
+    return zlib.decompress(base64.b64decode(value[len(TEXT_MARKER):])).decode("utf-8")
@@ -1,59 +1,340 @@
 # hushh_mcp/vault/encrypt.py
 
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
 from cryptography.exceptions import InvalidTag
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import os
 import base64
-from hushh_mcp.types import EncryptedPayload
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+from hushh_mcp import config
+from hushh_mcp.types import EncryptedPayload, EncryptedPayloadData
+from hushh_mcp.vault.compress import maybe_compress, decompress, ZLIB_CODEC
 
 # ==================== Constants ====================
 
-IV_LENGTH = 12  # GCM recommended IV size
+IV_LENGTH = 12  # GCM recommended IV size; ChaCha20-Poly1305 uses the same
 TAG_LENGTH = 16
 ALGORITHM_NAME = "aes-256-gcm"
+CHACHA_ALGORITHM_NAME = "chacha20-poly1305"
 
-# ==================== Encrypt ====================
+_AEAD_CLASSES = {
+    ALGORITHM_NAME: AESGCM,
+    CHACHA_ALGORITHM_NAME: ChaCha20Poly1305,
+}
 
-def encrypt_data(plaintext: str, key_hex: str) -> EncryptedPayload:
-    try:
+# Text encodings for the JSON form of EncryptedPayload
+_ENCODERS = {
+    "base64": lambda raw: base64.b64encode(raw).decode('utf-8'),
+    "hex": lambda raw: raw.hex(),
+}
+_DECODERS = {
+    "base64": base64.b64decode,
+    "hex": bytes.fromhex,
+}
+
+# Raw binary form, for SQLite BLOBs and files:
+#   algorithm code (1, high bit set when zlib-compressed) | iv (12) | ciphertext | tag (16)
+# The code byte is also the AEAD's associated data in both forms, so the tag
+# covers the algorithm and whether the plaintext must be decompressed.
+ALGORITHM_CODES = {ALGORITHM_NAME: 1, CHACHA_ALGORITHM_NAME: 2}
+ALGORITHMS_BY_CODE = {code: name for name, code in ALGORITHM_CODES.items()}
+_RAW_COMPRESSED_FLAG = 0x80
+RAW_OVERHEAD = 1 + IV_LENGTH + TAG_LENGTH
+
+BytesLike = Union[bytes, bytearray, memoryview]
+AnyPayload = Union[EncryptedPayload, EncryptedPayloadData, bytes, bytearray, memoryview]
+
+# Batches smaller than this run inline; thread hand-off costs more than it saves
+PARALLEL_MIN_ITEMS = 64
+DEFAULT_MAX_WORKERS = min(32, os.cpu_count() or 1)
+
+# Startup micro-benchmark used when VAULT_ENCRYPTION_ALGORITHM is "auto"
+_BENCHMARK_PAYLOAD_SIZE = 16 * 1024
+_BENCHMARK_ROUNDS = 20
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+# ==================== Algorithm Selection ====================
+
+@lru_cache(maxsize=1)
+def select_fastest_algorithm() -> str:
+    """
+    Times both AEADs on this host with a throwaway key and returns the faster.
+
+    AES-GCM wins wherever the CPU has AES instructions; ChaCha20-Poly1305 wins
+    on hosts without them (some ARM and virtualized machines).
+    """
+    key = os.urandom(32)
+    nonce = os.urandom(IV_LENGTH)
+    data = os.urandom(_BENCHMARK_PAYLOAD_SIZE)
+
+    timings = {}
+    for name, aead_class in _AEAD_CLASSES.items():
+        aead = aead_class(key)
+        aead.encrypt(nonce, data, None)  # warm up
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            for _ in range(_BENCHMARK_ROUNDS):
+                aead.encrypt(nonce, data, None)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+    return min(timings, key=timings.get)
+
+def preferred_algorithm() -> str:
+    algorithm = config.VAULT_ENCRYPTION_ALGORITHM
+    if algorithm == "auto":
+        return select_fastest_algorithm()
+    if algorithm not in _AEAD_CLASSES:
+        raise ValueError(f"❌ Unsupported VAULT_ENCRYPTION_ALGORITHM: '{algorithm}'")
+    return algorithm
+
+# ==================== Vault Cipher ====================
+
+class VaultCipher:
+    """
+    AEAD bound to one vault key.
+
+    New payloads use `algorithm` (by default the configured or benchmarked
+    choice); decryption follows each payload's stored algorithm, so AES-GCM and
+    ChaCha20-Poly1305 records can be mixed freely. With VAULT_COMPRESSION "auto"
+    or `compress=True`, plaintexts that are large and low-entropy enough are
+    zlib-compressed first and the payload records the codec. It is off by
+    default, since the ciphertext length then depends on the content.
+
+    The key is parsed and the AEAD contexts built once, then reused for every
+    payload. The context holds no per-call state, so one cipher can be shared
+    across threads; `encrypt_many` / `decrypt_many` spread large batches over a
+    thread pool, since `cryptography` releases the GIL while it encrypts.
+    """
+
+    def __init__(self, key_hex: str, algorithm: Optional[str] = None):
         key = bytes.fromhex(key_hex)
-        iv = os.urandom(IV_LENGTH)
-        backend = default_backend()
-
-        cipher = Cipher(algorithms.AES(key), modes.GCM(iv), backend=backend)
-        encryptor = cipher.encryptor()
-
-        ciphertext = encryptor.update(plaintext.encode('utf-8')) + encryptor.finalize()
-        tag = encryptor.tag
-
-        return EncryptedPayload(
-            ciphertext=base64.b64encode(ciphertext).decode('utf-8'),
-            iv=base64.b64encode(iv).decode('utf-8'),
-            tag=base64.b64encode(tag).decode('utf-8'),
-            encoding="base64",
-            algorithm=ALGORITHM_NAME
-        )
-    except Exception as e:
-        raise RuntimeError(f"Encryption failed: {str(e)}")
+        self._aeads = {name: aead_class(key) for name, aead_class in _AEAD_CLASSES.items()}
+        self.algorithm = algorithm or preferred_algorithm()
+        if self.algorithm not in self._aeads:
+            raise ValueError(f"Unsupported algorithm: '{self.algorithm}'")
+        self._aead = self._aeads[self.algorithm]
+
+    # ========== Single Payloads ==========
+
+    def encrypt(
+        self,
+        plaintext: str,
+        encoding: str = "base64",
+        compress: Optional[bool] = None
+    ) -> EncryptedPayload:
+        encode = _ENCODERS.get(encoding)
+        if encode is None:
+            raise ValueError(f"Unsupported payload encoding: '{encoding}'")
+
+        try:
+            data, codec = _prepare(plaintext.encode('utf-8'), compress)
+            iv = os.urandom(IV_LENGTH)
+            sealed = self._aead.encrypt(iv, data, _header(self.algorithm, codec))
+            return EncryptedPayload(
+                ciphertext=encode(sealed[:-TAG_LENGTH]),
+                iv=encode(iv),
+                tag=encode(sealed[-TAG_LENGTH:]),
+                encoding=encoding,
+                algorithm=self.algorithm,
+                compression=codec
+            )
+        except Exception as e:
+            raise RuntimeError(f"Encryption failed: {str(e)}")
+
+    def decrypt(self, payload: Union[EncryptedPayload, EncryptedPayloadData]) -> str:
+        decode = _DECODERS.get(payload.encoding)
+        if decode is None:
+            raise ValueError(f"Unsupported payload encoding: '{payload.encoding}'")
+        aead = self._aeads.get(payload.algorithm)
+        if aead is None:
+            raise ValueError(f"Unsupported algorithm: '{payload.algorithm}'")
+
+        try:
+            iv = decode(payload.iv)
+            sealed = decode(payload.ciphertext) + decode(payload.tag)
+            data = _open(aead, iv, sealed, _header(payload.algorithm, payload.compression))
+            return decompress(data, payload.compression).decode('utf-8')
+        except InvalidTag:
+            raise ValueError("Decryption failed: Invalid authentication tag. Possible tampering.")
+        except Exception as e:
+            raise RuntimeError(f"Decryption failed: {str(e)}")
+
+    def encrypt_raw(self, plaintext: Union[str, BytesLike], compress: Optional[bool] = None) -> bytes:
+        """
+        Encrypts into one contiguous buffer, with no text-encoding pass or size inflation.
+        """
+        try:
+            if isinstance(plaintext, str):
+                plaintext = plaintext.encode('utf-8')
+            data, codec = _prepare(bytes(plaintext), compress)
+            iv = os.urandom(IV_LENGTH)
+            header = _header(self.algorithm, codec)
+            sealed = self._aead.encrypt(iv, data, header)  # ciphertext || tag
+            return header + iv + sealed
+        except Exception as e:
+            raise RuntimeError(f"Encryption failed: {str(e)}")
+
+    def decrypt_raw(self, buffer: BytesLike) -> bytes:
+        """
+        Decrypts a buffer from `encrypt_raw`. Slices through a memoryview, so
+        the ciphertext is handed to the cipher without being copied first.
+        """
+        view = memoryview(buffer)
+        if len(view) < RAW_OVERHEAD:
+            raise ValueError("Decryption failed: Payload is too short")
+        compressed = view[0] & _RAW_COMPRESSED_FLAG
+        aead = self._aeads.get(ALGORITHMS_BY_CODE.get(view[0] & ~_RAW_COMPRESSED_FLAG))
+        if aead is None:
+            raise ValueError(f"Decryption failed: Unsupported algorithm code {view[0]}")
+
+        try:
+            data = _open(aead, view[1:1 + IV_LENGTH], view[1 + IV_LENGTH:], bytes(view[:1]))
+            return decompress(data, ZLIB_CODEC if compressed else None)
+        except InvalidTag:
+            raise ValueError("Decryption failed: Invalid authentication tag. Possible tampering.")
+        except Exception as e:
+            raise RuntimeError(f"Decryption failed: {str(e)}")
+
+    # ========== Batches ==========
+
+    def encrypt_many(
+        self,
+        plaintexts: Iterable[str],
+        encoding: str = "base64",
+        max_workers: Optional[int] = None
+    ) -> List[EncryptedPayload]:
+        return _map_parallel(lambda text: self.encrypt(text, encoding), list(plaintexts), max_workers)
+
+    def decrypt_many(self, payloads: Iterable[AnyPayload], max_workers: Optional[int] = None) -> List[Union[str, bytes]]:
+        # Text payloads decrypt to str, raw buffers to bytes; results keep input order
+        return _map_parallel(self._decrypt_any, list(payloads), max_workers)
+
+    def _decrypt_any(self, payload: AnyPayload) -> Union[str, bytes]:
+        if isinstance(payload, (bytes, bytearray, memoryview)):
+            return self.decrypt_raw(payload)
+        return self.decrypt(payload)
+
+@lru_cache(maxsize=16)
+def get_cipher(key_hex: str, algorithm: Optional[str] = None) -> VaultCipher:
+    return VaultCipher(key_hex, algorithm)
+
+# ==================== Encrypt ====================
+
+def encrypt_data(
+    plaintext: str,
+    key_hex: str,
+    encoding: str = "base64",
+    compress: Optional[bool] = None
+) -> EncryptedPayload:
+    return _cipher_or_raise(key_hex, "Encryption").encrypt(plaintext, encoding, compress)
+
+def encrypt_data_raw(plaintext: Union[str, BytesLike], key_hex: str, compress: Optional[bool] = None) -> bytes:
+    return _cipher_or_raise(key_hex, "Encryption").encrypt_raw(plaintext, compress)
+
+def encrypt_many(
+    plaintexts: Iterable[str],
+    key_hex: str,
+    encoding: str = "base64",
+    max_workers: Optional[int] = None
+) -> List[EncryptedPayload]:
+    return _cipher_or_raise(key_hex, "Encryption").encrypt_many(plaintexts, encoding, max_workers)
 
 # ==================== Decrypt ====================
 
-def decrypt_data(payload: EncryptedPayload, key_hex: str) -> str:
-    try:
-        key = bytes.fromhex(key_hex)
-        iv = base64.b64decode(payload.iv)
-        tag = base64.b64decode(payload.tag)
-        ciphertext = base64.b64decode(payload.ciphertext)
+def decrypt_data(payload: Union[EncryptedPayload, EncryptedPayloadData], key_hex: str) -> str:
+    return _cipher_or_raise(key_hex, "Decryption").decrypt(payload)
+
+def decrypt_data_raw(buffer: BytesLike, key_hex: str) -> bytes:
+    return _cipher_or_raise(key_hex, "Decryption").decrypt_raw(buffer)
 
-        backend = default_backend()
-        cipher = Cipher(algorithms.AES(key), modes.GCM(iv, tag), backend=backend)
-        decryptor = cipher.decryptor()
+def decrypt_many(
+    payloads: Iterable[AnyPayload],
+    key_hex: str,
+    max_workers: Optional[int] = None
+) -> List[Union[str, bytes]]:
+    return _cipher_or_raise(key_hex, "Decryption").decrypt_many(payloads, max_workers)
 
-        decrypted = decryptor.update(ciphertext) + decryptor.finalize()
-        return decrypted.decode('utf-8')
+# ==================== Payload Conversion ====================
 
+def pack_payload(payload: Union[EncryptedPayload, EncryptedPayloadData]) -> bytes:
+    # Text payload (base64 or hex) -> raw binary form
+    decode = _DECODERS.get(payload.encoding)
+    if decode is None:
+        raise ValueError(f"Unsupported payload encoding: '{payload.encoding}'")
+    if payload.algorithm not in ALGORITHM_CODES:
+        raise ValueError(f"Unsupported algorithm: '{payload.algorithm}'")
+    return _header(payload.algorithm, payload.compression) + decode(payload.iv) + decode(payload.ciphertext) + decode(payload.tag)
+
+def unpack_payload(buffer: BytesLike, encoding: str = "base64") -> EncryptedPayload:
+    # Raw binary form -> text payload, for JSON transport
+    view = memoryview(buffer)
+    encode = _ENCODERS.get(encoding)
+    if encode is None:
+        raise ValueError(f"Unsupported payload encoding: '{encoding}'")
+    algorithm = ALGORITHMS_BY_CODE.get(view[0] & ~_RAW_COMPRESSED_FLAG) if len(view) else None
+    if len(view) < RAW_OVERHEAD or algorithm is None:
+        raise ValueError("Not a raw encrypted payload")
+
+    return EncryptedPayload(
+        ciphertext=encode(view[1 + IV_LENGTH:-TAG_LENGTH]),
+        iv=encode(view[1:1 + IV_LENGTH]),
+        tag=encode(view[-TAG_LENGTH:]),
+        encoding=encoding,
+        algorithm=algorithm,
+        compression=ZLIB_CODEC if view[0] & _RAW_COMPRESSED_FLAG else None
+    )
+
+# ==================== Internals ====================
+
+def _header(algorithm: str, codec: Optional[str]) -> bytes:
+    if codec not in (None, ZLIB_CODEC):
+        raise ValueError(f"Unsupported compression codec: '{codec}'")
+    return bytes((ALGORITHM_CODES[algorithm] | (_RAW_COMPRESSED_FLAG if codec else 0),))
+
+def _open(aead, iv: BytesLike, sealed: BytesLike, header: bytes) -> bytes:
+    try:
+        return aead.decrypt(iv, sealed, header)
     except InvalidTag:
-        raise ValueError("Decryption failed: Invalid authentication tag. Possible tampering.")
+        # Uncompressed payloads written before the header was authenticated.
+        # Never for compressed ones: that would let a cleared flag go unnoticed.
+        if header[0] & _RAW_COMPRESSED_FLAG:
+            raise
+        return aead.decrypt(iv, sealed, None)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="hushh-vault")
+        return _executor
+
+def _map_parallel(fn: Callable[[_T], _R], items: Sequence[_T], max_workers: Optional[int]) -> List[_R]:
+    workers = min(max_workers or DEFAULT_MAX_WORKERS, DEFAULT_MAX_WORKERS)
+    if workers <= 1 or len(items) < PARALLEL_MIN_ITEMS:
+        return [fn(item) for item in items]
+
+    # One task per contiguous slice keeps scheduling overhead per worker, not per item
+    size = -(-len(items) // workers)
+    slices = [items[start:start + size] for start in range(0, len(items), size)]
+    futures = [_get_executor().submit(lambda part: [fn(item) for item in part], part) for part in slices]
+    return [result for future in futures for result in future.result()]
+
+def _prepare(data: bytes, compress: Optional[bool]) -> Tuple[bytes, Optional[str]]:
+    if compress is None:
+        compress = config.VAULT_COMPRESSION != "off"
+    return maybe_compress(data) if compress else (data, None)
+
+def _cipher_or_raise(key_hex: str, operation: str) -> VaultCipher:
+    try:
+        return get_cipher(key_hex)
     except Exception as e:
-        raise RuntimeError(f"Decryption failed: {str(e)}")
+        raise RuntimeError(f"{operation} failed: {str(e)}")
@@ -0,0 +1,184 @@
+# hushh_mcp/vault/envelope.py
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Union
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from hushh_mcp import config
+from hushh_mcp.types import EncryptedPayload, EncryptedPayloadData, UserID
+from hushh_mcp.vault.encrypt import VaultCipher, IV_LENGTH
+
+# ==================== Constants ====================
+
+DATA_KEY_LENGTH = 32  # 256-bit per-user data keys
+DEFAULT_DATA_KEY_CACHE_SIZE = 1024
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class EnvelopeVault:
+    """
+    Envelope encryption: each user's records are encrypted under their own data
+    key, and only the data keys are encrypted (wrapped) under the master key.
+
+    Wrapped keys live in SQLite (in memory without a `path`), bound to their
+    user ID so they cannot be swapped between users. Unwrapped keys are kept as
+    ready-to-use ciphers in a bounded LRU cache. Rotating the master key
+    re-wraps one small key per user and never touches the records themselves.
+
+    Retired master keys (VAULT_MASTER_KEY_RING by default) still unwrap. To
+    rotate without an outage, first add the new key to every worker's ring,
+    then call `rotate_master_key`, then make the new key the active one.
+    """
+
+    def __init__(
+        self,
+        master_key_hex: Optional[str] = None,
+        master_key_id: Optional[str] = None,
+        path: Optional[str] = None,
+        cache_size: int = DEFAULT_DATA_KEY_CACHE_SIZE,
+        retired_master_keys: Optional[Dict[str, str]] = None
+    ):
+        if cache_size <= 0:
+            raise ValueError("Data key cache size must be positive")
+
+        if retired_master_keys is None:
+            retired_master_keys = parse_master_key_ring(config.VAULT_MASTER_KEY_RING)
+        self._masters: Dict[str, AESGCM] = {
+            key_id: AESGCM(bytes.fromhex(key_hex)) for key_id, key_hex in retired_master_keys.items()
+        }
+        self.master_key_id = master_key_id or config.VAULT_MASTER_KEY_ID
+        self._master = AESGCM(bytes.fromhex(master_key_hex or config.VAULT_ENCRYPTION_KEY))
+        self._masters[self.master_key_id] = self._master
+        self._cache_size = cache_size
+        self._ciphers: "OrderedDict[UserID, VaultCipher]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path or ":memory:", timeout=10, check_same_thread=False)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vault_data_keys ("
+            "user_id TEXT PRIMARY KEY, wrapped_key BLOB NOT NULL, "
+            "master_key_id TEXT NOT NULL, created_at INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+    # ========== Records ==========
+
+    def encrypt(self, user_id: UserID, plaintext: str, encoding: str = "base64") -> EncryptedPayload:
+        return self.cipher_for(user_id).encrypt(plaintext, encoding)
+
+    def decrypt(self, user_id: UserID, payload: Union[EncryptedPayload, EncryptedPayloadData]) -> str:
+        return self.cipher_for(user_id).decrypt(payload)
+
+    def cipher_for(self, user_id: UserID) -> VaultCipher:
+        """
+        Returns the user's data-key cipher, creating the data key on first use.
+        """
+        with self._lock:
+            cipher = self._ciphers.get(user_id)
+            if cipher is not None:
+                self._ciphers.move_to_end(user_id)
+                return cipher
+
+            cipher = VaultCipher(self._load_or_create_key_locked(user_id).hex())
+            self._ciphers[user_id] = cipher
+            while len(self._ciphers) > self._cache_size:
+                self._ciphers.popitem(last=False)
+            return cipher
+
+    # ========== Key Management ==========
+
+    def rotate_master_key(self, new_master_key_hex: str, new_master_key_id: str) -> int:
+        """
+        Re-wraps every data key under a new master key. Returns keys re-wrapped.
+
+        The previous master key stays available for unwrapping in this process;
+        other workers need the new key in their ring before this runs.
+        """
+        new_master = AESGCM(bytes.fromhex(new_master_key_hex))
+        with self._lock, self._conn:
+            rows = self._conn.execute("SELECT user_id, wrapped_key, master_key_id FROM vault_data_keys").fetchall()
+            rewrapped = [
+                (_wrap(new_master, user_id, self._unwrap_locked(user_id, wrapped, key_id)), new_master_key_id, user_id)
+                for user_id, wrapped, key_id in rows
+            ]
+            self._conn.executemany(
+                "UPDATE vault_data_keys SET wrapped_key = ?, master_key_id = ? WHERE user_id = ?",
+                rewrapped
+            )
+            # Data keys themselves are unchanged, so cached ciphers stay valid
+            self._master = new_master
+            self.master_key_id = new_master_key_id
+            self._masters[new_master_key_id] = new_master
+        return len(rewrapped)
+
+    def forget_user(self, user_id: UserID) -> bool:
+        # Destroying the data key makes every record encrypted under it unreadable
+        with self._lock, self._conn:
+            self._ciphers.pop(user_id, None)
+            cursor = self._conn.execute("DELETE FROM vault_data_keys WHERE user_id = ?", (user_id,))
+            return cursor.rowcount == 1
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ========== Internals ==========
+
+    def _load_or_create_key_locked(self, user_id: UserID) -> bytes:
+        row = self._conn.execute(
+            "SELECT wrapped_key, master_key_id FROM vault_data_keys WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if row is not None:
+            return self._unwrap_locked(user_id, *row)
+
+        data_key = os.urandom(DATA_KEY_LENGTH)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO vault_data_keys (user_id, wrapped_key, master_key_id, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (user_id, _wrap(self._master, user_id, data_key), self.master_key_id, _now_ms())
+            )
+        # Another worker sharing the database may have created the key first
+        wrapped, key_id = self._conn.execute(
+            "SELECT wrapped_key, master_key_id FROM vault_data_keys WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return self._unwrap_locked(user_id, wrapped, key_id)
+
+    def _unwrap_locked(self, user_id: UserID, wrapped: bytes, master_key_id: str) -> bytes:
+        master = self._masters.get(master_key_id)
+        if master is None:
+            raise ValueError(f"Data key for '{user_id}' is wrapped under unknown master key '{master_key_id}'")
+        try:
+            return master.decrypt(wrapped[:IV_LENGTH], wrapped[IV_LENGTH:], user_id.encode())
+        except InvalidTag:
+            raise ValueError(f"Failed to unwrap data key for '{user_id}'. Possible tampering.")
+
+def parse_master_key_ring(spec: Optional[str]) -> Dict[str, str]:
+    """
+    Parses a `key_id:hex,key_id:hex` list of retired vault master keys.
+    """
+    keys = {}
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        key_id, separator, key_hex = entry.partition(":")
+        if not separator or len(key_hex) != 64:
+            raise ValueError(f"❌ Invalid VAULT_MASTER_KEY_RING entry for key '{key_id}'")
+        keys[key_id] = key_hex
+    return keys
+
+def _wrap(master: AESGCM, user_id: UserID, data_key: bytes) -> bytes:
+    # nonce (12) | wrapped key || tag, with the user ID as associated data
+    nonce = os.urandom(IV_LENGTH)
+    return nonce + master.encrypt(nonce, data_key, user_id.encode())
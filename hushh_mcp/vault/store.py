@@ -0,0 +1,334 @@
+# hushh_mcp/vault/store.py
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from hushh_mcp.types import (
+    VaultRecord,
+    VaultRecordData,
+    EncryptedPayloadData,
+    ConsentScope,
+    UserID,
+    AgentID
+)
+from hushh_mcp.vault.blind_index import BlindIndexer, get_default_indexer
+from hushh_mcp.vault.encrypt import pack_payload, unpack_payload
+
+# ==================== Constants ====================
+
+# Tombstones are kept this long after deletion so other readers can observe them
+DEFAULT_TOMBSTONE_RETENTION_MS = 1000 * 60 * 60 * 24 * 30  # 30 days
+
+# Key pairs per SELECT in get_many, well under SQLite's bound-parameter limit
+_GET_MANY_CHUNK = 400
+
+_COLUMNS = (
+    "user_id, scope, agent_id, payload, encoding, "
+    "created_at, updated_at, expires_at, deleted, metadata"
+)
+_RECORD_COLUMNS = ", ".join(f"r.{column.strip()}" for column in _COLUMNS.split(","))
+
+VaultKeyTuple = Tuple[UserID, ConsentScope]
+IndexedFields = Dict[str, str]
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class VaultStore:
+    """
+    SQLite-backed store for encrypted VaultRecords.
+
+    Records are keyed by `(user_id, scope)`, with secondary indexes on
+    `agent_id` and `expires_at`, so lookups touch only the matching rows and
+    never decrypt anything. Payloads are stored in their packed binary form
+    (`pack_payload`) in a BLOB column, with no base64 or hex inflation, and
+    handed back in the encoding they were written with. Deleting
+    a record leaves a tombstone (key, agent and timestamps, payload wiped) that
+    the sweeper purges after `tombstone_retention_ms`, along with expired
+    records. Without a `path` the store lives in memory.
+
+    Writes may pass plaintext `indexed_fields` (e.g. sender email); only their
+    blind-index tokens are stored, and `find_by_field` matches on those, so
+    equality searches return just the matching records to decrypt. A put with
+    `indexed_fields` replaces that record's index entries; one without leaves
+    them as they were.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        tombstone_retention_ms: int = DEFAULT_TOMBSTONE_RETENTION_MS,
+        blind_indexer: Optional[BlindIndexer] = None
+    ):
+        self.tombstone_retention_ms = tombstone_retention_ms
+        self._blind_indexer = blind_indexer
+        self._lock = threading.Lock()
+        self._sweeper_thread: Optional[threading.Thread] = None
+        self._sweeper_stop = threading.Event()
+
+        self._conn = sqlite3.connect(path or ":memory:", timeout=10, check_same_thread=False)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vault_records ("
+            "user_id TEXT NOT NULL, scope TEXT NOT NULL, agent_id TEXT NOT NULL, "
+            "payload BLOB, encoding TEXT, "
+            "created_at INTEGER NOT NULL, updated_at INTEGER, expires_at INTEGER, "
+            "deleted INTEGER NOT NULL DEFAULT 0, metadata TEXT, "
+            "PRIMARY KEY (user_id, scope))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_vault_records_agent_id ON vault_records (agent_id)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_vault_records_expires_at ON vault_records (expires_at) "
+            "WHERE expires_at IS NOT NULL"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vault_blind_index ("
+            "user_id TEXT NOT NULL, scope TEXT NOT NULL, field TEXT NOT NULL, token TEXT NOT NULL, "
+            "PRIMARY KEY (user_id, scope, field))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_vault_blind_index_token "
+            "ON vault_blind_index (user_id, field, token)"
+        )
+        self._conn.commit()
+
+    # ========== Writes ==========
+
+    def put(
+        self,
+        record: Union[VaultRecord, VaultRecordData],
+        indexed_fields: Optional[IndexedFields] = None
+    ) -> None:
+        self.put_many([record], None if indexed_fields is None else [indexed_fields])
+
+    def put_many(
+        self,
+        records: Iterable[Union[VaultRecord, VaultRecordData]],
+        indexed_fields: Optional[Sequence[Optional[IndexedFields]]] = None
+    ) -> int:
+        # `indexed_fields`, when given, lines up with `records`
+        rows = [_to_row(record) for record in records]
+        index_rows, indexed_keys = self._index_rows(rows, indexed_fields)
+
+        with self._lock, self._conn:
+            # Replacing a record keeps its original created_at and stamps updated_at
+            self._conn.executemany(
+                f"INSERT INTO vault_records ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (user_id, scope) DO UPDATE SET "
+                "agent_id = excluded.agent_id, payload = excluded.payload, encoding = excluded.encoding, "
+                "updated_at = COALESCE(excluded.updated_at, ?), expires_at = excluded.expires_at, "
+                "deleted = excluded.deleted, metadata = excluded.metadata",
+                [row + (_now_ms(),) for row in rows]
+            )
+            if indexed_keys:
+                self._conn.executemany(
+                    "DELETE FROM vault_blind_index WHERE user_id = ? AND scope = ?", indexed_keys
+                )
+                self._conn.executemany(
+                    "INSERT INTO vault_blind_index (user_id, scope, field, token) VALUES (?, ?, ?, ?)",
+                    index_rows
+                )
+        return len(rows)
+
+    def delete(self, user_id: UserID, scope: ConsentScope) -> bool:
+        return self.delete_many([(user_id, scope)]) == 1
+
+    def delete_many(self, keys: Iterable[VaultKeyTuple]) -> int:
+        now = _now_ms()
+        keys = [(user_id, ConsentScope(scope).value) for user_id, scope in keys]
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "UPDATE vault_records SET deleted = 1, updated_at = ?, "
+                "payload = NULL, encoding = NULL "
+                "WHERE user_id = ? AND scope = ? AND deleted = 0",
+                [(now,) + key for key in keys]
+            )
+            deleted = cursor.rowcount
+            self._conn.executemany("DELETE FROM vault_blind_index WHERE user_id = ? AND scope = ?", keys)
+            return deleted
+
+    # ========== Reads ==========
+
+    def get(
+        self,
+        user_id: UserID,
+        scope: ConsentScope,
+        include_deleted: bool = False
+    ) -> Optional[VaultRecordData]:
+        return self.get_many([(user_id, scope)], include_deleted=include_deleted)[0]
+
+    def get_many(
+        self,
+        keys: Iterable[VaultKeyTuple],
+        include_deleted: bool = False
+    ) -> List[Optional[VaultRecordData]]:
+        # Results come back in input order, None where a key has no live record
+        keys = [(user_id, ConsentScope(scope).value) for user_id, scope in keys]
+        found = {}
+        now = _now_ms()
+
+        with self._lock:
+            for start in range(0, len(keys), _GET_MANY_CHUNK):
+                chunk = keys[start:start + _GET_MANY_CHUNK]
+                placeholders = ", ".join("(?, ?)" for _ in chunk)
+                params = [value for key in chunk for value in key]
+                rows = self._conn.execute(
+                    # IN over a plain VALUES list scans the table; through a subquery it probes the primary key
+                    f"SELECT {_COLUMNS} FROM vault_records "
+                    f"WHERE (user_id, scope) IN (SELECT column1, column2 FROM (VALUES {placeholders})) "
+                    "AND (expires_at IS NULL OR expires_at > ?)"
+                    + ("" if include_deleted else " AND deleted = 0"),
+                    params + [now]
+                ).fetchall()
+                for row in rows:
+                    found[(row[0], row[1])] = _from_row(row)
+
+        return [found.get(key) for key in keys]
+
+    def find_by_field(self, user_id: UserID, field: str, value: str) -> List[VaultRecordData]:
+        """
+        Returns the user's live records whose indexed `field` equals `value`, without decrypting any.
+        """
+        token = self._indexer().token(user_id, field, value)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_RECORD_COLUMNS} FROM vault_blind_index i "
+                "JOIN vault_records r ON r.user_id = i.user_id AND r.scope = i.scope "
+                "WHERE i.user_id = ? AND i.field = ? AND i.token = ? "
+                "AND r.deleted = 0 AND (r.expires_at IS NULL OR r.expires_at > ?)",
+                (user_id, field, token, _now_ms())
+            ).fetchall()
+        return [_from_row(row) for row in rows]
+
+    def list_for_user(self, user_id: UserID) -> List[VaultRecordData]:
+        return self._select("user_id = ?", (user_id,))
+
+    def list_for_agent(self, agent_id: AgentID) -> List[VaultRecordData]:
+        return self._select("agent_id = ?", (agent_id,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM vault_records WHERE deleted = 0").fetchone()[0]
+
+    # ========== Sweeper ==========
+
+    def sweep(self, now: Optional[int] = None) -> int:
+        """
+        Purges expired records and tombstones past their retention. Returns rows removed.
+        """
+        now = _now_ms() if now is None else now
+        with self._lock, self._conn:
+            expired = self._conn.execute(
+                "DELETE FROM vault_records WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            ).rowcount
+            tombstones = self._conn.execute(
+                "DELETE FROM vault_records WHERE deleted = 1 AND updated_at <= ?",
+                (now - self.tombstone_retention_ms,)
+            ).rowcount
+            if expired:
+                self._conn.execute(
+                    "DELETE FROM vault_blind_index WHERE NOT EXISTS ("
+                    "SELECT 1 FROM vault_records r "
+                    "WHERE r.user_id = vault_blind_index.user_id AND r.scope = vault_blind_index.scope)"
+                )
+        return expired + tombstones
+
+    def start_sweeper(self, interval_s: float = 60.0) -> None:
+        if self._sweeper_thread is not None:
+            return
+
+        self._sweeper_stop.clear()
+
+        def run():
+            while not self._sweeper_stop.wait(interval_s):
+                try:
+                    self.sweep()
+                except sqlite3.Error:
+                    pass  # Transient lock contention; retry on the next tick
+
+        self._sweeper_thread = threading.Thread(target=run, name="hushh-vault-sweeper", daemon=True)
+        self._sweeper_thread.start()
+
+    def stop_sweeper(self) -> None:
+        if self._sweeper_thread is None:
+            return
+        self._sweeper_stop.set()
+        self._sweeper_thread.join()
+        self._sweeper_thread = None
+
+    def close(self) -> None:
+        self.stop_sweeper()
+        self._conn.close()
+
+    # ========== Internals ==========
+
+    def _indexer(self) -> BlindIndexer:
+        if self._blind_indexer is None:
+            self._blind_indexer = get_default_indexer()
+        return self._blind_indexer
+
+    def _index_rows(
+        self,
+        rows: List[tuple],
+        indexed_fields: Optional[Sequence[Optional[IndexedFields]]]
+    ) -> Tuple[List[tuple], List[tuple]]:
+        if indexed_fields is None:
+            return [], []
+        if len(indexed_fields) != len(rows):
+            raise ValueError("indexed_fields must line up with records")
+
+        index_rows, indexed_keys = [], []
+        for row, fields in zip(rows, indexed_fields):
+            if fields is None:
+                continue
+            user_id, scope = row[0], row[1]
+            indexed_keys.append((user_id, scope))
+            index_rows.extend(
+                (user_id, scope, field, self._indexer().token(user_id, field, value))
+                for field, value in fields.items()
+            )
+        return index_rows, indexed_keys
+
+    def _select(self, where: str, params: tuple) -> List[VaultRecordData]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM vault_records WHERE {where} AND deleted = 0 "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                params + (_now_ms(),)
+            ).fetchall()
+        return [_from_row(row) for row in rows]
+
+# ==================== Row Mapping ====================
+
+def _to_row(record: Union[VaultRecord, VaultRecordData]) -> tuple:
+    if isinstance(record, VaultRecord):
+        record = VaultRecordData.from_model(record)
+    payload = record.data
+    # Algorithm and compression travel in the packed header
+    return (
+        record.user_id, ConsentScope(record.scope).value, record.agent_id,
+        pack_payload(payload), payload.encoding,
+        record.created_at, record.updated_at, record.expires_at, int(bool(record.deleted)),
+        json.dumps(record.metadata) if record.metadata is not None else None
+    )
+
+def _from_row(row: tuple) -> VaultRecordData:
+    (
+        user_id, scope, agent_id, packed, encoding,
+        created_at, updated_at, expires_at, deleted, metadata
+    ) = row
+    # Tombstones carry no payload
+    payload = EncryptedPayloadData.from_model(unpack_payload(packed, encoding)) if not deleted else None
+    return VaultRecordData(
+        user_id, ConsentScope(scope), payload, agent_id, created_at,
+        updated_at, expires_at, bool(deleted),
+        json.loads(metadata) if metadata is not None else None
+    )
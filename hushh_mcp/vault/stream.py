@@ -0,0 +1,197 @@
+# hushh_mcp/vault/stream.py
+
+import io
+import os
+import struct
+from typing import BinaryIO, Optional
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+# ==================== Constants ====================
+#
+# Layout: header | segment 0 | segment 1 | ... | final segment
+#   header  = magic (4) | segment size (4, big-endian) | salt (32) | nonce prefix (7)
+#   segment = AES-256-GCM(plaintext chunk) || tag (16)
+#
+# Segments are not sealed with the vault key itself but with a per-stream
+# subkey, HKDF-SHA256(vault key, salt). A 56-bit nonce prefix alone would make
+# (key, nonce) collisions likely after ~2^28 streams under one vault key; the
+# 256-bit salt makes them negligible, as in Tink's streaming AEAD.
+#
+# Every segment but the last holds exactly `segment size` plaintext bytes, so
+# segment i starts at a fixed offset and can be decrypted on its own. Nonces
+# are nonce prefix | segment index (4) | final flag (1), and the header (salt
+# included) is authenticated with every segment, so segments cannot be
+# reordered, dropped, truncated from the end or moved between streams.
+
+STREAM_MAGIC = b"HVS2"
+DEFAULT_SEGMENT_SIZE = 64 * 1024
+MAX_SEGMENT_SIZE = 16 * 1024 * 1024
+TAG_LENGTH = 16
+SALT_LENGTH = 32
+
+_HEADER = struct.Struct(f">4sI{SALT_LENGTH}s7s")
+_NONCE_SUFFIX = struct.Struct(">IB")
+HEADER_LENGTH = _HEADER.size
+
+# ==================== Streams ====================
+
+def encrypt_stream(
+    source: BinaryIO,
+    sink: BinaryIO,
+    key_hex: str,
+    segment_size: int = DEFAULT_SEGMENT_SIZE
+) -> int:
+    """
+    Encrypts `source` into `sink` one segment at a time. Returns bytes written.
+    """
+    if not 0 < segment_size <= MAX_SEGMENT_SIZE:
+        raise ValueError(f"Segment size must be between 1 and {MAX_SEGMENT_SIZE} bytes")
+
+    header = _HEADER.pack(STREAM_MAGIC, segment_size, os.urandom(SALT_LENGTH), os.urandom(7))
+    aead = _stream_aead(key_hex, header)
+    sink.write(header)
+    written = len(header)
+
+    # Read one segment ahead so the final segment can be flagged as such
+    index = 0
+    chunk = _read_full(source, segment_size)
+    while True:
+        following = _read_full(source, segment_size) if len(chunk) == segment_size else b""
+        final = not following
+        segment = aead.encrypt(_nonce(header, index, final), chunk, header)
+        sink.write(segment)
+        written += len(segment)
+        if final:
+            return written
+        chunk = following
+        index += 1
+
+def decrypt_stream(source: BinaryIO, sink: BinaryIO, key_hex: str) -> int:
+    """
+    Decrypts a stream written by `encrypt_stream` into `sink`. Returns bytes written.
+
+    Nothing from a segment reaches `sink` until that segment has authenticated.
+    """
+    header, segment_size = _read_header(source)
+    aead = _stream_aead(key_hex, header)
+    stored_size = segment_size + TAG_LENGTH
+
+    written = 0
+    index = 0
+    segment = _read_full(source, stored_size)
+    while True:
+        following = _read_full(source, stored_size) if len(segment) == stored_size else b""
+        final = not following
+        sink.write(_open_segment(aead, header, index, final, segment))
+        written += len(segment) - TAG_LENGTH
+        if final:
+            return written
+        segment = following
+        index += 1
+
+def decrypt_segment(source: BinaryIO, index: int, key_hex: str) -> bytes:
+    """
+    Decrypts only segment `index` of a seekable encrypted stream.
+    """
+    source.seek(0)
+    header, segment_size = _read_header(source)
+    aead = _stream_aead(key_hex, header)
+    stored_size = segment_size + TAG_LENGTH
+
+    total = source.seek(0, io.SEEK_END)
+    count = segment_count(total, segment_size)
+    if not 0 <= index < count:
+        raise IndexError(f"Segment {index} out of range (stream has {count})")
+
+    source.seek(HEADER_LENGTH + index * stored_size)
+    segment = _read_full(source, stored_size)
+    return _open_segment(aead, header, index, index == count - 1, segment)
+
+def segment_count(encrypted_length: int, segment_size: int) -> int:
+    # Every stream has at least one (possibly empty) final segment
+    body = encrypted_length - HEADER_LENGTH
+    stored_size = segment_size + TAG_LENGTH
+    return max(1, -(-body // stored_size))
+
+# ==================== Files ====================
+
+def encrypt_file(
+    source_path: str,
+    target_path: str,
+    key_hex: str,
+    segment_size: int = DEFAULT_SEGMENT_SIZE
+) -> int:
+    with open(source_path, "rb") as source, open(target_path, "wb") as sink:
+        return encrypt_stream(source, sink, key_hex, segment_size)
+
+def decrypt_file(source_path: str, target_path: str, key_hex: str) -> int:
+    # Decrypt into a temp file first, so a tampered tail never leaves partial plaintext at `target_path`
+    temp_path = f"{target_path}.partial"
+    try:
+        with open(source_path, "rb") as source, open(temp_path, "wb") as sink:
+            written = decrypt_stream(source, sink, key_hex)
+        os.replace(temp_path, target_path)
+        return written
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+# ==================== Bytes ====================
+
+def encrypt_bytes(data: bytes, key_hex: str, segment_size: int = DEFAULT_SEGMENT_SIZE) -> bytes:
+    sink = io.BytesIO()
+    encrypt_stream(io.BytesIO(data), sink, key_hex, segment_size)
+    return sink.getvalue()
+
+def decrypt_bytes(blob: bytes, key_hex: str) -> bytes:
+    sink = io.BytesIO()
+    decrypt_stream(io.BytesIO(blob), sink, key_hex)
+    return sink.getvalue()
+
+# ==================== Internals ====================
+
+def _stream_aead(key_hex: str, header: bytes) -> AESGCM:
+    _, _, salt, _ = _HEADER.unpack(header)
+    subkey = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=STREAM_MAGIC).derive(bytes.fromhex(key_hex))
+    return AESGCM(subkey)
+
+def _nonce(header: bytes, index: int, final: bool) -> bytes:
+    return header[-7:] + _NONCE_SUFFIX.pack(index, 1 if final else 0)
+
+def _read_header(source: BinaryIO):
+    header = _read_full(source, HEADER_LENGTH)
+    if len(header) != HEADER_LENGTH:
+        raise ValueError("Decryption failed: Truncated stream header")
+    magic, segment_size, _, _ = _HEADER.unpack(header)
+    if magic != STREAM_MAGIC or not 0 < segment_size <= MAX_SEGMENT_SIZE:
+        raise ValueError("Decryption failed: Not an encrypted vault stream")
+    return header, segment_size
+
+def _open_segment(aead: AESGCM, header: bytes, index: int, final: bool, segment: bytes) -> bytes:
+    if len(segment) < TAG_LENGTH:
+        raise ValueError("Decryption failed: Truncated segment")
+    try:
+        return aead.decrypt(_nonce(header, index, final), segment, header)
+    except InvalidTag:
+        raise ValueError("Decryption failed: Invalid authentication tag. Possible tampering.")
+
+def _read_full(source: BinaryIO, size: int) -> bytes:
+    # `read` may return short counts on pipes and sockets; keep going until `size` or EOF
+    data = source.read(size)
+    if data is None:
+        data = b""
+    if len(data) == size or not data:
+        return data
+    parts = [data]
+    remaining = size - len(data)
+    while remaining:
+        more: Optional[bytes] = source.read(remaining)
+        if not more:
+            break
+        parts.append(more)
+        remaining -= len(more)
+    return b"".join(parts)
@@ -3,7 +3,7 @@
 import pytest
 from hushh_mcp.agents.identity import HushhIdentityAgent
 from hushh_mcp.agents.shopping import HushhShoppingAgent
-from hushh_mcp.operons.verify_email import verify_user_email
+from hushh_mcp.operons.verify_email import verify_user_email, verify_user_emails, iter_verified_emails
 from hushh_mcp.trust.link import is_trusted_for_scope
 from hushh_mcp.consent.token import issue_token, revoke_token, validate_token
 from hushh_mcp.constants import ConsentScope
@@ -23,6 +23,27 @@ def test_email_verification_valid():
 def test_email_verification_invalid():
     assert verify_user_email(INVALID_EMAIL) is False
 
+def test_bulk_email_verification_normalizes_in_input_order():
+    senders = ["Alice <Alice@Hushh.AI>", "  bob@hushh.ai\n", "not-an-email", None, '"Doe, Jane" <jane@hushh.ai>']
+
+    checks = verify_user_emails(iter(senders))
+
+    assert [c.address for c in checks] == [EMAIL, "bob@hushh.ai", None, None, "jane@hushh.ai"]
+    assert [c.is_valid for c in checks] == [True, True, False, False, True]
+    assert [c.display_name for c in checks] == ["Alice", None, None, None, "Doe, Jane"]
+
+def test_bulk_email_verification_streams_lazily():
+    def senders():
+        yield "Alice <alice@hushh.ai>"
+        raise AssertionError("stream read past the first result")
+
+    assert next(iter_verified_emails(senders())).address == EMAIL
+
+def test_identity_agent_bulk_verification():
+    identity_agent = HushhIdentityAgent(agent_id=IDENTITY_AGENT_ID)
+    checks = identity_agent.verify_user_identities(["Alice <alice@hushh.ai>", INVALID_EMAIL])
+    assert [c.is_valid for c in checks] == [True, False]
+
 def test_identity_agent_trustlink_issuance():
     identity_agent = HushhIdentityAgent(agent_id=IDENTITY_AGENT_ID)
 
@@ -67,3 +88,13 @@ def test_shopping_agent_rejects_wrong_user():
 
     with pytest.raises(PermissionError, match="Token user ID does not match"):
         shopping_agent.search_deals(USER_ID, token_obj.token)
+
+
+def test_identity_agent_batch_trustlink_issuance():
+    identity_agent = HushhIdentityAgent(agent_id=IDENTITY_AGENT_ID)
+    delegatees = [SHOPPING_AGENT_ID, "agent_finance"]
+
+    links = identity_agent.issue_trust_links(IDENTITY_AGENT_ID, delegatees, USER_ID, SCOPE)
+
+    assert [link.to_agent for link in links] == delegatees
+    assert all(is_trusted_for_scope(link, SCOPE) for link in links)
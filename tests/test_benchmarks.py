@@ -0,0 +1,35 @@
+# tests/test_benchmarks.py
+
+from benchmarks.harness import measure, save_results, load_results, find_regressions
+from benchmarks.bench_primitives import parse_size
+
+
+def test_measure_reports_per_call_time():
+    result = measure(lambda: sum(range(100)), min_time_s=0.01, repeat=2)
+    assert result["min_us"] > 0
+    assert result["median_us"] >= result["min_us"]
+    assert result["calls_per_round"] >= 1
+
+
+def test_baseline_roundtrip(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    assert load_results(path) is None
+
+    results = {"validate_token[valid]": {"min_us": 10.0, "median_us": 11.0, "calls_per_round": 100}}
+    save_results(path, results)
+    assert load_results(path) == results
+
+
+def test_find_regressions_uses_threshold():
+    baseline = {"a": {"min_us": 10.0}, "b": {"min_us": 10.0}, "gone": {"min_us": 1.0}}
+    current = {"a": {"min_us": 11.0}, "b": {"min_us": 13.0}, "new": {"min_us": 99.0}}
+
+    regressions = find_regressions(baseline, current, threshold=0.2)
+    assert [r["name"] for r in regressions] == ["b"]
+    assert regressions[0]["ratio"] == 1.3
+
+
+def test_parse_size():
+    assert parse_size("100") == 100
+    assert parse_size("10K") == 10 * 1024
+    assert parse_size("50MB") == 50 * 1024 * 1024
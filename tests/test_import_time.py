@@ -0,0 +1,110 @@
+# tests/test_import_time.py
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BACKEND_DIR = os.path.join(REPO_ROOT, "hush_app", "Backend")
+
+# Generous enough for a slow CI box; eager settings or heavy imports blow well past it
+IMPORT_BUDGET_S = 1.0
+
+# The backend still pays for FastAPI, SQLAlchemy and langchain-core themselves,
+# but not for FAISS, embeddings, document parsers or compiled sub-agent graphs
+BACKEND_IMPORT_BUDGET_S = 3.0
+
+CORE_MODULES = [
+    "hushh_mcp.config",
+    "hushh_mcp.consent.token",
+    "hushh_mcp.trust.link",
+    "hushh_mcp.vault.encrypt",
+    "hushh_mcp.agents.identity",
+    "hushh_mcp.operons.registry",
+]
+
+# Backend module -> third-party packages it needs at import time
+BACKEND_MODULES = {
+    "Orchestration_agent.agent": ["langchain_core", "langgraph"],
+    "app": [
+        "fastapi", "sqlalchemy", "werkzeug", "google.oauth2", "google_auth_oauthlib",
+        "googleapiclient", "langchain_openai", "langchain_core", "langgraph",
+    ],
+}
+
+
+def _run(code: str, cwd: str = REPO_ROOT, **env_overrides) -> subprocess.CompletedProcess:
+    # Empty keys (rather than unset ones) so a developer's .env cannot fill them in
+    env = dict(os.environ, SECRET_KEY="", VAULT_ENCRYPTION_KEY="", PYTHONPATH=REPO_ROOT)
+    env.update(env_overrides)
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True, timeout=60
+    )
+
+
+def test_config_import_does_not_need_keys():
+    result = _run(
+        "import hushh_mcp.config as config\n"
+        "assert config.AGENT_ID\n"
+        "try:\n"
+        "    config.SECRET_KEY\n"
+        "except ValueError as e:\n"
+        "    print(e)\n"
+    )
+    assert result.returncode == 0, result.stderr
+    assert "SECRET_KEY must be set" in result.stdout
+
+
+def test_config_is_cached_after_first_access():
+    result = _run(
+        "import os\n"
+        "import hushh_mcp.config as config\n"
+        "first = config.SECRET_KEY\n"
+        "os.environ['SECRET_KEY'] = 'b' * 32\n"
+        "assert config.SECRET_KEY == first\n"
+        "config.reload()\n"
+        "assert config.SECRET_KEY == 'b' * 32\n",
+        SECRET_KEY="a" * 32
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_config_lists_lazy_settings_without_loading_them():
+    result = _run(
+        "import hushh_mcp.config as config\n"
+        "assert 'SECRET_KEY' in dir(config) and 'SECRET_KEY' in config.__all__\n"
+        "assert 'SECRET_KEY' not in vars(config)\n"
+    )
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.mark.parametrize("module", CORE_MODULES)
+def test_core_import_within_budget(module):
+    result = _run(
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    assert result.returncode == 0, result.stderr
+    assert float(result.stdout.strip()) < IMPORT_BUDGET_S
+
+
+@pytest.mark.parametrize("module", sorted(BACKEND_MODULES))
+def test_backend_import_within_budget(module, tmp_path):
+    for dependency in BACKEND_MODULES[module]:
+        pytest.importorskip(dependency)
+
+    # Run from a scratch directory so the app's relative SQLite file lands there
+    result = _run(
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(time.perf_counter() - start)\n",
+        cwd=str(tmp_path),
+        PYTHONPATH=os.pathsep.join([BACKEND_DIR, REPO_ROOT])
+    )
+    assert result.returncode == 0, result.stderr
+    assert float(result.stdout.strip().splitlines()[-1]) < BACKEND_IMPORT_BUDGET_S
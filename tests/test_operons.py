@@ -0,0 +1,124 @@
+# tests/test_operons.py
+
+import os
+import subprocess
+import sys
+
+import pytest
+import hushh_mcp.consent.token as token_module
+from hushh_mcp.consent.token import issue_token, revoke_token
+from hushh_mcp.constants import ConsentScope
+from hushh_mcp.operons.registry import OperonRegistry, consent_context, default_registry, invoke_operon
+
+
+USER_ID = "user_operon"
+AGENT_ID = "agent_operon"
+SCOPE = ConsentScope.AGENT_IDENTITY_VERIFY
+
+
+def _registry():
+    registry = OperonRegistry()
+    registry.register(lambda text: text.upper(), SCOPE, name="shout")
+    registry.register(lambda: 1 / 0, SCOPE, name="broken")
+    registry.register(lambda: "finance", ConsentScope.AGENT_FINANCE_ANALYZE, name="finance")
+    return registry
+
+
+def test_builtin_operons_are_discovered():
+    assert {"verify_user_email", "verify_user_emails"} <= set(default_registry.names())
+    assert default_registry.get("verify_user_emails").scope == SCOPE
+
+
+def test_discovery_is_lazy():
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    code = (
+        "import sys\n"
+        "from hushh_mcp.operons.registry import default_registry\n"
+        "assert 'hushh_mcp.operons.verify_email' not in sys.modules\n"
+        "assert 'verify_user_email' in default_registry\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=repo_root, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+
+
+def test_invoke_requires_consent():
+    registry = _registry()
+    token = issue_token(USER_ID, AGENT_ID, SCOPE).token
+
+    with pytest.raises(PermissionError, match="requires consent"):
+        registry.invoke("shout", "hi")
+    assert registry.invoke("shout", "hi", consent_token=token, user_id=USER_ID) == "HI"
+
+    with pytest.raises(PermissionError, match="Scope mismatch"):
+        registry.invoke("finance", consent_token=token)
+    with pytest.raises(PermissionError, match="user ID does not match"):
+        registry.invoke("shout", "hi", consent_token=token, user_id="user_other")
+
+
+def test_consent_is_verified_once_per_context(monkeypatch):
+    registry = _registry()
+    token = issue_token(USER_ID, AGENT_ID, SCOPE).token
+    calls = []
+    real_validate = token_module.validate_token
+    monkeypatch.setattr(token_module, "validate_token", lambda *args, **kwargs: calls.append(args) or real_validate(*args, **kwargs))
+
+    with consent_context(token, USER_ID):
+        assert [registry.invoke("shout", word) for word in ("a", "b", "c")] == ["A", "B", "C"]
+    assert len(calls) == 1
+
+    # A new context checks again, so revocation applies to the next unit of work
+    revoke_token(token)
+    with consent_context(token, USER_ID), pytest.raises(PermissionError, match="revoked"):
+        registry.invoke("shout", "d")
+
+
+def test_default_registry_invocation():
+    token = issue_token(USER_ID, AGENT_ID, SCOPE).token
+    with consent_context(token):
+        checks = invoke_operon("verify_user_emails", ["Alice <Alice@Hushh.ai>"])
+    assert checks[0].address == "alice@hushh.ai"
+
+
+def test_stats_record_calls_errors_and_latency():
+    registry = _registry()
+    token = issue_token(USER_ID, AGENT_ID, SCOPE).token
+
+    with consent_context(token):
+        registry.invoke("shout", "a")
+        registry.invoke("shout", "b")
+        with pytest.raises(ZeroDivisionError):
+            registry.invoke("broken")
+
+    stats = registry.stats()
+    assert stats["shout"]["calls"] == 2
+    assert stats["broken"] == {**stats["broken"], "calls": 1, "errors": 1}
+    assert sum(stats["shout"]["histogram"].values()) == 2
+    assert stats["finance"]["calls"] == 0
+
+    registry.reset_stats()
+    assert registry.stats()["shout"]["calls"] == 0
+
+
+def test_direct_calls_are_counted_and_checked_in_context():
+    from hushh_mcp.agents.identity import HushhIdentityAgent
+
+    entry = default_registry.get("verify_user_emails")
+    before = entry.stats()["calls"]
+    HushhIdentityAgent().verify_user_identities(["bob@hushh.ai"])
+    assert entry.stats()["calls"] == before + 1
+
+    finance_token = issue_token(USER_ID, AGENT_ID, ConsentScope.AGENT_FINANCE_ANALYZE).token
+    with consent_context(finance_token), pytest.raises(PermissionError, match="Scope mismatch"):
+        HushhIdentityAgent().verify_user_identities(["bob@hushh.ai"])
+
+
+def test_plain_email_helpers_skip_the_operon_check():
+    from hushh_mcp.operons.verify_email import check_email
+
+    entry = default_registry.get("verify_user_email")
+    before = entry.stats()["calls"]
+    email_token = issue_token(USER_ID, AGENT_ID, ConsentScope.VAULT_READ_EMAIL).token
+    with consent_context(email_token):
+        # Uncached on purpose: the result must not depend on the LRU cache
+        assert check_email("uncached.helper@hushh.ai").is_valid is True
+    assert entry.stats()["calls"] == before
@@ -0,0 +1,117 @@
+# tests/test_revocation.py
+
+import time
+from hushh_mcp.consent.revocation import RevocationRegistry
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def test_revoke_and_lookup():
+    registry = RevocationRegistry()
+    registry.revoke("HCT:live.sig", _now_ms() + 60_000)
+
+    assert "HCT:live.sig" in registry
+    assert "HCT:other.sig" not in registry
+
+
+def test_already_expired_tokens_are_not_stored():
+    registry = RevocationRegistry()
+    registry.revoke("HCT:old.sig", _now_ms() - 1)
+
+    assert "HCT:old.sig" not in registry
+    assert len(registry) == 0
+
+
+def test_prune_drops_expired_entries():
+    registry = RevocationRegistry()
+    now = _now_ms()
+    registry.revoke("HCT:short.sig", now + 1_000)
+    registry.revoke("HCT:long.sig", now + 60_000)
+
+    assert registry.prune(now=now + 5_000) == 1
+    assert "HCT:short.sig" not in registry
+    assert "HCT:long.sig" in registry
+
+
+def test_revocations_persist_across_restarts(tmp_path):
+    db_path = str(tmp_path / "revocations.db")
+    now = _now_ms()
+
+    registry = RevocationRegistry(db_path)
+    registry.revoke("HCT:persisted.sig", now + 60_000)
+    registry.close()
+
+    reopened = RevocationRegistry(db_path)
+    assert "HCT:persisted.sig" in reopened
+    reopened.close()
+
+
+def test_sync_picks_up_revocations_from_other_workers(tmp_path):
+    db_path = str(tmp_path / "revocations.db")
+    worker_a = RevocationRegistry(db_path)
+    worker_b = RevocationRegistry(db_path)
+
+    worker_a.revoke("HCT:shared.sig", _now_ms() + 60_000)
+    assert "HCT:shared.sig" not in worker_b
+
+    assert worker_b.sync() is True
+    assert "HCT:shared.sig" in worker_b
+    assert worker_b.generation == worker_a.generation
+    assert worker_b.sync() is False
+
+    worker_a.close()
+    worker_b.close()
+
+
+def test_sync_only_worker_drops_expired_entries(tmp_path):
+    db_path = str(tmp_path / "revocations.db")
+    worker_a = RevocationRegistry(db_path)
+    worker_b = RevocationRegistry(db_path)
+
+    worker_a.revoke("HCT:brief.sig", _now_ms() + 50)
+    assert worker_b.sync() is True
+    assert len(worker_b) == 1
+
+    time.sleep(0.1)
+    assert worker_b.sync() is True
+    assert len(worker_b) == 0
+
+    worker_a.close()
+    worker_b.close()
+
+
+def test_background_sync_propagates_within_interval(tmp_path):
+    db_path = str(tmp_path / "revocations.db")
+    worker_a = RevocationRegistry(db_path)
+    worker_b = RevocationRegistry(db_path)
+    worker_b.start_sync(interval_s=0.01)
+
+    worker_a.revoke("HCT:background.sig", _now_ms() + 60_000)
+    deadline = time.time() + 2
+    while "HCT:background.sig" not in worker_b and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert "HCT:background.sig" in worker_b
+    worker_a.close()
+    worker_b.close()
+
+
+def test_epochs_are_shared_between_workers(tmp_path):
+    db_path = str(tmp_path / "revocations.db")
+    worker_a = RevocationRegistry(db_path)
+    worker_b = RevocationRegistry(db_path)
+
+    assert worker_a.bump_user_epoch("user_a") == 1
+    assert worker_b.bump_user_epoch("user_a") == 2
+    worker_a.bump_agent_epoch("agent_a")
+
+    assert worker_a.sync() is True
+    assert worker_b.sync() is True
+    assert worker_a.user_epoch("user_a") == worker_b.user_epoch("user_a") == 2
+    assert worker_b.agent_epoch("agent_a") == 1
+    assert worker_b.user_epoch("user_b") == 0
+
+    worker_a.close()
+    worker_b.close()
@@ -0,0 +1,48 @@
+# tests/test_signer.py
+
+import hmac
+import hashlib
+import pytest
+from hushh_mcp.signer import HushhSigner, parse_key_ring
+
+
+OLD_SECRET = "o" * 32
+NEW_SECRET = "n" * 32
+MESSAGE = "user_a|agent_b|vault.read.email|1|2"
+
+
+def test_sign_and_verify_roundtrip():
+    signer = HushhSigner({"k1": OLD_SECRET}, active_key_id="k1")
+    signature = signer.sign(MESSAGE)
+
+    assert signature.startswith("k1-")
+    assert signer.verify(MESSAGE, signature) is True
+    assert signer.verify(MESSAGE + "x", signature) is False
+
+
+def test_rotation_keeps_old_signatures_valid():
+    old_signer = HushhSigner({"k1": OLD_SECRET}, active_key_id="k1")
+    old_signature = old_signer.sign(MESSAGE)
+
+    rotated = HushhSigner({"k1": OLD_SECRET, "k2": NEW_SECRET}, active_key_id="k2")
+    assert rotated.sign(MESSAGE).startswith("k2-")
+    assert rotated.verify(MESSAGE, old_signature) is True
+
+    retired = HushhSigner({"k2": NEW_SECRET}, active_key_id="k2")
+    assert retired.verify(MESSAGE, old_signature) is False
+
+
+def test_legacy_signatures_without_key_id_verify():
+    legacy = hmac.new(OLD_SECRET.encode(), MESSAGE.encode(), hashlib.sha256).hexdigest()
+    signer = HushhSigner({"k1": OLD_SECRET}, active_key_id="k1")
+
+    assert signer.verify(MESSAGE, legacy) is True
+    assert signer.digest(MESSAGE.encode()).hex() == legacy
+
+
+def test_parse_key_ring():
+    assert parse_key_ring("") == {}
+    assert parse_key_ring(f"k0:{OLD_SECRET}, k9:{NEW_SECRET}") == {"k0": OLD_SECRET, "k9": NEW_SECRET}
+
+    with pytest.raises(ValueError):
+        parse_key_ring("k0:short")
@@ -1,12 +1,19 @@
 # tests/test_token.py
 
+import base64
 import pytest
 import time
+import hushh_mcp.consent.token as token_module
 from hushh_mcp.consent.token import (
     issue_token,
     validate_token,
+    validate_tokens,
     revoke_token,
-    is_token_revoked
+    is_token_revoked,
+    revoke_user_tokens,
+    revoke_agent_tokens,
+    enable_token_cache,
+    disable_token_cache
 )
 from hushh_mcp.constants import ConsentScope
 from hushh_mcp.types import HushhConsentToken
@@ -53,9 +60,225 @@ def test_token_revocation():
     assert reason == "Token has been revoked"
 
 
+def test_revocation_covers_signature_without_key_id():
+    token_obj = issue_token("user_stripped", AGENT_ID, VALID_SCOPE)
+    body, signature = token_obj.token.rsplit(".", 1)
+    stripped = f"{body}.{signature.rpartition('-')[2]}"
+    assert validate_token(stripped, VALID_SCOPE)[0] is True
+
+    revoke_token(token_obj.token)
+    assert is_token_revoked(stripped) is True
+    assert validate_token(stripped, VALID_SCOPE)[:2] == (False, "Token has been revoked")
+
+
+def _respell_last_char(token_str: str) -> str:
+    # Same decoded bytes, different string: only the last character's spare bits change
+    body, dot, signature = token_str.partition(".")
+    prefix, _, encoded = body.partition(":")
+    stripped = encoded.rstrip("=")
+    padding = encoded[len(stripped):]
+    decoded = base64.urlsafe_b64decode(stripped + "=" * (-len(stripped) % 4))
+    for char in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_":
+        candidate = stripped[:-1] + char
+        if candidate != stripped and base64.urlsafe_b64decode(candidate + "=" * (-len(candidate) % 4)) == decoded:
+            return f"{prefix}:{candidate}{padding}{dot}{signature}"
+    return None
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_non_canonical_encoding_is_rejected(version):
+    # Find a user ID whose encoding leaves spare bits in the last character
+    for length in range(1, 4):
+        token_obj = issue_token("u" * length, AGENT_ID, VALID_SCOPE, version=version)
+        respelled = _respell_last_char(token_obj.token)
+        if respelled:
+            break
+    assert respelled is not None
+
+    assert validate_token(respelled, VALID_SCOPE)[0] is False
+    revoke_token(token_obj.token)
+    assert validate_token(respelled, VALID_SCOPE)[0] is False
+
+
 def test_signature_tampering():
     token_obj = issue_token(USER_ID, AGENT_ID, VALID_SCOPE)
     tampered = token_obj.token.replace("HCT:", "HCT_TAMPERED:")
     valid, reason, _ = validate_token(tampered, VALID_SCOPE)
     assert valid is False
     assert "Malformed token" in reason or "Invalid token prefix" in reason
+
+
+def test_validate_tokens_batch():
+    good = issue_token(USER_ID, AGENT_ID, VALID_SCOPE).token
+    revoked = issue_token("user_revoked", AGENT_ID, VALID_SCOPE).token
+    revoke_token(revoked)
+
+    results = validate_tokens([good, "garbage", revoked, None, good], VALID_SCOPE)
+    assert len(results) == 5
+
+    assert results[0][0] is True
+    assert results[0][2].user_id == USER_ID
+    assert results[1] == (False, "Malformed token", None)
+    assert results[2] == (False, "Token has been revoked", None)
+    assert results[3] == (False, "Malformed token", None)
+    assert results[4] == results[0]
+
+
+def test_validate_tokens_rejects_bad_shape_before_decoding():
+    token_obj = issue_token(USER_ID, AGENT_ID, VALID_SCOPE)
+    truncated_sig = token_obj.token[:-1]
+    bad_prefix = token_obj.token.replace("HCT:", "XYZ:")
+
+    results = validate_tokens([truncated_sig, bad_prefix, "HCT:!!!.abc"])
+    assert all(result == (False, "Malformed token", None) for result in results)
+
+
+@pytest.fixture
+def token_cache():
+    enable_token_cache(max_size=2)
+    yield token_module._token_cache
+    disable_token_cache()
+
+
+def test_token_cache_hit_skips_signature_check(token_cache, monkeypatch):
+    token_obj = issue_token("user_cached", AGENT_ID, VALID_SCOPE)
+    assert validate_token(token_obj.token, VALID_SCOPE)[0] is True
+
+    def fail_verify(*_):
+        raise AssertionError("cache hit should not re-verify the signature")
+
+    monkeypatch.setattr(token_module, "_verify", fail_verify)
+    valid, reason, parsed = validate_token(token_obj.token, VALID_SCOPE)
+    assert valid is True
+    assert parsed.user_id == "user_cached"
+
+    valid, reason, _ = validate_token(token_obj.token, ConsentScope.VAULT_READ_PHONE)
+    assert valid is False
+    assert reason == "Scope mismatch"
+
+
+def test_token_cache_hits_do_not_share_models(token_cache):
+    token_obj = issue_token("user_cached", AGENT_ID, VALID_SCOPE)
+    first = validate_token(token_obj.token, VALID_SCOPE)[2]
+    first.user_id = "attacker"
+
+    second = validate_token(token_obj.token, VALID_SCOPE)[2]
+    assert second is not first
+    assert second.user_id == "user_cached"
+
+
+def test_token_cache_evicts_on_revoke(token_cache):
+    token_obj = issue_token("user_cache_revoke", AGENT_ID, VALID_SCOPE)
+    assert validate_token(token_obj.token, VALID_SCOPE)[0] is True
+    assert len(token_cache) == 1
+
+    revoke_token(token_obj.token)
+    assert len(token_cache) == 0
+
+    valid, reason, _ = validate_token(token_obj.token, VALID_SCOPE)
+    assert valid is False
+    assert reason == "Token has been revoked"
+
+
+def test_token_cache_is_size_capped(token_cache):
+    tokens = [issue_token(f"user_lru_{i}", AGENT_ID, VALID_SCOPE).token for i in range(3)]
+    for token_str in tokens:
+        validate_token(token_str, VALID_SCOPE)
+
+    assert len(token_cache) == 2
+    assert token_cache.get(tokens[0], int(time.time() * 1000)) is None
+    assert token_cache.get(tokens[2], int(time.time() * 1000)) is not None
+
+
+def test_v2_token_roundtrip_and_size():
+    v1 = issue_token("user_compact", AGENT_ID, VALID_SCOPE, version=1)
+    v2 = issue_token("user_compact", AGENT_ID, VALID_SCOPE, version=2)
+
+    assert v2.token.startswith("HCT:")
+    assert "." not in v2.token
+    assert len(v2.token) < len(v1.token)
+
+    valid, reason, parsed = validate_token(v2.token, VALID_SCOPE)
+    assert valid is True
+    assert reason is None
+    assert parsed.user_id == "user_compact"
+    assert parsed.agent_id == AGENT_ID
+    assert parsed.scope == VALID_SCOPE
+    assert parsed.expires_at == v2.expires_at
+    assert validate_tokens([v2.token], VALID_SCOPE)[0][0] is True
+
+
+def test_v2_token_tampering_and_expiry():
+    token_obj = issue_token("user_compact", AGENT_ID, VALID_SCOPE, version=2)
+    head, body = token_obj.token.split(":")
+    flipped = body[:20] + ("A" if body[20] != "A" else "B") + body[21:]
+
+    valid, reason, _ = validate_token(f"{head}:{flipped}", VALID_SCOPE)
+    assert valid is False
+
+    expired = issue_token("user_compact", AGENT_ID, VALID_SCOPE, expires_in_ms=-1000, version=2)
+    assert validate_token(expired.token, VALID_SCOPE) == (False, "Token expired", None)
+
+
+def test_v2_token_revocation():
+    token_obj = issue_token("user_compact_revoked", AGENT_ID, VALID_SCOPE, version=2)
+    revoke_token(token_obj.token)
+
+    assert is_token_revoked(token_obj.token) is True
+    assert validate_token(token_obj.token, VALID_SCOPE)[1] == "Token has been revoked"
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_multi_scope_token(version):
+    scopes = [ConsentScope.VAULT_READ_EMAIL, ConsentScope.KNOWLEDGE_BASE_READ]
+    token_obj = issue_token("user_multi", AGENT_ID, scopes, version=version)
+    assert token_obj.scope == ConsentScope.VAULT_READ_EMAIL
+    assert set(token_obj.scopes) == set(scopes)
+
+    valid, reason, parsed = validate_token(token_obj.token, scopes)
+    assert valid is True
+    assert parsed.has_scopes(*scopes)
+
+    assert validate_token(token_obj.token, ConsentScope.KNOWLEDGE_BASE_READ)[0] is True
+
+    valid, reason, _ = validate_token(
+        token_obj.token, [ConsentScope.VAULT_READ_EMAIL, ConsentScope.VAULT_READ_PHONE]
+    )
+    assert valid is False
+    assert reason == "Scope mismatch"
+
+
+def test_single_scope_token_lists_its_scope():
+    token_obj = issue_token(USER_ID, AGENT_ID, VALID_SCOPE)
+    _, _, parsed = validate_token(token_obj.token)
+
+    assert parsed.scopes == [VALID_SCOPE]
+    assert parsed.has_scopes(VALID_SCOPE) is True
+    assert parsed.has_scopes(ConsentScope.KNOWLEDGE_BASE_READ) is False
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_revoke_user_tokens_invalidates_older_tokens(version):
+    user_id = f"user_epoch_v{version}"
+    old_token = issue_token(user_id, AGENT_ID, VALID_SCOPE, version=version)
+    other_user = issue_token(f"{user_id}_other", AGENT_ID, VALID_SCOPE, version=version)
+
+    revoke_user_tokens(user_id)
+    new_token = issue_token(user_id, AGENT_ID, VALID_SCOPE, version=version)
+
+    assert validate_token(old_token.token)[1] == "Token has been revoked"
+    assert validate_token(new_token.token)[0] is True
+    assert validate_token(other_user.token)[0] is True
+
+
+def test_revoke_agent_tokens_invalidates_cached_tokens():
+    agent_id = "agent_epoch_cached"
+    enable_token_cache(16)
+    try:
+        token_obj = issue_token(USER_ID, agent_id, VALID_SCOPE)
+        assert validate_token(token_obj.token)[0] is True
+
+        revoke_agent_tokens(agent_id)
+        assert validate_token(token_obj.token)[1] == "Token has been revoked"
+    finally:
+        disable_token_cache()
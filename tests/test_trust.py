@@ -1,13 +1,22 @@
 # tests/test_trust.py
 
+import hashlib
+import hmac
+import time
+
 import pytest
 from hushh_mcp.trust.link import (
     create_trust_link,
+    create_trust_links,
+    encode_trust_link,
+    parse_trust_link,
     verify_trust_link,
     is_trusted_for_scope
 )
+from hushh_mcp.trust.registry import TrustLinkRegistry
 from hushh_mcp.types import TrustLink
 from hushh_mcp.constants import ConsentScope
+from hushh_mcp.config import SECRET_KEY
 
 
 USER_ID = "user_nyx"
@@ -47,3 +56,97 @@ def test_signature_tampering():
 
     assert verify_trust_link(tampered) is False
     assert is_trusted_for_scope(tampered, SCOPE_VALID) is False
+
+
+def test_links_signed_before_key_ids_still_verify():
+    # Signed exactly as the original implementation did: bare hex over the formatted scope member
+    created_at = int(time.time() * 1000)
+    expires_at = created_at + 60_000
+    raw = f"{DELEGATOR}|{DELEGATEE}|{SCOPE_VALID}|{created_at}|{expires_at}|{USER_ID}"
+    signature = hmac.new(SECRET_KEY.encode(), raw.encode(), hashlib.sha256).hexdigest()
+    link = TrustLink(
+        from_agent=DELEGATOR, to_agent=DELEGATEE, scope=SCOPE_VALID, created_at=created_at,
+        expires_at=expires_at, signed_by_user=USER_ID, signature=signature
+    )
+
+    assert verify_trust_link(link) is True
+    assert verify_trust_link(link.copy(update={"to_agent": "agent_other"})) is False
+
+    valid, reason, parsed = parse_trust_link(encode_trust_link(link))
+    assert valid is True, reason
+    assert parsed.scope == SCOPE_VALID
+
+
+def test_registry_lookup_by_agent_scope_and_user():
+    registry = TrustLinkRegistry()
+    registry.add(create_trust_link(DELEGATOR, DELEGATEE, SCOPE_VALID, USER_ID))
+
+    assert registry.is_trusted(DELEGATEE, SCOPE_VALID, USER_ID) is True
+    assert registry.is_trusted(DELEGATEE, SCOPE_VALID, USER_ID, from_agent=DELEGATOR) is True
+    assert registry.is_trusted(DELEGATEE, SCOPE_VALID, USER_ID, from_agent="agent_other") is False
+    assert registry.is_trusted(DELEGATEE, SCOPE_INVALID, USER_ID) is False
+    assert registry.is_trusted(DELEGATEE, SCOPE_VALID, "user_other") is False
+    assert len(registry.links_for_user(USER_ID)) == 1
+
+
+def test_registry_rejects_unverified_links():
+    registry = TrustLinkRegistry()
+    link = create_trust_link(DELEGATOR, DELEGATEE, SCOPE_VALID, USER_ID)
+
+    with pytest.raises(ValueError):
+        registry.add(link.copy(update={"signature": "bad_signature_here"}))
+    assert len(registry) == 0
+
+
+def test_registry_prunes_expired_links():
+    registry = TrustLinkRegistry()
+    short = registry.add(create_trust_link(DELEGATOR, DELEGATEE, SCOPE_VALID, USER_ID, expires_in_ms=1_000))
+    registry.add(create_trust_link(DELEGATOR, DELEGATEE, SCOPE_INVALID, USER_ID))
+
+    assert registry.prune(now=short.expires_at) == 1
+    assert registry.is_trusted(DELEGATEE, SCOPE_VALID, USER_ID) is False
+    assert registry.is_trusted(DELEGATEE, SCOPE_INVALID, USER_ID) is True
+    assert len(registry.links_for_user(USER_ID)) == 1
+
+
+def test_registry_remove_user():
+    registry = TrustLinkRegistry()
+    registry.add(create_trust_link(DELEGATOR, DELEGATEE, SCOPE_VALID, USER_ID))
+    registry.add(create_trust_link(DELEGATOR, "agent_finance", SCOPE_VALID, USER_ID))
+
+    assert registry.remove_user(USER_ID) == 2
+    assert len(registry) == 0
+    assert registry.links_for(DELEGATEE, SCOPE_VALID) == []
+
+
+def test_batch_issuance_shares_timestamp():
+    delegatees = ["agent_shopper", "agent_finance", "agent_travel"]
+    links = create_trust_links(DELEGATOR, delegatees, SCOPE_VALID, USER_ID)
+
+    assert [link.to_agent for link in links] == delegatees
+    assert len({link.created_at for link in links}) == 1
+    assert all(verify_trust_link(link) for link in links)
+
+
+def test_compact_encoding_round_trip():
+    link = create_trust_link(DELEGATOR, DELEGATEE, SCOPE_VALID, USER_ID)
+    encoded = encode_trust_link(link)
+    assert encoded.startswith("HTL:")
+
+    valid, reason, parsed = parse_trust_link(encoded)
+    assert valid is True
+    assert reason is None
+    assert parsed.to_agent == DELEGATEE
+    assert parsed.scope == SCOPE_VALID
+    assert is_trusted_for_scope(parsed, SCOPE_VALID) is True
+
+
+def test_compact_encoding_rejects_tampering():
+    link = create_trust_link(DELEGATOR, DELEGATEE, SCOPE_VALID, USER_ID)
+    forged = create_trust_link(DELEGATOR, "agent_attacker", SCOPE_VALID, USER_ID)
+    body = encode_trust_link(forged).split(".")[0]
+    tampered = f"{body}.{link.signature}"
+
+    assert parse_trust_link(tampered)[1] == "Invalid signature"
+    assert parse_trust_link("HCT:abc.def")[1] == "Invalid link prefix"
+    assert parse_trust_link("HTL:not-a-link")[0] is False
@@ -0,0 +1,45 @@
+# tests/test_types.py
+
+from hushh_mcp.constants import ConsentScope
+from hushh_mcp.trust.link import create_trust_link, verify_trust_link
+from hushh_mcp.types import (
+    ConsentTokenData,
+    HushhConsentToken,
+    TrustLinkData,
+    EncryptedPayloadData,
+    VaultRecordData,
+    VaultRecord
+)
+
+
+def test_consent_token_record_converts_to_a_fresh_model():
+    record = ConsentTokenData(
+        "HCT:abc.k1-def", "user_a", "agent_b", ConsentScope.VAULT_READ_EMAIL, 1, 2, "k1-def"
+    )
+    model = record.to_model()
+
+    assert isinstance(model, HushhConsentToken)
+    assert model.scope == ConsentScope.VAULT_READ_EMAIL
+    # Each boundary gets its own copy, so edits never reach later callers
+    model.user_id = "attacker"
+    assert record.to_model() is not model
+    assert record.to_model().user_id == "user_a"
+
+
+def test_trust_link_record_verifies_like_the_model():
+    link = create_trust_link("agent_a", "agent_b", ConsentScope.VAULT_READ_EMAIL, "user_a")
+    record = TrustLinkData.from_model(link)
+
+    assert verify_trust_link(record) is True
+    assert record.to_model() == link
+
+
+def test_vault_record_converts_nested_payload():
+    payload = EncryptedPayloadData("Y2lwaGVy", "aXY=", "dGFn", "base64", "aes-256-gcm")
+    record = VaultRecordData("user_a", ConsentScope.VAULT_READ_EMAIL, payload, "agent_b", created_at=1)
+    model = record.to_model()
+
+    assert isinstance(model, VaultRecord)
+    assert model.key.user_id == "user_a"
+    assert model.data.ciphertext == "Y2lwaGVy"
+    assert model.deleted is False
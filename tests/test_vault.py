@@ -1,9 +1,30 @@
 # tests/test_vault.py
 
 import pytest
+import os
 import json
 import base64
-from hushh_mcp.vault.encrypt import encrypt_data, decrypt_data
+import random
+import string
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from hushh_mcp.vault.encrypt import (
+    encrypt_data,
+    decrypt_data,
+    encrypt_data_raw,
+    decrypt_data_raw,
+    encrypt_many,
+    decrypt_many,
+    get_cipher,
+    VaultCipher,
+    select_fastest_algorithm,
+    ALGORITHM_NAME,
+    CHACHA_ALGORITHM_NAME,
+    pack_payload,
+    unpack_payload,
+    RAW_OVERHEAD
+)
+from hushh_mcp.vault.blind_index import BlindIndexer, derive_blind_index_key
+from hushh_mcp.vault.compress import compress_text, decompress_text, should_compress
 from hushh_mcp.config import VAULT_ENCRYPTION_KEY
 from hushh_mcp.types import EncryptedPayload
 
@@ -47,3 +68,165 @@ def test_decryption_fails_with_tampered_data():
 
     with pytest.raises(Exception, match="Decryption failed"):
         decrypt_data(corrupted, VAULT_ENCRYPTION_KEY)
+
+
+def test_hex_encoding_roundtrip():
+    encrypted = encrypt_data("sensitive data", VAULT_ENCRYPTION_KEY, encoding="hex")
+
+    assert encrypted.encoding == "hex"
+    bytes.fromhex(encrypted.ciphertext)
+    assert decrypt_data(encrypted, VAULT_ENCRYPTION_KEY) == "sensitive data"
+
+
+def test_raw_encoding_roundtrip_from_memoryview():
+    plaintext = "alice@hushh.ai"
+    blob = encrypt_data_raw(plaintext, VAULT_ENCRYPTION_KEY)
+
+    assert len(blob) == len(plaintext) + RAW_OVERHEAD
+    buffer = bytearray(b"prefix" + blob)
+    assert decrypt_data_raw(memoryview(buffer)[6:], VAULT_ENCRYPTION_KEY) == plaintext.encode()
+
+
+def test_raw_encoding_detects_tampering():
+    blob = bytearray(encrypt_data_raw(b"sensitive data", VAULT_ENCRYPTION_KEY))
+    blob[-1] ^= 0x01
+
+    with pytest.raises(ValueError, match="Invalid authentication tag"):
+        decrypt_data_raw(blob, VAULT_ENCRYPTION_KEY)
+
+
+@pytest.mark.parametrize("encoding", ["base64", "hex"])
+def test_pack_and_unpack_between_text_and_raw(encoding):
+    encrypted = encrypt_data("user@hushh.ai", VAULT_ENCRYPTION_KEY)
+
+    blob = pack_payload(encrypted)
+    assert decrypt_data_raw(blob, VAULT_ENCRYPTION_KEY) == b"user@hushh.ai"
+
+    transport = unpack_payload(blob, encoding=encoding)
+    assert transport.encoding == encoding
+    assert decrypt_data(transport, VAULT_ENCRYPTION_KEY) == "user@hushh.ai"
+
+
+def test_cipher_is_cached_per_key():
+    assert get_cipher(VAULT_ENCRYPTION_KEY) is get_cipher(VAULT_ENCRYPTION_KEY)
+    assert isinstance(get_cipher(VAULT_ENCRYPTION_KEY), VaultCipher)
+
+
+def test_invalid_key_raises_runtime_error():
+    with pytest.raises(RuntimeError, match="Encryption failed"):
+        encrypt_data("sensitive data", "not-hex")
+
+
+@pytest.mark.parametrize("count", [3, 200])
+def test_encrypt_many_and_decrypt_many_keep_order(count):
+    plaintexts = [f"record-{i}" for i in range(count)]
+    payloads = encrypt_many(plaintexts, VAULT_ENCRYPTION_KEY, max_workers=4)
+
+    assert decrypt_many(payloads, VAULT_ENCRYPTION_KEY, max_workers=4) == plaintexts
+
+    raw = [encrypt_data_raw(text, VAULT_ENCRYPTION_KEY) for text in plaintexts]
+    assert decrypt_many(raw, VAULT_ENCRYPTION_KEY) == [text.encode() for text in plaintexts]
+
+
+def test_decrypt_many_surfaces_tampering():
+    payloads = encrypt_many(["a", "b"], VAULT_ENCRYPTION_KEY)
+    payloads[1] = payloads[1].copy(update={"tag": payloads[0].tag})
+
+    with pytest.raises(ValueError, match="Invalid authentication tag"):
+        decrypt_many(payloads, VAULT_ENCRYPTION_KEY)
+
+
+def test_benchmark_picks_a_supported_algorithm():
+    assert select_fastest_algorithm() in (ALGORITHM_NAME, CHACHA_ALGORITHM_NAME)
+
+
+def test_decrypt_follows_stored_algorithm():
+    aes = VaultCipher(VAULT_ENCRYPTION_KEY, algorithm=ALGORITHM_NAME)
+    chacha = VaultCipher(VAULT_ENCRYPTION_KEY, algorithm=CHACHA_ALGORITHM_NAME)
+
+    aes_payload = aes.encrypt("sensitive data")
+    chacha_payload = chacha.encrypt("sensitive data")
+    assert aes_payload.algorithm == ALGORITHM_NAME
+    assert chacha_payload.algorithm == CHACHA_ALGORITHM_NAME
+
+    # Either cipher reads both, whatever it writes with
+    assert aes.decrypt(chacha_payload) == chacha.decrypt(aes_payload) == "sensitive data"
+    assert decrypt_data(chacha_payload, VAULT_ENCRYPTION_KEY) == "sensitive data"
+    assert aes.decrypt_raw(chacha.encrypt_raw(b"raw")) == b"raw"
+
+    blob = pack_payload(chacha_payload)
+    assert unpack_payload(blob).algorithm == CHACHA_ALGORITHM_NAME
+
+
+def test_compressible_records_are_compressed_before_encryption():
+    body = "Thanks for your order! Your package ships tomorrow.\n" * 200
+    assert encrypt_data(body, VAULT_ENCRYPTION_KEY).compression is None  # off by default
+    encrypted = encrypt_data(body, VAULT_ENCRYPTION_KEY, compress=True)
+
+    assert encrypted.compression == "zlib"
+    assert len(base64.b64decode(encrypted.ciphertext)) < len(body) // 4
+    assert decrypt_data(encrypted, VAULT_ENCRYPTION_KEY) == body
+
+    plain = encrypt_data(body, VAULT_ENCRYPTION_KEY, compress=False)
+    assert plain.compression is None
+    assert decrypt_data(plain, VAULT_ENCRYPTION_KEY) == body
+
+
+def test_small_or_random_records_skip_compression():
+    assert encrypt_data("alice@hushh.ai", VAULT_ENCRYPTION_KEY, compress=True).compression is None
+    assert should_compress(os.urandom(8192)) is False
+
+
+def test_raw_and_packed_payloads_carry_compression():
+    body = "meeting notes " * 500
+    blob = encrypt_data_raw(body, VAULT_ENCRYPTION_KEY, compress=True)
+    assert len(blob) < len(body)
+    assert decrypt_data_raw(blob, VAULT_ENCRYPTION_KEY) == body.encode()
+
+    payload = encrypt_data(body, VAULT_ENCRYPTION_KEY, compress=True)
+    assert unpack_payload(pack_payload(payload)).compression == "zlib"
+    assert decrypt_data_raw(pack_payload(payload), VAULT_ENCRYPTION_KEY) == body.encode()
+
+
+def test_compression_marker_is_authenticated():
+    body = "meeting notes " * 500
+    blob = bytearray(encrypt_data_raw(body, VAULT_ENCRYPTION_KEY, compress=True))
+    blob[0] &= 0x7F  # claim the payload is not compressed
+    with pytest.raises(ValueError, match="Invalid authentication tag"):
+        decrypt_data_raw(blob, VAULT_ENCRYPTION_KEY)
+
+    payload = encrypt_data(body, VAULT_ENCRYPTION_KEY, compress=True)
+    with pytest.raises(ValueError, match="Invalid authentication tag"):
+        decrypt_data(payload.model_copy(update={"compression": None}), VAULT_ENCRYPTION_KEY)
+
+
+def test_payloads_without_associated_data_still_decrypt():
+    # Uncompressed records written before the header byte was bound as AAD
+    iv = os.urandom(12)
+    sealed = AESGCM(bytes.fromhex(VAULT_ENCRYPTION_KEY)).encrypt(iv, b"legacy", None)
+    assert decrypt_data_raw(bytes((1,)) + iv + sealed, VAULT_ENCRYPTION_KEY) == b"legacy"
+
+
+def test_text_column_compression_round_trip():
+    reply = "Dear customer, thank you for reaching out. " * 50
+    stored = compress_text(reply)
+
+    assert len(stored) < len(reply)
+    assert decompress_text(stored) == reply
+    assert compress_text("short") == "short"
+
+    # Compressible only before base64: the stored value must never grow
+    rng = random.Random(7)
+    noisy = "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(2000))
+    assert compress_text(noisy) == noisy
+    assert decompress_text("legacy plain value") == "legacy plain value"
+    assert decompress_text(None) is None
+
+
+def test_blind_index_tokens_are_scoped_and_normalized():
+    indexer = BlindIndexer(derive_blind_index_key(VAULT_ENCRYPTION_KEY))
+
+    token = indexer.token("user_a", "sender_email", "Alice@Hushh.ai ")
+    assert token == indexer.token("user_a", "sender_email", "alice@hushh.ai")
+    assert token != indexer.token("user_b", "sender_email", "alice@hushh.ai")
+    assert token != indexer.token("user_a", "contact_name", "alice@hushh.ai")
@@ -0,0 +1,97 @@
+# tests/test_vault_envelope.py
+
+import os
+import pytest
+from hushh_mcp import config
+from hushh_mcp.vault.envelope import EnvelopeVault, parse_master_key_ring
+from hushh_mcp.vault.encrypt import decrypt_data
+from hushh_mcp.config import VAULT_ENCRYPTION_KEY
+
+
+def test_records_round_trip_under_per_user_keys():
+    vault = EnvelopeVault()
+    payload = vault.encrypt("user_a", "alice@hushh.ai")
+
+    assert vault.decrypt("user_a", payload) == "alice@hushh.ai"
+    assert vault.cipher_for("user_a") is vault.cipher_for("user_a")
+
+    # Neither the master key nor another user's data key can read it
+    with pytest.raises(ValueError, match="Invalid authentication tag"):
+        decrypt_data(payload, VAULT_ENCRYPTION_KEY)
+    with pytest.raises(ValueError, match="Invalid authentication tag"):
+        vault.decrypt("user_b", payload)
+
+
+def test_master_key_rotation_keeps_records_readable(tmp_path):
+    db_path = str(tmp_path / "keys.db")
+    vault = EnvelopeVault(path=db_path)
+    payloads = {user_id: vault.encrypt(user_id, f"secret-{user_id}") for user_id in ("user_a", "user_b")}
+
+    new_master = os.urandom(32).hex()
+    assert vault.rotate_master_key(new_master, "m2") == 2
+    vault.close()
+
+    # A fresh process with only the new master key still reads old records
+    reopened = EnvelopeVault(new_master, "m2", path=db_path)
+    for user_id, payload in payloads.items():
+        assert reopened.decrypt(user_id, payload) == f"secret-{user_id}"
+    reopened.close()
+
+    stale = EnvelopeVault(VAULT_ENCRYPTION_KEY, "m1", path=db_path)
+    with pytest.raises(ValueError, match="unknown master key"):
+        stale.cipher_for("user_a")
+    stale.close()
+
+
+def test_rotation_does_not_break_workers_holding_the_new_key_as_retired(tmp_path):
+    db_path = str(tmp_path / "keys.db")
+    new_master = os.urandom(32).hex()
+    # Rollout step 1: every worker learns the new key before anything is re-wrapped
+    rotator = EnvelopeVault(VAULT_ENCRYPTION_KEY, "m1", path=db_path, retired_master_keys={"m2": new_master})
+    worker = EnvelopeVault(VAULT_ENCRYPTION_KEY, "m1", path=db_path, retired_master_keys={"m2": new_master})
+    payload = rotator.encrypt("user_a", "secret")
+
+    rotator.rotate_master_key(new_master, "m2")
+    # The worker still runs with m1 active, but reads keys now wrapped under m2
+    assert worker.decrypt("user_a", payload) == "secret"
+    rotator.close()
+    worker.close()
+
+
+def test_retired_master_keys_default_from_config(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "keys.db")
+    old_vault = EnvelopeVault(path=db_path)
+    payload = old_vault.encrypt("user_a", "secret")
+    old_vault.close()
+
+    monkeypatch.setattr(config, "VAULT_MASTER_KEY_ID", "m2")
+    monkeypatch.setattr(config, "VAULT_MASTER_KEY_RING", f"m1:{VAULT_ENCRYPTION_KEY}")
+    reopened = EnvelopeVault(os.urandom(32).hex(), path=db_path)
+    assert reopened.master_key_id == "m2"
+    assert reopened.decrypt("user_a", payload) == "secret"
+    reopened.close()
+
+
+def test_invalid_master_key_ring_is_rejected():
+    with pytest.raises(ValueError, match="VAULT_MASTER_KEY_RING"):
+        parse_master_key_ring("m0:short")
+
+
+def test_cache_is_bounded():
+    vault = EnvelopeVault(cache_size=2)
+    payload = vault.encrypt("user_a", "secret")
+    vault.cipher_for("user_b")
+    vault.cipher_for("user_c")
+
+    assert len(vault._ciphers) == 2
+    # Evicted keys are unwrapped again on demand
+    assert vault.decrypt("user_a", payload) == "secret"
+
+
+def test_forget_user_destroys_the_data_key():
+    vault = EnvelopeVault()
+    payload = vault.encrypt("user_a", "secret")
+
+    assert vault.forget_user("user_a") is True
+    with pytest.raises(ValueError):
+        vault.decrypt("user_a", payload)
@@ -0,0 +1,165 @@
+# tests/test_vault_store.py
+
+import sqlite3
+import time
+from hushh_mcp.vault.encrypt import encrypt_data, decrypt_data, pack_payload
+from hushh_mcp.vault.store import VaultStore
+from hushh_mcp.config import VAULT_ENCRYPTION_KEY
+from hushh_mcp.constants import ConsentScope
+from hushh_mcp.types import VaultRecord, VaultKey
+
+
+USER_ID = "user_vault"
+AGENT_ID = "agent_vault"
+SCOPE = ConsentScope.VAULT_READ_EMAIL
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _record(user_id=USER_ID, scope=SCOPE, agent_id=AGENT_ID, plaintext="alice@hushh.ai", expires_at=None, compress=None):
+    return VaultRecord(
+        key=VaultKey(user_id=user_id, scope=scope),
+        data=encrypt_data(plaintext, VAULT_ENCRYPTION_KEY, compress=compress),
+        agent_id=agent_id,
+        created_at=_now_ms(),
+        expires_at=expires_at,
+        metadata={"source": "test"}
+    )
+
+
+def test_put_and_get_round_trip():
+    store = VaultStore()
+    store.put(_record())
+
+    record = store.get(USER_ID, SCOPE)
+    assert record.agent_id == AGENT_ID
+    assert record.metadata == {"source": "test"}
+    assert decrypt_data(record.data, VAULT_ENCRYPTION_KEY) == "alice@hushh.ai"
+    assert record.to_model().key.scope == SCOPE
+    assert store.get(USER_ID, ConsentScope.VAULT_READ_PHONE) is None
+
+
+def test_replacing_a_record_keeps_created_at():
+    store = VaultStore()
+    first = _record()
+    store.put(first)
+    store.put(_record(plaintext="bob@hushh.ai"))
+
+    record = store.get(USER_ID, SCOPE)
+    assert record.created_at == first.created_at
+    assert record.updated_at is not None
+    assert decrypt_data(record.data, VAULT_ENCRYPTION_KEY) == "bob@hushh.ai"
+
+
+def test_bulk_get_preserves_order():
+    store = VaultStore()
+    users = [f"user_bulk_{i}" for i in range(5)]
+    assert store.put_many(_record(user_id=user_id) for user_id in users) == 5
+
+    keys = [(users[3], SCOPE), ("user_missing", SCOPE), (users[0], SCOPE)]
+    records = store.get_many(keys)
+
+    assert [r.user_id if r else None for r in records] == [users[3], None, users[0]]
+
+
+def test_bulk_get_uses_the_primary_key():
+    store = VaultStore()
+    store.put_many(_record(user_id=f"user_plan_{i}") for i in range(50))
+    statements = []
+    store._conn.set_trace_callback(statements.append)
+    store.get_many([("user_plan_1", SCOPE), ("user_plan_2", SCOPE)])
+    store._conn.set_trace_callback(None)
+
+    select = next(sql for sql in statements if sql.startswith("SELECT"))
+    plan = " | ".join(row[3] for row in store._conn.execute(f"EXPLAIN QUERY PLAN {select}"))
+    assert "SCAN vault_records" not in plan
+    assert "SEARCH vault_records USING INDEX" in plan
+
+
+def test_agent_index_lookup():
+    store = VaultStore()
+    store.put(_record(agent_id="agent_a"))
+    store.put(_record(scope=ConsentScope.VAULT_READ_PHONE, agent_id="agent_b"))
+
+    assert [r.scope for r in store.list_for_agent("agent_b")] == [ConsentScope.VAULT_READ_PHONE]
+    assert len(store.list_for_user(USER_ID)) == 2
+
+
+def test_soft_delete_leaves_tombstone():
+    store = VaultStore(tombstone_retention_ms=1_000)
+    store.put(_record())
+
+    assert store.delete(USER_ID, SCOPE) is True
+    assert store.delete(USER_ID, SCOPE) is False
+    assert store.get(USER_ID, SCOPE) is None
+
+    tombstone = store.get(USER_ID, SCOPE, include_deleted=True)
+    assert tombstone.deleted is True
+    assert tombstone.data is None
+
+    assert store.sweep(now=tombstone.updated_at + 1_000) == 1
+    assert store.get(USER_ID, SCOPE, include_deleted=True) is None
+
+
+def test_expired_records_are_hidden_and_swept(tmp_path):
+    store = VaultStore(str(tmp_path / "vault.db"))
+    expires_at = _now_ms() + 60_000
+    store.put(_record(expires_at=expires_at))
+    store.put(_record(scope=ConsentScope.VAULT_READ_PHONE))
+
+    assert store.sweep(now=expires_at) == 1
+    assert store.get(USER_ID, SCOPE) is None
+    assert store.get(USER_ID, ConsentScope.VAULT_READ_PHONE) is not None
+    store.close()
+
+
+def test_compressed_payloads_round_trip():
+    store = VaultStore()
+    body = "Quarterly statement attached. " * 100
+    store.put(_record(plaintext=body, compress=True))
+
+    record = store.get(USER_ID, SCOPE)
+    assert record.data.compression == "zlib"
+    assert decrypt_data(record.data, VAULT_ENCRYPTION_KEY) == body
+
+
+def test_payloads_are_stored_packed(tmp_path):
+    db_path = str(tmp_path / "vault.db")
+    store = VaultStore(db_path)
+    store.put(_record())
+    store.close()
+
+    conn = sqlite3.connect(db_path)
+    (packed,) = conn.execute("SELECT payload FROM vault_records").fetchone()
+    conn.close()
+    assert isinstance(packed, bytes)
+    assert len(packed) == len(pack_payload(_record().data))
+
+
+def test_blind_index_equality_lookup():
+    store = VaultStore()
+    store.put(_record(scope=ConsentScope.VAULT_READ_EMAIL), indexed_fields={"sender_email": "Bob@Example.com"})
+    store.put(_record(scope=ConsentScope.VAULT_READ_PHONE), indexed_fields={"sender_email": "carol@example.com"})
+    store.put(_record(user_id="user_other"), indexed_fields={"sender_email": "bob@example.com"})
+
+    matches = store.find_by_field(USER_ID, "sender_email", "  bob@example.com ")
+    assert [r.scope for r in matches] == [ConsentScope.VAULT_READ_EMAIL]
+    assert store.find_by_field(USER_ID, "contact_name", "bob@example.com") == []
+
+    # The index holds only HMAC tokens, never the plaintext value
+    stored = store._conn.execute("SELECT token FROM vault_blind_index").fetchall()
+    assert all("bob" not in token for (token,) in stored)
+
+
+def test_blind_index_follows_updates_and_deletes():
+    store = VaultStore()
+    store.put(_record(), indexed_fields={"sender_email": "bob@example.com"})
+    store.put(_record(), indexed_fields={"sender_email": "dave@example.com"})
+
+    assert store.find_by_field(USER_ID, "sender_email", "bob@example.com") == []
+    assert len(store.find_by_field(USER_ID, "sender_email", "dave@example.com")) == 1
+
+    store.delete(USER_ID, SCOPE)
+    assert store.find_by_field(USER_ID, "sender_email", "dave@example.com") == []